@@ -1,9 +1,31 @@
 from .client import Client, connection
 from .bin import Bin, OperationTypes
+from .schema import RecordSchema, register_schema
+from .cache import RecordCache
+from .singleflight import SingleFlight
+from .sync import SyncClient, sync_connection
+from .sharded import ShardedClient, sharded_connection
+from .pool import ConnectionPolicy
+from .admin import Authenticator, LoginAuthenticator
+from .breaker import CircuitBreaker
+from .profiler import RequestProfiler
 
 __all__ = [
     'Client',
     'connection',
     'Bin',
-    'OperationTypes'
+    'OperationTypes',
+    'RecordSchema',
+    'register_schema',
+    'RecordCache',
+    'SingleFlight',
+    'SyncClient',
+    'sync_connection',
+    'ShardedClient',
+    'sharded_connection',
+    'ConnectionPolicy',
+    'Authenticator',
+    'LoginAuthenticator',
+    'CircuitBreaker',
+    'RequestProfiler',
 ]
@@ -0,0 +1,525 @@
+/* C implementation of asyncaerospike.codec hot paths.
+ *
+ * Every function here has pure-Python twin in codec.py with the same
+ * signature and output; codec.py picks this module when it is built.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+#include <string.h>
+
+#define OPERATION_HEADER_SIZE 8
+#define HEADER_SIZE 8
+#define PROTOCOL_VERSION 2
+
+enum {
+    PARTICLE_UNDEF = 0,
+    PARTICLE_INTEGER = 1,
+    PARTICLE_DOUBLE = 2,
+    PARTICLE_STRING = 3,
+};
+
+/* RIPEMD-160 */
+
+typedef struct {
+    uint32_t h[5];
+    uint64_t length;
+    unsigned char buffer[64];
+    size_t buffered;
+} ripemd160_ctx;
+
+static const uint8_t RL[80] = {
+    0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15,
+    7, 4, 13, 1, 10, 6, 15, 3, 12, 0, 9, 5, 2, 14, 11, 8,
+    3, 10, 14, 4, 9, 15, 8, 1, 2, 7, 0, 6, 13, 11, 5, 12,
+    1, 9, 11, 10, 0, 8, 12, 4, 13, 3, 7, 15, 14, 5, 6, 2,
+    4, 0, 5, 9, 7, 12, 2, 10, 14, 1, 3, 8, 11, 6, 15, 13,
+};
+
+static const uint8_t RR[80] = {
+    5, 14, 7, 0, 9, 2, 11, 4, 13, 6, 15, 8, 1, 10, 3, 12,
+    6, 11, 3, 7, 0, 13, 5, 10, 14, 15, 8, 12, 4, 9, 1, 2,
+    15, 5, 1, 3, 7, 14, 6, 9, 11, 8, 12, 2, 10, 0, 4, 13,
+    8, 6, 4, 1, 3, 11, 15, 0, 5, 12, 2, 13, 9, 7, 10, 14,
+    12, 15, 10, 4, 1, 5, 8, 7, 6, 2, 13, 14, 0, 3, 9, 11,
+};
+
+static const uint8_t SL[80] = {
+    11, 14, 15, 12, 5, 8, 7, 9, 11, 13, 14, 15, 6, 7, 9, 8,
+    7, 6, 8, 13, 11, 9, 7, 15, 7, 12, 15, 9, 11, 7, 13, 12,
+    11, 13, 6, 7, 14, 9, 13, 15, 14, 8, 13, 6, 5, 12, 7, 5,
+    11, 12, 14, 15, 14, 15, 9, 8, 9, 14, 5, 6, 8, 6, 5, 12,
+    9, 15, 5, 11, 6, 8, 13, 12, 5, 12, 13, 14, 11, 8, 5, 6,
+};
+
+static const uint8_t SR[80] = {
+    8, 9, 9, 11, 13, 15, 15, 5, 7, 7, 8, 11, 14, 14, 12, 6,
+    9, 13, 15, 7, 12, 8, 9, 11, 7, 7, 12, 7, 6, 15, 13, 11,
+    9, 7, 15, 11, 8, 6, 6, 14, 12, 13, 5, 14, 13, 13, 7, 5,
+    15, 5, 8, 11, 14, 14, 6, 14, 6, 9, 12, 9, 12, 5, 15, 8,
+    8, 5, 12, 9, 12, 5, 14, 6, 8, 13, 6, 5, 15, 13, 11, 11,
+};
+
+static const uint32_t KL[5] = {0x00000000, 0x5A827999, 0x6ED9EBA1, 0x8F1BBCDC, 0xA953FD4E};
+static const uint32_t KR[5] = {0x50A28BE6, 0x5C4DD124, 0x6D703EF3, 0x7A6D76E9, 0x00000000};
+
+#define ROL(x, n) (((x) << (n)) | ((x) >> (32 - (n))))
+
+static inline uint32_t
+ripemd160_f(int round, uint32_t x, uint32_t y, uint32_t z)
+{
+    switch (round) {
+    case 0: return x ^ y ^ z;
+    case 1: return (x & y) | (~x & z);
+    case 2: return (x | ~y) ^ z;
+    case 3: return (x & z) | (y & ~z);
+    default: return x ^ (y | ~z);
+    }
+}
+
+static void
+ripemd160_compress(uint32_t *h, const unsigned char *block)
+{
+    uint32_t x[16];
+    int j;
+    for (j = 0; j < 16; j++) {
+        x[j] = (uint32_t)block[4 * j] | ((uint32_t)block[4 * j + 1] << 8) |
+               ((uint32_t)block[4 * j + 2] << 16) | ((uint32_t)block[4 * j + 3] << 24);
+    }
+
+    uint32_t al = h[0], bl = h[1], cl = h[2], dl = h[3], el = h[4];
+    uint32_t ar = h[0], br = h[1], cr = h[2], dr = h[3], er = h[4];
+    uint32_t t;
+
+    for (j = 0; j < 80; j++) {
+        int round = j >> 4;
+        t = ROL(al + ripemd160_f(round, bl, cl, dl) + x[RL[j]] + KL[round], SL[j]) + el;
+        al = el; el = dl; dl = ROL(cl, 10); cl = bl; bl = t;
+
+        t = ROL(ar + ripemd160_f(4 - round, br, cr, dr) + x[RR[j]] + KR[round], SR[j]) + er;
+        ar = er; er = dr; dr = ROL(cr, 10); cr = br; br = t;
+    }
+
+    t = h[1] + cl + dr;
+    h[1] = h[2] + dl + er;
+    h[2] = h[3] + el + ar;
+    h[3] = h[4] + al + br;
+    h[4] = h[0] + bl + cr;
+    h[0] = t;
+}
+
+static void
+ripemd160_init(ripemd160_ctx *ctx)
+{
+    ctx->h[0] = 0x67452301;
+    ctx->h[1] = 0xEFCDAB89;
+    ctx->h[2] = 0x98BADCFE;
+    ctx->h[3] = 0x10325476;
+    ctx->h[4] = 0xC3D2E1F0;
+    ctx->length = 0;
+    ctx->buffered = 0;
+}
+
+static void
+ripemd160_update(ripemd160_ctx *ctx, const unsigned char *data, size_t size)
+{
+    ctx->length += size;
+    if (ctx->buffered) {
+        size_t take = 64 - ctx->buffered;
+        if (take > size) {
+            take = size;
+        }
+        memcpy(ctx->buffer + ctx->buffered, data, take);
+        ctx->buffered += take;
+        data += take;
+        size -= take;
+        if (ctx->buffered < 64) {
+            return;
+        }
+        ripemd160_compress(ctx->h, ctx->buffer);
+        ctx->buffered = 0;
+    }
+    while (size >= 64) {
+        ripemd160_compress(ctx->h, data);
+        data += 64;
+        size -= 64;
+    }
+    memcpy(ctx->buffer, data, size);
+    ctx->buffered = size;
+}
+
+static void
+ripemd160_final(ripemd160_ctx *ctx, unsigned char *out)
+{
+    uint64_t bits = ctx->length << 3;
+    static const unsigned char padding[64] = {0x80};
+    size_t pad = ctx->buffered < 56 ? 56 - ctx->buffered : 120 - ctx->buffered;
+    unsigned char length[8];
+    int j;
+
+    for (j = 0; j < 8; j++) {
+        length[j] = (unsigned char)(bits >> (8 * j));
+    }
+    ripemd160_update(ctx, padding, pad);
+    ripemd160_update(ctx, length, 8);
+
+    for (j = 0; j < 5; j++) {
+        out[4 * j] = (unsigned char)ctx->h[j];
+        out[4 * j + 1] = (unsigned char)(ctx->h[j] >> 8);
+        out[4 * j + 2] = (unsigned char)(ctx->h[j] >> 16);
+        out[4 * j + 3] = (unsigned char)(ctx->h[j] >> 24);
+    }
+}
+
+/* Big-endian helpers */
+
+static inline uint64_t
+read_u64(const unsigned char *p)
+{
+    uint64_t value = 0;
+    int j;
+    for (j = 0; j < 8; j++) {
+        value = (value << 8) | p[j];
+    }
+    return value;
+}
+
+static inline uint32_t
+read_u32(const unsigned char *p)
+{
+    return ((uint32_t)p[0] << 24) | ((uint32_t)p[1] << 16) | ((uint32_t)p[2] << 8) | (uint32_t)p[3];
+}
+
+static inline void
+write_u32(unsigned char *p, uint32_t value)
+{
+    p[0] = (unsigned char)(value >> 24);
+    p[1] = (unsigned char)(value >> 16);
+    p[2] = (unsigned char)(value >> 8);
+    p[3] = (unsigned char)value;
+}
+
+/* Module functions */
+
+PyDoc_STRVAR(digest_doc,
+"digest(set_name, particle_type, value)\n--\n\n"
+"RIPEMD-160 of set name, particle type byte and packed key value.");
+
+static PyObject *
+digest(PyObject *module, PyObject *args)
+{
+    Py_buffer set_name, value;
+    unsigned char particle_type;
+    unsigned char out[20];
+    ripemd160_ctx ctx;
+
+    if (!PyArg_ParseTuple(args, "y*by*:digest", &set_name, &particle_type, &value)) {
+        return NULL;
+    }
+    ripemd160_init(&ctx);
+    ripemd160_update(&ctx, set_name.buf, (size_t)set_name.len);
+    ripemd160_update(&ctx, &particle_type, 1);
+    ripemd160_update(&ctx, value.buf, (size_t)value.len);
+    ripemd160_final(&ctx, out);
+    PyBuffer_Release(&set_name);
+    PyBuffer_Release(&value);
+
+    return PyBytes_FromStringAndSize((const char *)out, 20);
+}
+
+PyDoc_STRVAR(pack_bin_doc,
+"pack_bin(operation_type, particle_type, version, name, value)\n--\n\n"
+"Packs bin operation: size, operation type, particle type, version, name length, name, value.");
+
+static PyObject *
+pack_bin(PyObject *module, PyObject *args)
+{
+    unsigned char operation_type, particle_type, version;
+    Py_buffer name, value;
+    PyObject *result = NULL;
+
+    if (!PyArg_ParseTuple(args, "bbby*y*:pack_bin", &operation_type, &particle_type, &version, &name, &value)) {
+        return NULL;
+    }
+    if (name.len > 255) {
+        PyErr_SetString(PyExc_ValueError, "bin name is too long");
+        goto done;
+    }
+
+    result = PyBytes_FromStringAndSize(NULL, OPERATION_HEADER_SIZE + name.len + value.len);
+    if (result == NULL) {
+        goto done;
+    }
+    unsigned char *p = (unsigned char *)PyBytes_AS_STRING(result);
+    write_u32(p, (uint32_t)(4 + name.len + value.len));
+    p[4] = operation_type;
+    p[5] = particle_type;
+    p[6] = version;
+    p[7] = (unsigned char)name.len;
+    memcpy(p + OPERATION_HEADER_SIZE, name.buf, name.len);
+    memcpy(p + OPERATION_HEADER_SIZE + name.len, value.buf, value.len);
+
+done:
+    PyBuffer_Release(&name);
+    PyBuffer_Release(&value);
+    return result;
+}
+
+PyDoc_STRVAR(pack_header_doc,
+"pack_header(request_type, request_length)\n--\n\n"
+"Packs protocol header: version, request type and 6 bytes of length.");
+
+static PyObject *
+pack_header(PyObject *module, PyObject *args)
+{
+    unsigned char request_type;
+    unsigned long long length;
+    unsigned char out[HEADER_SIZE];
+    int j;
+
+    if (!PyArg_ParseTuple(args, "bK:pack_header", &request_type, &length)) {
+        return NULL;
+    }
+    if (length >> 48) {
+        PyErr_SetString(PyExc_ValueError, "request is too long");
+        return NULL;
+    }
+    out[0] = PROTOCOL_VERSION;
+    out[1] = request_type;
+    for (j = 0; j < 6; j++) {
+        out[2 + j] = (unsigned char)(length >> (8 * (5 - j)));
+    }
+    return PyBytes_FromStringAndSize((const char *)out, HEADER_SIZE);
+}
+
+PyDoc_STRVAR(unpack_header_doc,
+"unpack_header(data)\n--\n\n"
+"Unpacks protocol header to (request_type, request_length).");
+
+static PyObject *
+unpack_header(PyObject *module, PyObject *args)
+{
+    Py_buffer data;
+    PyObject *result = NULL;
+
+    if (!PyArg_ParseTuple(args, "y*:unpack_header", &data)) {
+        return NULL;
+    }
+    const unsigned char *p = data.buf;
+    if (data.len < HEADER_SIZE) {
+        PyErr_SetString(PyExc_ValueError, "header is too short");
+    }
+    else if (p[0] != PROTOCOL_VERSION) {
+        PyErr_Format(PyExc_ValueError, "unsupported protocol version %d", p[0]);
+    }
+    else {
+        result = Py_BuildValue("(iK)", p[1], (unsigned long long)(read_u64(p) & 0xFFFFFFFFFFFFULL));
+    }
+    PyBuffer_Release(&data);
+    return result;
+}
+
+static PyObject *
+decode_particle(int particle_type, const unsigned char *p, Py_ssize_t size, PyObject *fallback)
+{
+    switch (particle_type) {
+    case PARTICLE_UNDEF:
+        Py_RETURN_NONE;
+    case PARTICLE_INTEGER:
+        if (size != 8) {
+            break;
+        }
+        return PyLong_FromUnsignedLongLong(read_u64(p));
+    case PARTICLE_DOUBLE: {
+        if (size != 8) {
+            break;
+        }
+        uint64_t bits = read_u64(p);
+        double value;
+        memcpy(&value, &bits, sizeof(value));
+        return PyFloat_FromDouble(value);
+    }
+    case PARTICLE_STRING:
+        return PyUnicode_DecodeUTF8((const char *)p, size, NULL);
+    default:
+        break;
+    }
+    return PyObject_CallFunction(fallback, "iy#", particle_type, (const char *)p, size);
+}
+
+PyDoc_STRVAR(decode_bins_doc,
+"decode_bins(data, bins_num, fallback)\n--\n\n"
+"Decodes bin operations to {name: value}.\n\n"
+"Integer, double and string particles are decoded here,\n"
+"others with fallback(particle_type, particle_bytes).");
+
+static PyObject *
+decode_bins(PyObject *module, PyObject *args)
+{
+    Py_buffer data;
+    Py_ssize_t bins_num, i;
+    PyObject *fallback;
+
+    if (!PyArg_ParseTuple(args, "y*nO:decode_bins", &data, &bins_num, &fallback)) {
+        return NULL;
+    }
+    PyObject *bins = PyDict_New();
+    if (bins == NULL) {
+        goto error;
+    }
+
+    const unsigned char *p = data.buf;
+    Py_ssize_t offset = 0;
+    for (i = 0; i < bins_num; i++) {
+        if (offset + OPERATION_HEADER_SIZE > data.len) {
+            PyErr_SetString(PyExc_ValueError, "truncated bin header");
+            goto error;
+        }
+        Py_ssize_t size = read_u32(p + offset);
+        Py_ssize_t name_length = p[offset + 7];
+        Py_ssize_t name_start = offset + OPERATION_HEADER_SIZE;
+        Py_ssize_t value_start = name_start + name_length;
+        Py_ssize_t end = offset + 4 + size;
+        if (size < 4 + name_length || end > data.len) {
+            PyErr_SetString(PyExc_ValueError, "truncated bin");
+            goto error;
+        }
+
+        PyObject *name = PyUnicode_DecodeUTF8((const char *)p + name_start, name_length, NULL);
+        if (name == NULL) {
+            goto error;
+        }
+        PyObject *value = decode_particle(p[offset + 5], p + value_start, end - value_start, fallback);
+        if (value == NULL) {
+            Py_DECREF(name);
+            goto error;
+        }
+        int failed = PyDict_SetItem(bins, name, value);
+        Py_DECREF(name);
+        Py_DECREF(value);
+        if (failed) {
+            goto error;
+        }
+        offset = end;
+    }
+
+    PyBuffer_Release(&data);
+    return bins;
+
+error:
+    Py_XDECREF(bins);
+    PyBuffer_Release(&data);
+    return NULL;
+}
+
+PyDoc_STRVAR(decode_record_doc,
+"decode_record(data, bins_num, slots, values, fallback)\n--\n\n"
+"Decodes bin operations into values list of record schema.\n\n"
+"slots is {name bytes: (index in values, expected particle type or -1\n"
+"for any, nullable)}, bins not in slots are skipped. Particles are decoded\n"
+"as in decode_bins.\n\n"
+"Returns None or (name bytes, particle type) of first bin with unexpected type.");
+
+static PyObject *
+decode_record(PyObject *module, PyObject *args)
+{
+    Py_buffer data;
+    Py_ssize_t bins_num, i;
+    PyObject *slots, *values, *fallback;
+
+    if (!PyArg_ParseTuple(args, "y*nO!O!O:decode_record",
+                          &data, &bins_num, &PyDict_Type, &slots, &PyList_Type, &values, &fallback)) {
+        return NULL;
+    }
+
+    const unsigned char *p = data.buf;
+    Py_ssize_t offset = 0;
+    for (i = 0; i < bins_num; i++) {
+        if (offset + OPERATION_HEADER_SIZE > data.len) {
+            PyErr_SetString(PyExc_ValueError, "truncated bin header");
+            goto error;
+        }
+        Py_ssize_t size = read_u32(p + offset);
+        int particle_type = p[offset + 5];
+        Py_ssize_t name_length = p[offset + 7];
+        Py_ssize_t name_start = offset + OPERATION_HEADER_SIZE;
+        Py_ssize_t value_start = name_start + name_length;
+        Py_ssize_t end = offset + 4 + size;
+        if (size < 4 + name_length || end > data.len) {
+            PyErr_SetString(PyExc_ValueError, "truncated bin");
+            goto error;
+        }
+        offset = end;
+
+        PyObject *name = PyBytes_FromStringAndSize((const char *)p + name_start, name_length);
+        if (name == NULL) {
+            goto error;
+        }
+        PyObject *slot = PyDict_GetItemWithError(slots, name);
+        if (slot == NULL) {
+            Py_DECREF(name);
+            if (PyErr_Occurred()) {
+                goto error;
+            }
+            continue;
+        }
+        if (!PyTuple_Check(slot) || PyTuple_GET_SIZE(slot) != 3) {
+            Py_DECREF(name);
+            PyErr_SetString(PyExc_TypeError, "slot must be (index, particle type, nullable)");
+            goto error;
+        }
+        Py_ssize_t index = PyLong_AsSsize_t(PyTuple_GET_ITEM(slot, 0));
+        long expected = PyLong_AsLong(PyTuple_GET_ITEM(slot, 1));
+        int nullable = PyObject_IsTrue(PyTuple_GET_ITEM(slot, 2));
+        if (PyErr_Occurred()) {
+            Py_DECREF(name);
+            goto error;
+        }
+
+        if ((particle_type == PARTICLE_UNDEF && !nullable)
+                || (particle_type != PARTICLE_UNDEF && expected != -1 && particle_type != expected)) {
+            PyBuffer_Release(&data);
+            return Py_BuildValue("(Ni)", name, particle_type);
+        }
+        Py_DECREF(name);
+
+        PyObject *value = decode_particle(particle_type, p + value_start, end - value_start, fallback);
+        if (value == NULL) {
+            goto error;
+        }
+        if (PyList_SetItem(values, index, value)) {
+            goto error;
+        }
+    }
+
+    PyBuffer_Release(&data);
+    Py_RETURN_NONE;
+
+error:
+    PyBuffer_Release(&data);
+    return NULL;
+}
+
+static PyMethodDef speedups_methods[] = {
+    {"digest", digest, METH_VARARGS, digest_doc},
+    {"pack_bin", pack_bin, METH_VARARGS, pack_bin_doc},
+    {"pack_header", pack_header, METH_VARARGS, pack_header_doc},
+    {"unpack_header", unpack_header, METH_VARARGS, unpack_header_doc},
+    {"decode_bins", decode_bins, METH_VARARGS, decode_bins_doc},
+    {"decode_record", decode_record, METH_VARARGS, decode_record_doc},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef speedups_module = {
+    PyModuleDef_HEAD_INIT,
+    "asyncaerospike._speedups",
+    "C implementation of asyncaerospike.codec",
+    -1,
+    speedups_methods,
+};
+
+PyMODINIT_FUNC
+PyInit__speedups(void)
+{
+    return PyModule_Create(&speedups_module);
+}
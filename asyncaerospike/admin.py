@@ -0,0 +1,131 @@
+from abc import ABC, abstractmethod
+from enum import IntEnum
+from struct import Struct
+from typing import Dict, Optional, Tuple
+
+from asyncaerospike.errors import AerospikeError, STATUS_TO_ERROR
+from asyncaerospike.header import Headers, RequestType
+
+# unused, result code, command, fields number, 12 unused bytes
+ADMIN_HEADER = Struct('!BBBB12x')
+ADMIN_FIELD_HEADER = Struct('!IB')
+
+# salt used by all Aerospike clients to hash password to credential
+CREDENTIAL_SALT = b'$2a$10$7EqJtq98hPqEX7fNZaFWoO'
+
+AS_OK = 0
+AS_SEC_ERR_NOT_ENABLED = 52
+AS_SEC_ERR_EXPIRED_SESSION = 66
+
+
+class AdminCommand(IntEnum):
+    AUTHENTICATE = 0
+    LOGIN = 20
+
+
+class AdminField(IntEnum):
+    USER = 0
+    PASSWORD = 1
+    OLD_PASSWORD = 2
+    CREDENTIAL = 3
+    CLEAR_PASSWORD = 4
+    SESSION_TOKEN = 5
+    SESSION_TTL = 6
+
+
+def admin_request(command: AdminCommand, fields: Dict[AdminField, bytes]) -> bytes:
+    """Packs security protocol request.
+
+    :param command: admin command.
+    :param fields: {field type: field data}
+    :return: encoded admin request
+    """
+    payload = ADMIN_HEADER.pack(0, 0, command, len(fields)) + b''.join(
+        ADMIN_FIELD_HEADER.pack(len(data) + 1, field_type) + data for field_type, data in fields.items()
+    )
+    return Headers(request_type=RequestType.ADMIN, request_length=len(payload)).pack() + payload
+
+
+def parse_admin_response(data: bytes) -> Tuple[int, Dict[int, bytes]]:
+    """Parses security protocol response body.
+
+    :return: result code, {field type: field data}
+    """
+    _, status_code, _, fields_num = ADMIN_HEADER.unpack_from(data)
+    offset = ADMIN_HEADER.size
+    fields = {}
+    for _ in range(fields_num):
+        size, field_type = ADMIN_FIELD_HEADER.unpack_from(data, offset)
+        start = offset + ADMIN_FIELD_HEADER.size
+        offset = start + size - 1
+        fields[field_type] = data[start:offset]
+    return status_code, fields
+
+
+def hash_password(password: str) -> bytes:
+    """Hashes password to credential sent on login. Requires bcrypt."""
+    try:
+        import bcrypt
+    except ImportError:
+        raise ImportError('bcrypt is required to hash password: pip install asyncaerospike[security]') from None
+    return bcrypt.hashpw(password.encode('utf-8'), CREDENTIAL_SALT)
+
+
+class Authenticator(ABC):
+    """Abstract handshake run on every new connection before it is used."""
+
+    @abstractmethod
+    async def login(self, connection):
+        """Authenticates connection.
+
+        :param connection: sends requests with connection.request(data) -> response body.
+        :raises AerospikeError: if server rejects connection.
+        """
+
+
+class LoginAuthenticator(Authenticator):
+    """User and password authentication of security protocol.
+
+    First connection logs in with credential and gets session token,
+    next connections authenticate with the token, so password hash
+    is checked by server once. Servers without security enabled are accepted.
+
+    :param str user: user name.
+    :param str password: password, hashed with bcrypt.
+    :param bytes credential: already hashed password, used instead of password.
+    """
+
+    def __init__(self, user: str, password: str = None, credential: bytes = None):
+        if credential is None:
+            if password is None:
+                raise ValueError('password or credential is required')
+            credential = hash_password(password)
+
+        self.user = user
+        self.credential = credential
+        self.session_token: Optional[bytes] = None
+
+    async def _send(self, connection, command: AdminCommand, fields: Dict[AdminField, bytes]):
+        return parse_admin_response(await connection.request(admin_request(command, fields)))
+
+    async def login(self, connection):
+        user = self.user.encode('utf-8')
+        if self.session_token is not None:
+            status_code, _ = await self._send(connection, AdminCommand.AUTHENTICATE, {
+                AdminField.USER: user,
+                AdminField.SESSION_TOKEN: self.session_token,
+            })
+            if status_code in (AS_OK, AS_SEC_ERR_NOT_ENABLED):
+                return
+            if status_code != AS_SEC_ERR_EXPIRED_SESSION:
+                raise AerospikeError(status_code=status_code, message=STATUS_TO_ERROR.get(status_code, 'unknown'))
+
+        status_code, fields = await self._send(connection, AdminCommand.LOGIN, {
+            AdminField.USER: user,
+            AdminField.CREDENTIAL: self.credential,
+        })
+        if status_code == AS_SEC_ERR_NOT_ENABLED:
+            return
+        if status_code != AS_OK:
+            raise AerospikeError(status_code=status_code, message=STATUS_TO_ERROR.get(status_code, 'unknown'))
+        self.session_token = fields.get(AdminField.SESSION_TOKEN)
@@ -1,7 +1,8 @@
 from struct import Struct
-from typing import Any
+from typing import Any, List
 from enum import IntEnum
 
+from asyncaerospike.codec import OPERATION_HEADER, pack_bin
 from asyncaerospike.datatypes import (
     PYTHON_TYPE_TO_AEROSPIKE_TYPE, AEROSPIKE_TYPE_CODE_TO_AEROSPIKE_TYPE,
     AerospikeDataType
@@ -37,9 +38,11 @@ WRITE_OPERATIONS = {
     OperationTypes.CDT_MODIFY,
     OperationTypes.INCR,
     OperationTypes.MAP_MODIFY,
-    OperationTypes.BIT_MODIFY,
+    OperationTypes.APPEND,
     OperationTypes.PREPEND,
+    OperationTypes.TOUCH,
     OperationTypes.BIT_MODIFY,
+    OperationTypes.DELETE,
 }
 
 
@@ -66,10 +69,18 @@ class Bin:
             self.data = PYTHON_TYPE_TO_AEROSPIKE_TYPE[type(data)](data=data)
 
     def pack(self) -> bytes:
-        base = self.ENCODER.pack(self.data.TYPE, self.version, len(self.key))
-        packed_data = base + self.key.encode('utf-8') + self.data.pack_data()
-        length = len(packed_data) + 1
-        return self.FIELD_ENCODER.pack(length, self.operation_type) + packed_data
+        return pack_bin(
+            self.operation_type, self.data.TYPE, self.version, self.key.encode('utf-8'), self.data.pack_data()
+        )
+
+    def pack_parts(self) -> List[bytes]:
+        """Packs bin to operation header with name and value buffer, value is not copied."""
+        name = self.key.encode('utf-8')
+        value = self.data.pack_data()
+        header = OPERATION_HEADER.pack(
+            4 + len(name) + len(value), self.operation_type, self.data.TYPE, self.version, len(name)
+        )
+        return [header + name, value]
 
     @classmethod
     def unpack(cls, data: bytes):
@@ -0,0 +1,182 @@
+import asyncio
+from collections import deque
+from enum import Enum
+import time
+from typing import Awaitable, Callable, Deque, Optional, Tuple, TypeVar
+
+from asyncaerospike.errors import CircuitOpenError, OverloadedError
+from asyncaerospike.response import Response
+
+
+T = TypeVar('T')
+
+AS_ERR_TIMEOUT = 9
+AS_ERR_DEVICE_OVERLOAD = 18
+
+# server statuses meaning node is degraded, not that request is wrong
+FAILURE_STATUSES = frozenset((AS_ERR_TIMEOUT, AS_ERR_DEVICE_OVERLOAD))
+
+
+class BreakerState(str, Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Fails requests fast when node degrades and limits requests in flight.
+
+    Outcomes of last window requests are kept. Circuit opens when at least
+    min_requests are recorded and error rate exceeds error_rate or, if
+    latency_threshold is set, latency at latency_percentile exceeds it.
+    Open circuit rejects requests with CircuitOpenError for open_timeout
+    seconds, then lets half_open_requests probes through: their success
+    closes circuit, any failure opens it again.
+
+    Requests beyond max_in_flight are rejected with OverloadedError at once,
+    instead of waiting behind requests the node can't answer in time.
+
+    :param int window: number of last requests error rate and latency are computed over.
+    :param int min_requests: requests in window needed to open circuit.
+    :param float error_rate: share of failed requests opening circuit.
+    :param float latency_threshold: seconds, None to ignore latency.
+    :param float latency_percentile: percentile compared with latency_threshold, e.g. 0.99.
+    :param float open_timeout: seconds circuit stays open before probes.
+    :param int half_open_requests: probes needed to close circuit.
+    :param int max_in_flight: limit of requests in flight, None for no limit.
+    """
+
+    def __init__(
+            self,
+            window: int = 100,
+            min_requests: int = 20,
+            error_rate: float = 0.5,
+            latency_threshold: Optional[float] = None,
+            latency_percentile: float = 0.99,
+            open_timeout: float = 1.0,
+            half_open_requests: int = 1,
+            max_in_flight: Optional[int] = None,
+    ):
+        self.window = window
+        self.min_requests = min_requests
+        self.error_rate = error_rate
+        self.latency_threshold = latency_threshold
+        self.latency_percentile = latency_percentile
+        self.open_timeout = open_timeout
+        self.half_open_requests = half_open_requests
+        self.max_in_flight = max_in_flight
+
+        # (failed, slow) of last window requests
+        self._outcomes: Deque[Tuple[bool, bool]] = deque()
+        self._failures = 0
+        self._slow = 0
+        self._state = BreakerState.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+
+        self.in_flight = 0
+        self.opened = 0
+        self.rejected_open = 0
+        self.rejected_overload = 0
+
+    @property
+    def state(self) -> BreakerState:
+        if self._state == BreakerState.OPEN and time.monotonic() - self._opened_at >= self.open_timeout:
+            self._state = BreakerState.HALF_OPEN
+            self._probes = 0
+            self._probe_successes = 0
+        return self._state
+
+    def _reset_window(self):
+        self._outcomes.clear()
+        self._failures = 0
+        self._slow = 0
+
+    def _open(self):
+        self._state = BreakerState.OPEN
+        self._opened_at = time.monotonic()
+        self._reset_window()
+        self.opened += 1
+
+    def _acquire(self) -> bool:
+        """Checks whether request may be sent.
+
+        :return: True if request is half-open probe
+        """
+        state = self.state
+        if state == BreakerState.OPEN:
+            self.rejected_open += 1
+            raise CircuitOpenError('Circuit breaker is open')
+        if state == BreakerState.HALF_OPEN:
+            if self._probes >= self.half_open_requests:
+                self.rejected_open += 1
+                raise CircuitOpenError('Circuit breaker is half-open, probes are in flight')
+            self._probes += 1
+        if self.max_in_flight is not None and self.in_flight >= self.max_in_flight:
+            if state == BreakerState.HALF_OPEN:
+                self._probes -= 1
+            self.rejected_overload += 1
+            raise OverloadedError(f'{self.in_flight} requests in flight')
+        self.in_flight += 1
+        return state == BreakerState.HALF_OPEN
+
+    def record(self, latency: float, failed: bool, is_probe: bool = False):
+        """Records outcome of request and opens or closes circuit."""
+        slow = self.latency_threshold is not None and latency > self.latency_threshold
+        if is_probe:
+            if self._state != BreakerState.HALF_OPEN:
+                return
+            if failed or slow:
+                self._open()
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_requests:
+                self._state = BreakerState.CLOSED
+                self._reset_window()
+            return
+
+        if self._state != BreakerState.CLOSED:
+            return
+
+        self._outcomes.append((failed, slow))
+        self._failures += failed
+        self._slow += slow
+        if len(self._outcomes) > self.window:
+            old_failed, old_slow = self._outcomes.popleft()
+            self._failures -= old_failed
+            self._slow -= old_slow
+
+        requests = len(self._outcomes)
+        if requests < self.min_requests:
+            return
+        # latency at percentile exceeds threshold when less than percentile of requests are faster
+        if self._failures > self.error_rate * requests or requests - self._slow < self.latency_percentile * requests:
+            self._open()
+
+    async def call(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Runs call, if circuit and in-flight limit allow it.
+
+        Exceptions and responses with FAILURE_STATUSES are counted as failures.
+        Cancelled call (e.g. by caller timeout) counts only by its latency.
+
+        :param call: coroutine function sending request.
+        :return: result of call
+        """
+        is_probe = self._acquire()
+        started = time.monotonic()
+        failed = True
+        try:
+            result = await call()
+            failed = isinstance(result, Response) and result.status_code in FAILURE_STATUSES
+            return result
+        except asyncio.CancelledError:
+            failed = False
+            if is_probe:
+                self._probes -= 1
+                is_probe = None
+            raise
+        finally:
+            self.in_flight -= 1
+            if is_probe is not None:
+                self.record(time.monotonic() - started, failed, is_probe)
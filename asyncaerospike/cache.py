@@ -0,0 +1,147 @@
+import asyncio
+from collections import OrderedDict
+from functools import partial
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from asyncaerospike.response import Response
+
+
+RecordKey = Tuple[str, Optional[str], Any]
+CacheKey = Tuple[RecordKey, Optional[Tuple[str, ...]]]
+Loader = Callable[[], Awaitable[Response]]
+
+
+class _Entry:
+    __slots__ = ('response', 'expires_at')
+
+    def __init__(self, response: Response, expires_at: float):
+        self.response = response
+        self.expires_at = expires_at
+
+
+class RecordCache:
+    """In-process read-through cache for get and select.
+
+    Entries are evicted in LRU order when cache is full and expire after ttl.
+    Expired entry is revalidated with header only read: if record generation
+    has not changed, entry is kept without reading bins again.
+    Concurrent misses on the same key share one server request.
+
+    :param int max_size: maximum number of cached responses.
+    :param float ttl: seconds entry is served without asking server.
+    :param bool revalidate: revalidate expired entries by generation.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 1.0, revalidate: bool = True):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.revalidate = revalidate
+
+        self._entries: 'OrderedDict[CacheKey, _Entry]' = OrderedDict()
+        self._by_record: Dict[RecordKey, Set[CacheKey]] = {}
+        self._pending: Dict[CacheKey, asyncio.Task] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _store(self, cache_key: CacheKey, response: Response):
+        self._entries[cache_key] = _Entry(response, time.monotonic() + self.ttl)
+        self._entries.move_to_end(cache_key)
+        self._by_record.setdefault(cache_key[0], set()).add(cache_key)
+
+        while len(self._entries) > self.max_size:
+            evicted, _ = self._entries.popitem(last=False)
+            self._discard(evicted)
+
+    def _discard(self, cache_key: CacheKey):
+        keys = self._by_record.get(cache_key[0])
+        if keys is not None:
+            keys.discard(cache_key)
+            if not keys:
+                del self._by_record[cache_key[0]]
+
+    def invalidate(self, record_key: RecordKey):
+        """Drops all cached responses of record.
+
+        Requests already in flight for record will not be stored.
+
+        :param record_key: (namespace, set_name, key)
+        """
+        for cache_key in self._by_record.pop(record_key, ()):
+            self._entries.pop(cache_key, None)
+        for cache_key in [k for k in self._pending if k[0] == record_key]:
+            del self._pending[cache_key]
+
+    def clear(self):
+        self._entries.clear()
+        self._by_record.clear()
+        self._pending.clear()
+
+    async def fetch(
+            self,
+            record_key: RecordKey,
+            bin_names: Optional[Tuple[str, ...]],
+            load: Loader,
+            load_header: Loader,
+    ) -> Response:
+        """Returns cached response or loads it from server.
+
+        :param record_key: (namespace, set_name, key)
+        :param bin_names: selected bins, None for all bins.
+        :param load: coroutine function reading record from server.
+        :param load_header: coroutine function reading record header only.
+        :return: response
+        """
+        cache_key = (record_key, bin_names)
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            self._entries.move_to_end(cache_key)
+            if entry.expires_at > time.monotonic():
+                self.hits += 1
+                return entry.response
+
+        task = self._pending.get(cache_key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.misses += 1
+        task = asyncio.ensure_future(self._load(cache_key, entry, load, load_header))
+        self._pending[cache_key] = task
+        task.add_done_callback(partial(self._forget, cache_key))
+        return await asyncio.shield(task)
+
+    def _forget(self, cache_key: CacheKey, task: asyncio.Task):
+        if self._pending.get(cache_key) is task:
+            del self._pending[cache_key]
+
+    async def _load(
+            self,
+            cache_key: CacheKey,
+            entry: Optional[_Entry],
+            load: Loader,
+            load_header: Loader,
+    ) -> Response:
+        task = asyncio.current_task()
+
+        if entry is not None and self.revalidate:
+            header = await load_header()
+            is_valid = header.is_ok and header.generation == entry.response.generation
+            if is_valid and self._pending.get(cache_key) is task:
+                self.revalidations += 1
+                self._store(cache_key, entry.response)
+                return entry.response
+
+        response = await load()
+        if self._pending.get(cache_key) is task:
+            if response.is_ok:
+                self._store(cache_key, response)
+            elif self._entries.pop(cache_key, None) is not None:
+                self._discard(cache_key)
+        return response
@@ -1,15 +1,29 @@
 import asyncio
-from functools import wraps
-from typing import List
+import base64
+from functools import partial, wraps
+import random
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Union
 
 from asyncaerospike.request import (
     Request, put_request, get_request,
     select_request, delete_request,
-    operate_request
+    operate_request, header_request,
+    apply_request, background_udf_request, query_request
 )
-from asyncaerospike.response import Response
-from asyncaerospike.header import Headers
+from asyncaerospike.response import Response, read_response
 from asyncaerospike.bin import Bin
+from asyncaerospike.breaker import CircuitBreaker
+from asyncaerospike.cache import RecordCache
+from asyncaerospike.errors import AerospikeError, STATUS_TO_ERROR
+from asyncaerospike.expressions import Expression
+from asyncaerospike.singleflight import SingleFlight
+from asyncaerospike.info import (
+    InfoPoller, check_info_value, info_request, parse_info, parse_info_list, parse_info_values
+)
+from asyncaerospike.pool import ConnectionPolicy, ConnectionPool, StreamConnection, open_connection
+from asyncaerospike.profiler import RequestProfiler
+from asyncaerospike.query import AS_ERR_NOT_FOUND, AS_OK, Predicate, parse_records, split_partitions
 
 
 def require_connection(func):
@@ -26,24 +40,69 @@ class Client:
 
     :param str host: Aerospike host.
     :param int port: Aerospike port.
+    :param RecordCache cache: optional read-through cache for get and select.
+    :param SingleFlight singleflight: optional dedup of concurrent identical get and select.
+    :param str transport: 'stream' to use StreamReader/StreamWriter with one request at a time,
+        'protocol' to use AerospikeProtocol with pipelined requests.
+    :param ConnectionPolicy policy: socket options, pool size, idle probes and authentication.
+    :param CircuitBreaker breaker: optional fail fast and in-flight limit for requests to node.
+    :param RequestProfiler profiler: optional sampling of hot keys, hot sets and slow requests.
     """
-    def __init__(self, host: str, port: int):
+
+    TRANSPORTS = ('stream', 'protocol')
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            cache: RecordCache = None,
+            singleflight: SingleFlight = None,
+            transport: str = 'stream',
+            policy: ConnectionPolicy = None,
+            breaker: CircuitBreaker = None,
+            profiler: RequestProfiler = None,
+    ):
+        if transport not in self.TRANSPORTS:
+            raise ValueError(f'transport must be one of {self.TRANSPORTS}, got {transport!r}')
+
         self._host = host
         self._port = port
+        self._cache = cache
+        self._singleflight = singleflight
+        self._transport = transport
+        self._policy = policy or ConnectionPolicy()
+        self._breaker = breaker
+        self._profiler = profiler
 
-        self._reader = None
-        self._writer = None
+        self._pool = None
         self._is_connected = False
 
+        self._info_connection = None
+        self._info_lock = None
+        self._info_poller = None
+        self.server_stats: Dict[str, Dict[str, str]] = {}
+
     async def connect(self):
-        """Connect to Aerospike within self.host and self.port"""
-        self._reader, self._writer = await asyncio.open_connection(
-            self.host, self.port
-        )
+        """Connect to Aerospike within self.host and self.port.
+
+        Opens all connections of pool at once, see ConnectionPolicy.
+        """
+        pool = ConnectionPool(self.host, self.port, transport=self._transport, policy=self._policy)
+        await pool.start()
+        self._pool = pool
+        self._info_lock = asyncio.Lock()
         self._is_connected = True
 
     async def close(self):
-        self._writer.close()
+        if self._info_poller is not None:
+            await self._info_poller.stop()
+            self._info_poller = None
+        if self._info_connection is not None:
+            self._info_connection.close()
+            self._info_connection = None
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
         self._is_connected = False
 
     @property
@@ -58,17 +117,155 @@ class Client:
     def is_connected(self):
         return self._is_connected
 
-    async def _send(self, request: Request):
-        packed_request = request.pack()
-        self._writer.write(packed_request)
-        await self._writer.drain()
+    @property
+    def transport(self):
+        return self._transport
+
+    @property
+    def policy(self):
+        return self._policy
+
+    @property
+    def pool(self):
+        return self._pool
+
+    @property
+    def breaker(self):
+        return self._breaker
+
+    @property
+    def profiler(self):
+        return self._profiler
+
+    @property
+    def cache(self):
+        return self._cache
+
+    @property
+    def singleflight(self):
+        return self._singleflight
+
+    async def _execute(self, request: Request) -> Response:
+        """Sends request over least busy pool connection and reads its response.
 
-    async def _get_response(self) -> Response:
-        header_data = await self._reader.readexactly(Headers.ENCODER.sizeof())
-        parsed_header = Headers.ENCODER.parse(header_data)
-        message_data = await self._reader.readexactly(parsed_header.request_length)
+        Stream transport pairs request and response under lock, so concurrent
+        coroutines do not read each other's responses. Protocol transport
+        matches responses to requests by order and pipelines them.
+        With breaker, request is rejected at once if node is degraded or overloaded.
+        """
+        if self._profiler is None:
+            return await self._send_request(request)
 
-        return Response.from_bytes(message_data)
+        response = None
+        start = time.perf_counter()
+        try:
+            response = await self._send_request(request)
+            return response
+        finally:
+            self._profiler.record(request, response, time.perf_counter() - start)
+
+    async def _send_request(self, request: Request) -> Response:
+        if self._breaker is not None:
+            return await self._breaker.call(partial(self._send, request))
+        return await self._send(request)
+
+    async def _send(self, request: Request) -> Response:
+        if self._policy.large_record_size is None:
+            return Response.from_bytes(await self._pool.request(request.pack()))
+        return await self._send_parts(request)
+
+    async def _send_parts(self, request: Request) -> Response:
+        """Writes request without joining bin values and decodes large responses while reading."""
+        conn = await self._pool.acquire()
+        if isinstance(conn, StreamConnection):
+            read = partial(read_response, large_record_size=self._policy.large_record_size)
+            return await conn.request(request.pack_parts(), read=read)
+        return Response.from_bytes(await conn.request(request.pack_parts()))
+
+    async def _read(
+            self,
+            make_request: Callable[[], Request],
+            namespace: str,
+            key: str,
+            set_name: str = None,
+            bin_names: list = None,
+            filter_expression: Expression = None,
+    ):
+        """Executes read request through cache and singleflight, if client has them.
+
+        Requests are built lazily, so cache hits do not pay for packing and digest.
+        Filtered reads bypass cache, as their result depends on filter.
+        """
+        if bin_names is not None:
+            # read operations are keyed by their packed bytes
+            bin_names = tuple(b.pack() if isinstance(b, Bin) else b for b in bin_names)
+
+        async def load():
+            request = make_request()
+            if self._singleflight is None:
+                return await self._execute(request)
+            packed_filter = filter_expression.pack() if filter_expression is not None else None
+            flight_key = (namespace, set_name, request.key.digest, bin_names, packed_filter)
+            return await self._singleflight.do(flight_key, partial(self._execute, request))
+
+        if self._cache is None or filter_expression is not None:
+            return await load()
+
+        async def load_header():
+            return await self._execute(header_request(namespace=namespace, key=key, set_name=set_name))
+
+        return await self._cache.fetch(
+            record_key=(namespace, set_name, key),
+            bin_names=bin_names,
+            load=load,
+            load_header=load_header,
+        )
+
+    async def _write(self, request: Request, namespace: str, key: str, set_name: str):
+        if self._cache is None:
+            return await self._execute(request)
+
+        record_key = (namespace, set_name, key)
+        self._cache.invalidate(record_key)
+        try:
+            return await self._execute(request)
+        finally:
+            self._cache.invalidate(record_key)
+
+    @require_connection
+    async def info(self, *commands: str) -> Dict[str, str]:
+        """Sends info commands to Aerospike.
+
+        Info requests go through separate connection, opened on first call,
+        so they never wait behind data requests.
+
+        :param commands: info commands, e.g. 'statistics', 'namespace/test'.
+        :return: {command: value}
+        """
+        async with self._info_lock:
+            if self._info_connection is None or not self._info_connection.is_connected:
+                self._info_connection = await open_connection(
+                    self.host, self.port, transport='stream', policy=self._policy
+                )
+            data = await self._info_connection.request(info_request(commands))
+        return parse_info(data)
+
+    async def _info_value(self, command: str) -> str:
+        """Sends one info command and raises InfoError if server returned error."""
+        result = await self.info(command)
+        return check_info_value(result.get(command, ''))
+
+    def start_info_poller(self, commands=('statistics',), interval: float = 1.0) -> InfoPoller:
+        """Starts polling info commands to self.server_stats.
+
+        :param commands: info commands returning 'name=value;...' values.
+        :param float interval: seconds between requests.
+        :return: running poller
+        """
+        if self._info_poller is None:
+            self._info_poller = InfoPoller(self, commands=commands, interval=interval)
+            self._info_poller.start()
+        return self._info_poller
 
     @require_connection
     async def put(
@@ -77,16 +274,16 @@ class Client:
         key: str,
         bins: dict,
         set_name: str = None,
+        filter_expression: Expression = None,
     ):
         request = put_request(
             namespace=namespace,
             key=key,
             bins=bins,
-            set_name=set_name
+            set_name=set_name,
+            filter_expression=filter_expression,
         )
-        request.pack()
-        await self._send(request)
-        return await self._get_response()
+        return await self._write(request, namespace=namespace, key=key, set_name=set_name)
 
     @require_connection
     async def get(
@@ -94,73 +291,364 @@ class Client:
         namespace: str,
         key: str,
         set_name: str = None,
+        filter_expression: Expression = None,
     ):
-        request = get_request(
+        make_request = partial(
+            get_request,
             namespace=namespace,
             key=key,
-            set_name=set_name
+            set_name=set_name,
+            filter_expression=filter_expression,
+        )
+        return await self._read(
+            make_request, namespace=namespace, key=key, set_name=set_name, filter_expression=filter_expression
         )
-        request.pack()
-        await self._send(request)
-        return await self._get_response()
 
     async def select(
             self,
             namespace: str,
             key: str,
-            bin_names: list,
+            bin_names: List[Union[str, Bin]],
             set_name: str = None,
+            filter_expression: Expression = None,
     ):
-        request = select_request(
+        """Reads bins and read operations of one record in one round trip.
+
+        bin_names may mix bin names with read operations of asyncaerospike.operations,
+        use response.results to get result of every one in order:
+
+            r = await client.select('test', 'key', ['name', list_size('events'), list_get_range('events', -10)])
+            (_, name), (_, size), (_, last_events) = r.results
+
+        :param bin_names: bin names and read operations.
+        :raises ValueError: if operation is not a read.
+        """
+        make_request = partial(
+            select_request,
             namespace=namespace,
             key=key,
             set_name=set_name,
-            bin_names=bin_names
+            bin_names=bin_names,
+            filter_expression=filter_expression,
+        )
+        return await self._read(
+            make_request, namespace=namespace, key=key, set_name=set_name,
+            bin_names=bin_names, filter_expression=filter_expression,
         )
-        request.pack()
-        await self._send(request)
-        return await self._get_response()
 
     async def delete(
             self,
             namespace: str,
             key: str,
             set_name: str = None,
+            filter_expression: Expression = None,
     ):
         request = delete_request(
             namespace=namespace,
             key=key,
-            set_name=set_name
+            set_name=set_name,
+            filter_expression=filter_expression,
         )
-        request.pack()
-        await self._send(request)
-        return await self._get_response()
+        return await self._write(request, namespace=namespace, key=key, set_name=set_name)
 
     async def operate(
             self,
             namespace: str,
             key: str,
             operation_bins: List[Bin],
-            set_name: str = None
+            set_name: str = None,
+            filter_expression: Expression = None,
+            respond_all_ops: bool = False,
     ):
+        """Applies operations to one record in one round trip.
+
+        :param bool respond_all_ops: server responds to every operation, writes included,
+            so response.results lines up with operation_bins.
+        """
         request = operate_request(
             namespace=namespace,
             key=key,
             set_name=set_name,
-            operation_bins=operation_bins
+            operation_bins=operation_bins,
+            filter_expression=filter_expression,
+            respond_all_ops=respond_all_ops,
         )
-        request.pack()
-        await self._send(request)
-        return await self._get_response()
+        return await self._write(request, namespace=namespace, key=key, set_name=set_name)
+
+    async def udf_put(self, filename: str, content: Union[str, bytes], udf_type: str = 'LUA'):
+        """Registers UDF module on server.
+
+        :param str filename: module file name, e.g. 'counters.lua'.
+        :param content: module source code.
+        :param str udf_type: UDF language.
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        encoded = base64.b64encode(content).decode('ascii')
+        await self._info_value(
+            f'udf-put:filename={filename};content={encoded};content-len={len(encoded)};udf-type={udf_type};'
+        )
+
+    async def udf_remove(self, filename: str):
+        await self._info_value(f'udf-remove:filename={filename};')
+
+    async def udf_list(self) -> List[Dict[str, str]]:
+        """Registered UDF modules.
+
+        :return: [{'filename': ..., 'hash': ..., 'type': ...}]
+        """
+        return parse_info_list(await self._info_value('udf-list'))
+
+    @require_connection
+    async def apply(
+            self,
+            namespace: str,
+            key: str,
+            module: str,
+            function: str,
+            args: List[Any] = None,
+            set_name: str = None,
+            filter_expression: Expression = None,
+    ):
+        """Applies record UDF to one record in one round trip.
+
+        Use response.udf_result() to get value returned by function.
+
+        :param str module: UDF module name without extension.
+        :param str function: function name.
+        :param args: function arguments after record.
+        """
+        request = apply_request(
+            namespace=namespace,
+            key=key,
+            module=module,
+            function=function,
+            args=args,
+            set_name=set_name,
+            filter_expression=filter_expression,
+        )
+        return await self._write(request, namespace=namespace, key=key, set_name=set_name)
+
+    @require_connection
+    async def scan_apply(
+            self,
+            namespace: str,
+            module: str,
+            function: str,
+            args: List[Any] = None,
+            set_name: str = None,
+            filter_expression: Expression = None,
+    ) -> int:
+        """Starts background job applying record UDF to every record of namespace or set.
+
+        Cached records of this client are not invalidated.
+
+        :return: task id for job_status and wait_job
+        """
+        task_id = random.getrandbits(64)
+        request = background_udf_request(
+            namespace=namespace,
+            module=module,
+            function=function,
+            task_id=task_id,
+            args=args,
+            set_name=set_name,
+            filter_expression=filter_expression,
+        )
+        response = await self._execute(request)
+        response.raise_for_status()
+        return task_id
+
+    async def job_status(self, task_id: int) -> Dict[str, str]:
+        """Status of background job (Aerospike 6.0+ query-show).
+
+        :return: {name: value}, e.g. {'status': 'done(ok)', 'recs-succeeded': '10', ...}
+        """
+        value = await self._info_value(f'query-show:trid={task_id}')
+        return parse_info_values(value.replace(':', ';'))
+
+    async def wait_job(self, task_id: int, interval: float = 0.1) -> Dict[str, str]:
+        """Waits until background job is done.
+
+        :return: last job status
+        """
+        while True:
+            status = await self.job_status(task_id)
+            if status.get('status', '').startswith('done'):
+                return status
+            await asyncio.sleep(interval)
+
+    async def index_create(
+            self,
+            namespace: str,
+            bin_name: str,
+            index_name: str,
+            index_type: str = 'numeric',
+            set_name: str = None,
+    ):
+        """Creates secondary index on bin, server builds it in background.
+
+        :param str index_type: 'numeric' or 'string'.
+        """
+        command = f'sindex-create:namespace={namespace};'
+        if set_name:
+            command += f'set={set_name};'
+        command += f'indexname={index_name};bin={bin_name};type={index_type}'
+        await self._info_value(command)
+
+    async def index_drop(self, namespace: str, index_name: str):
+        await self._info_value(f'sindex-delete:namespace={namespace};indexname={index_name}')
+
+    async def index_list(self, namespace: str) -> List[Dict[str, str]]:
+        """Secondary indexes of namespace.
+
+        :return: [{'ns': ..., 'set': ..., 'indexname': ..., 'bin': ..., 'type': ..., ...}]
+        """
+        return parse_info_list(await self._info_value(f'sindex-list:namespace={namespace}'), separator=':')
+
+    async def query(
+            self,
+            namespace: str,
+            set_name: str = None,
+            predicate: Predicate = None,
+            bin_names: List[str] = None,
+            filter_expression: Expression = None,
+            parallelism: int = 1,
+            queue_size: int = 16,
+    ) -> AsyncIterator[Response]:
+        """Streams records matching secondary index predicate and filter expression.
+
+        Without predicate all records of namespace or set are read.
+        Every partition group is queried over its own connection, not the pool,
+        as server answers query with many messages. Stopping iteration early
+        closes these connections.
+
+            async for record in client.query('test', 'demo', predicate=between('age', 18, 30)):
+                print(record.digest, record.bins)
+
+        :param Predicate predicate: asyncaerospike.query.equals or between, bin must be indexed.
+        :param bin_names: bins to read, all if None.
+        :param int parallelism: number of partition groups queried concurrently.
+        :param int queue_size: response messages buffered per partition group,
+            when records are produced faster than they are consumed.
+        :return: async iterator of responses with digest and bins, in no particular order
+        """
+        if not self.is_connected:
+            raise ConnectionError()
+
+        request_kwargs = dict(
+            namespace=namespace,
+            set_name=set_name,
+            predicate=predicate,
+            bin_names=bin_names,
+            filter_expression=filter_expression,
+        )
+        groups = split_partitions(parallelism)
+        if len(groups) == 1:
+            stream = self._query_partitions(groups[0], request_kwargs)
+        else:
+            stream = self._query_parallel(groups, request_kwargs, queue_size)
+        try:
+            async for records in stream:
+                for record in records:
+                    yield record
+        finally:
+            await stream.aclose()
+
+    async def _query_parallel(
+            self, groups: List[List[int]], request_kwargs: Dict[str, Any], queue_size: int
+    ) -> AsyncIterator[List[Response]]:
+        """Queries partition groups concurrently, yields records as they arrive."""
+        queue = asyncio.Queue(maxsize=queue_size * len(groups))
+        workers = [
+            asyncio.ensure_future(self._query_worker(queue, partitions, request_kwargs)) for partitions in groups
+        ]
+        try:
+            running = len(workers)
+            while running:
+                records = await queue.get()
+                if records is None:
+                    running -= 1
+                    continue
+                if isinstance(records, Exception):
+                    raise records
+                yield records
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _query_worker(self, queue: asyncio.Queue, partitions: List[int], request_kwargs: Dict[str, Any]):
+        """Puts records of partitions to queue, then None or exception."""
+        stream = self._query_partitions(partitions, request_kwargs)
+        try:
+            async for records in stream:
+                await queue.put(records)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(None)
+        finally:
+            await stream.aclose()
+
+    async def _query_partitions(
+            self, partitions: List[int], request_kwargs: Dict[str, Any]
+    ) -> AsyncIterator[List[Response]]:
+        """Queries partitions over new connection, yields records of every response message.
+
+        Raises AerospikeError after the last message if server did not finish some partitions.
+        """
+        request = query_request(task_id=random.getrandbits(64), partitions=partitions, **request_kwargs)
+        conn = await open_connection(self.host, self.port, transport='stream', policy=self._policy)
+        stream = conn.request_stream(request.pack())
+        unfinished = []
+        try:
+            async for data in stream:
+                records, not_done, last = parse_records(data)
+                unfinished.extend(not_done)
+                if records:
+                    yield records
+                if last is not None:
+                    if last.status_code not in (AS_OK, AS_ERR_NOT_FOUND):
+                        raise AerospikeError(
+                            status_code=last.status_code,
+                            message=STATUS_TO_ERROR.get(last.status_code, 'unknown'),
+                        )
+                    break
+        finally:
+            conn.close()
+            await stream.aclose()
+
+        if unfinished:
+            status_code = unfinished[0][1]
+            raise AerospikeError(
+                status_code=status_code,
+                message=(
+                    f'{STATUS_TO_ERROR.get(status_code, "unknown")}: '
+                    f'partitions not queried: {sorted(p for p, _ in unfinished)}'
+                ),
+            )
 
 
 async def connection(
     host: str,
     port: int,
+    cache: RecordCache = None,
+    singleflight: SingleFlight = None,
+    transport: str = 'stream',
+    policy: ConnectionPolicy = None,
+    breaker: CircuitBreaker = None,
+    profiler: RequestProfiler = None,
 ) -> Client:
     client = Client(
         host=host,
-        port=port
+        port=port,
+        cache=cache,
+        singleflight=singleflight,
+        transport=transport,
+        policy=policy,
+        breaker=breaker,
+        profiler=profiler,
     )
     await client.connect()
     return client
@@ -0,0 +1,145 @@
+import hashlib
+from struct import Struct
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# op size, operation type, particle type, version, name length
+OPERATION_HEADER = Struct('!IBBBB')
+HEADER = Struct('!Q')
+HEADER_SIZE = HEADER.size
+PROTOCOL_VERSION = 2
+
+_PARTICLE_TYPE = Struct('!B')
+_INTEGER = Struct('!Q')
+_DOUBLE = Struct('!d')
+
+
+def py_digest(set_name: bytes, particle_type: int, value: bytes) -> bytes:
+    """RIPEMD-160 of set name, particle type byte and packed key value."""
+    ripe = hashlib.new('ripemd160')
+    ripe.update(set_name)
+    ripe.update(_PARTICLE_TYPE.pack(particle_type) + value)
+    return ripe.digest()
+
+
+def py_pack_bin(operation_type: int, particle_type: int, version: int, name: bytes, value: bytes) -> bytes:
+    """Packs bin operation."""
+    return OPERATION_HEADER.pack(
+        4 + len(name) + len(value), operation_type, particle_type, version, len(name)
+    ) + name + value
+
+
+def py_pack_header(request_type: int, request_length: int) -> bytes:
+    """Packs protocol header: version, request type and 6 bytes of length."""
+    if request_length >> 48:
+        raise ValueError('request is too long')
+    return HEADER.pack((PROTOCOL_VERSION << 56) | (request_type << 48) | request_length)
+
+
+def py_unpack_header(data: bytes) -> Tuple[int, int]:
+    """Unpacks protocol header to (request_type, request_length)."""
+    if len(data) < HEADER_SIZE:
+        raise ValueError('header is too short')
+    header = HEADER.unpack_from(data)[0]
+    if header >> 56 != PROTOCOL_VERSION:
+        raise ValueError(f'unsupported protocol version {header >> 56}')
+    return (header >> 48) & 0xFF, header & 0xFFFFFFFFFFFF
+
+
+def _iter_bins(data: bytes, bins_num: int, fallback: Callable[[int, bytes], Any]) -> Iterator[Tuple[str, Any]]:
+    offset = 0
+    for _ in range(bins_num):
+        size, _, particle_type, _, name_length = OPERATION_HEADER.unpack_from(data, offset)
+        name_start = offset + OPERATION_HEADER.size
+        value_start = name_start + name_length
+        end = offset + 4 + size
+        if size < 4 + name_length or end > len(data):
+            raise ValueError('truncated bin')
+
+        if particle_type == 0:
+            value = None
+        elif particle_type == 1 and end - value_start == 8:
+            value = _INTEGER.unpack_from(data, value_start)[0]
+        elif particle_type == 2 and end - value_start == 8:
+            value = _DOUBLE.unpack_from(data, value_start)[0]
+        elif particle_type == 3:
+            value = str(data[value_start:end], 'utf-8')
+        else:
+            value = fallback(particle_type, data[value_start:end])
+
+        yield str(data[name_start:value_start], 'utf-8'), value
+        offset = end
+
+
+def py_decode_bins(data: bytes, bins_num: int, fallback: Callable[[int, bytes], Any]) -> dict:
+    """Decodes bin operations to {name: value}.
+
+    Integer, double and string particles are decoded here,
+    others with fallback(particle_type, particle_bytes).
+    """
+    return dict(_iter_bins(data, bins_num, fallback))
+
+
+def decode_operations(data: bytes, bins_num: int, fallback: Callable[[int, bytes], Any]) -> List[Tuple[str, Any]]:
+    """Decodes bin operations to [(name, value)] in response order, names may repeat."""
+    return list(_iter_bins(data, bins_num, fallback))
+
+
+def py_decode_record(
+        data: bytes,
+        bins_num: int,
+        slots: Dict[bytes, Tuple[int, int, bool]],
+        values: list,
+        fallback: Callable[[int, bytes], Any],
+) -> Optional[Tuple[bytes, int]]:
+    """Decodes bin operations into values list of record schema.
+
+    :param slots: {name: (index in values, expected particle type or -1 for any, nullable)},
+        bins not in slots are skipped.
+    :return: None or (name, particle type) of first bin with unexpected type
+    """
+    offset = 0
+    for _ in range(bins_num):
+        size, _, particle_type, _, name_length = OPERATION_HEADER.unpack_from(data, offset)
+        name_start = offset + OPERATION_HEADER.size
+        value_start = name_start + name_length
+        end = offset + 4 + size
+        if size < 4 + name_length or end > len(data):
+            raise ValueError('truncated bin')
+        offset = end
+
+        slot = slots.get(data[name_start:value_start])
+        if slot is None:
+            continue
+        index, expected, nullable = slot
+
+        if particle_type == 0:
+            if not nullable:
+                return data[name_start:value_start], particle_type
+            values[index] = None
+        elif expected != -1 and particle_type != expected:
+            return data[name_start:value_start], particle_type
+        elif particle_type == 1 and end - value_start == 8:
+            values[index] = _INTEGER.unpack_from(data, value_start)[0]
+        elif particle_type == 2 and end - value_start == 8:
+            values[index] = _DOUBLE.unpack_from(data, value_start)[0]
+        elif particle_type == 3:
+            values[index] = str(data[value_start:end], 'utf-8')
+        else:
+            values[index] = fallback(particle_type, data[value_start:end])
+    return None
+
+
+# C implementation is optional, py_* functions produce identical output
+try:
+    from asyncaerospike._speedups import (
+        decode_bins, decode_record, digest, pack_bin, pack_header, unpack_header
+    )
+    HAS_SPEEDUPS = True
+except ImportError:
+    decode_bins = py_decode_bins
+    decode_record = py_decode_record
+    digest = py_digest
+    pack_bin = py_pack_bin
+    pack_header = py_pack_header
+    unpack_header = py_unpack_header
+    HAS_SPEEDUPS = False
@@ -0,0 +1,155 @@
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+from asyncaerospike.codec import OPERATION_HEADER
+from asyncaerospike.datatypes import AerospikeDouble, AerospikeInteger, AerospikeType
+from asyncaerospike.errors import SchemaError
+from asyncaerospike.response import Response
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+# numpy dtypes with the same layout as datatypes encoders
+AEROSPIKE_TYPE_CODE_TO_DTYPE = {
+    AerospikeType.INTEGER: '>u8',
+    AerospikeType.DOUBLE: '>f8',
+}
+
+PARTICLE_ENCODER = {
+    AerospikeType.INTEGER: AerospikeInteger.ENCODER,
+    AerospikeType.DOUBLE: AerospikeDouble.ENCODER,
+}
+
+
+# layouts decoded as matrix per data length, rows of other layouts are decoded one by one
+MAX_LAYOUTS = 4
+
+
+class Column(NamedTuple):
+    """Values of one numeric bin across records.
+
+    values: numpy array with bin values (0 where value is missing).
+    mask: numpy bool array, True where record has no such bin or bin is None.
+    """
+    values: 'np.ndarray'
+    mask: 'np.ndarray'
+
+
+# decoded part of column: type code, row indexes, values
+_Part = Tuple[int, object, object]
+
+
+def _walk(data: bytes, bins_num: int, wanted: Dict[bytes, str]) -> Iterable[Tuple[int, int, int, int, str]]:
+    """Yields (header start, value start, end, type code, wanted bin name or None) of every bin."""
+    offset = 0
+    for _ in range(bins_num):
+        size, _, type_code, _, name_length = OPERATION_HEADER.unpack_from(data, offset)
+        value_start = offset + OPERATION_HEADER.size + name_length
+        end = offset + 4 + size
+        name = wanted.get(data[offset + OPERATION_HEADER.size:value_start])
+        if name is not None and type_code != AerospikeType.UNDEF and type_code not in AEROSPIKE_TYPE_CODE_TO_DTYPE:
+            raise SchemaError(f'Bin {name!r} has non numeric type {type_code}')
+        yield offset, value_start, end, type_code, name
+        offset = end
+
+
+def _decode_same_layout(
+        responses: List[Response], rows: List[int], wanted: Dict[bytes, str], parts: Dict[str, List[_Part]]
+) -> List[int]:
+    """Decodes rows laid out like the first of them as 2d byte matrix, column per bin at once.
+
+    Rows are of equal data length. Row has the same layout if its bin headers and names
+    are equal to those of the first row.
+
+    :return: rows with other layout
+    """
+    first = responses[rows[0]]
+    layout = list(_walk(first.resp_data, first.bins_num, wanted))
+    if len(rows) == len(responses):
+        selected = responses
+    else:
+        selected = [responses[row] for row in rows]
+    matrix = np.frombuffer(
+        b''.join([r.resp_data for r in selected]), dtype=np.uint8
+    ).reshape(len(rows), len(first.resp_data))
+
+    headers = np.concatenate([np.arange(start, value_start) for start, value_start, _, _, _ in layout] or [[]])
+    headers = headers.astype(np.intp)
+    same = (matrix[:, headers] == matrix[0, headers]).all(axis=1)
+    same &= np.array([r.bins_num for r in selected]) == first.bins_num
+    indexes = np.asarray(rows, dtype=np.intp)
+
+    if not same.all():
+        matrix = matrix[same]
+    for _, value_start, end, type_code, name in layout:
+        if name is None or type_code == AerospikeType.UNDEF:
+            continue
+        values = np.ascontiguousarray(matrix[:, value_start:end]).view(AEROSPIKE_TYPE_CODE_TO_DTYPE[type_code])
+        parts[name].append((type_code, indexes[same], values.ravel()))
+
+    return indexes[~same].tolist()
+
+
+def _decode_rows(
+        responses: List[Response], rows: List[int], wanted: Dict[bytes, str], parts: Dict[str, List[_Part]]
+):
+    """Decodes rows one by one."""
+    for row in rows:
+        response = responses[row]
+        data = response.resp_data
+        for _, value_start, _, type_code, name in _walk(data, response.bins_num, wanted):
+            if name is None or type_code == AerospikeType.UNDEF:
+                continue
+            value = PARTICLE_ENCODER[type_code].unpack_from(data, value_start)[0]
+            parts[name].append((type_code, [row], [value]))
+
+
+def to_columns(responses: Iterable[Response], bin_names: List[str]) -> Dict[str, Column]:
+    """Decodes INTEGER and DOUBLE bins of many records to numpy arrays.
+
+    Records with the same layout (same bins, types and data length, as records
+    read with one select or of one schema) are decoded together: their data is
+    viewed as 2d byte matrix and every bin is one column slice of it. Other
+    records are decoded one by one.
+
+    :param responses: responses with one record each (e.g. from get/select).
+    :param bin_names: names of numeric bins to decode.
+    :return: {bin name: Column}
+    """
+    if np is None:
+        raise ImportError('numpy is required for columnar decoding: pip install asyncaerospike[numpy]')
+
+    responses = list(responses)
+    wanted = {name.encode('utf-8'): name for name in bin_names}
+    parts: Dict[str, List[_Part]] = {name: [] for name in bin_names}
+
+    lengths = [len(r.resp_data) for r in responses]
+    if lengths and min(lengths) == max(lengths):
+        groups = [list(range(len(responses)))]
+    else:
+        by_length: Dict[int, List[int]] = {}
+        for row, length in enumerate(lengths):
+            by_length.setdefault(length, []).append(row)
+        groups = by_length.values()
+    for rows in groups:
+        for _ in range(MAX_LAYOUTS):
+            if len(rows) < 2:
+                break
+            rows = _decode_same_layout(responses, rows, wanted, parts)
+        _decode_rows(responses, rows, wanted, parts)
+
+    columns = {}
+    for name in bin_names:
+        types = sorted({type_code for type_code, _, _ in parts[name]})
+        if len(types) > 1:
+            raise SchemaError(f'Bin {name!r} has mixed types {types[0]} and {types[1]}')
+        dtype = np.dtype(AEROSPIKE_TYPE_CODE_TO_DTYPE[types[0] if types else AerospikeType.INTEGER])
+        values = np.zeros(len(responses), dtype=dtype.newbyteorder('='))
+        mask = np.ones(len(responses), dtype=bool)
+        for _, indexes, part in parts[name]:
+            values[indexes] = part
+            mask[indexes] = False
+        columns[name] = Column(values=values, mask=mask)
+    return columns
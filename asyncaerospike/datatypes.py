@@ -1,5 +1,4 @@
 from abc import ABC, abstractmethod
-import hashlib
 import struct
 from struct import Struct
 from enum import IntEnum
@@ -7,12 +6,15 @@ from typing import Any
 
 import msgpack
 
+from asyncaerospike.codec import digest
+
 
 class AerospikeType(IntEnum):
     UNDEF = 0
     INTEGER = 1
     DOUBLE = 2
     STRING = 3
+    BLOB = 4
     MAP = 19
     LIST = 20
 
@@ -51,11 +53,8 @@ class AerospikeDataType(ABC):
 
         :return: encoded data type for Aerospike request
         """
-        ripe = hashlib.new('ripemd160')
-        if self.set_name:
-            ripe.update(self.set_name.encode('utf-8'))
-        ripe.update(struct.pack('!B', self.TYPE.value) + self.pack_data())
-        return ripe.digest()
+        set_name = self.set_name.encode('utf-8') if self.set_name else b''
+        return digest(set_name, self.TYPE, self.pack_data())
 
 
 class AerospikeUndef(AerospikeDataType):
@@ -116,15 +115,86 @@ class AerospikeDouble(AerospikeDataType):
         return self.ENCODER.size
 
 
+class AerospikeBlob(AerospikeDataType):
+    TYPE = AerospikeType.BLOB
+
+    def pack_data(self) -> bytes:
+        return bytes(self.data)
+
+    @classmethod
+    def unpack(cls, data: bytes):
+        return cls(data=bytes(data))
+
+    def __len__(self):
+        return len(self.data)
+
+
+_UINT8 = Struct('!B')
+_UINT16 = Struct('!H')
+_UINT32 = Struct('!I')
+
+
+def _pack_str_header(size: int) -> bytes:
+    if size < 32:
+        return _UINT8.pack(0xa0 | size)
+    if size < 0x100:
+        return b'\xd9' + _UINT8.pack(size)
+    if size < 0x10000:
+        return b'\xda' + _UINT16.pack(size)
+    return b'\xdb' + _UINT32.pack(size)
 
 
-    # @classmethod
-    # def parse(cls, data: bytes) -> "AerospikeList":
-        raw_values = msgpack.unpackb(data)
-        parsed_values = []
-        for value in raw_values:
-            parsed_values.append(unpack_aerospike(value))
-        return cls(parsed_values, len(data))
+def _pack_bin_header(size: int) -> bytes:
+    if size < 0x100:
+        return b'\xc4' + _UINT8.pack(size)
+    if size < 0x10000:
+        return b'\xc5' + _UINT16.pack(size)
+    return b'\xc6' + _UINT32.pack(size)
+
+
+def _pack_container_header(size: int, fix_code: int, codes: bytes) -> bytes:
+    if size < 16:
+        return _UINT8.pack(fix_code | size)
+    if size < 0x10000:
+        return codes[:1] + _UINT16.pack(size)
+    return codes[1:] + _UINT32.pack(size)
+
+
+def pack_msgpack(value: Any) -> bytes:
+    """Packs value to msgpack as Aerospike stores it in lists and maps:
+    strings and bytes start with particle type byte.
+    """
+    if isinstance(value, str):
+        data = value.encode('utf-8')
+        return _pack_str_header(len(data) + 1) + _UINT8.pack(AerospikeType.STRING) + data
+    if isinstance(value, (bytes, bytearray)):
+        return _pack_bin_header(len(value) + 1) + _UINT8.pack(AerospikeType.BLOB) + bytes(value)
+    if isinstance(value, (list, tuple)):
+        return _pack_container_header(len(value), 0x90, b'\xdc\xdd') + b''.join(pack_msgpack(v) for v in value)
+    if isinstance(value, dict):
+        return _pack_container_header(len(value), 0x80, b'\xde\xdf') + b''.join(
+            pack_msgpack(k) + pack_msgpack(v) for k, v in value.items()
+        )
+    return msgpack.packb(value)
+
+
+def _unpack_particle(value: Any) -> Any:
+    if isinstance(value, bytes):
+        if not value:
+            return value
+        if value[0] == AerospikeType.BLOB:
+            return value[1:]
+        return value[1:].decode('utf-8')
+    if isinstance(value, list):
+        return [_unpack_particle(v) for v in value]
+    if isinstance(value, dict):
+        return {_unpack_particle(k): _unpack_particle(v) for k, v in value.items()}
+    return value
+
+
+def unpack_msgpack(data: bytes) -> Any:
+    """Unpacks msgpack packed by pack_msgpack or by Aerospike."""
+    return _unpack_particle(msgpack.unpackb(data, raw=True, strict_map_key=False))
 
 
 class AerospikeList(AerospikeDataType):
@@ -135,21 +205,13 @@ class AerospikeList(AerospikeDataType):
         self.size = None
 
     def pack_data(self) -> bytes:
-        data_list = []
-        for d in self.data:
-            data_list.append(pack_native(d))
-
-        data = msgpack.packb(data_list)
+        data = pack_msgpack(list(self.data))
         self.size = len(data)
         return data
 
     @classmethod
     def unpack(cls, data: bytes):
-        data_list = msgpack.unpackb(data)
-        parsed_values = []
-        for d in data_list:
-            parsed_values.append(unpack_aerospike(value))
-        return cls(parsed_values, len(data))
+        return cls(data=unpack_msgpack(data))
 
     def __len__(self):
         if self.size:
@@ -157,15 +219,23 @@ class AerospikeList(AerospikeDataType):
         return len(self.pack_data())
 
 
+class AerospikeMap(AerospikeList):
+    TYPE = AerospikeType.MAP
+
+    def pack_data(self) -> bytes:
+        data = pack_msgpack(dict(self.data))
+        self.size = len(data)
+        return data
+
+
 def pack_aerospike(data: Any) -> bytes:
     data = PYTHON_TYPE_TO_AEROSPIKE_TYPE[type(data)](data=data)
     return struct.pack("!B", data.TYPE) + data.pack_data()
 
 
-def unpack_aerospike(data: bytes) -> AerospikeDataType:
+def unpack_aerospike(data: bytes) -> Any:
     atype = AEROSPIKE_TYPE_CODE_TO_AEROSPIKE_TYPE[data[0]]
-    parsed = parse_raw(atype, data[1:])
-    return parsed.value
+    return atype.unpack(data[1:]).data
 
 
 PYTHON_TYPE_TO_AEROSPIKE_TYPE = {
@@ -173,7 +243,10 @@ PYTHON_TYPE_TO_AEROSPIKE_TYPE = {
     type(None): AerospikeUndef,
     int: AerospikeInteger,
     float: AerospikeDouble,
+    bytes: AerospikeBlob,
     list: AerospikeList,
+    tuple: AerospikeList,
+    dict: AerospikeMap,
 }
 
 AEROSPIKE_TYPE_CODE_TO_AEROSPIKE_TYPE = {
@@ -181,5 +254,7 @@ AEROSPIKE_TYPE_CODE_TO_AEROSPIKE_TYPE = {
     AerospikeType.UNDEF: AerospikeUndef,
     AerospikeType.INTEGER: AerospikeInteger,
     AerospikeType.DOUBLE: AerospikeDouble,
+    AerospikeType.BLOB: AerospikeBlob,
     AerospikeType.LIST: AerospikeList,
+    AerospikeType.MAP: AerospikeMap,
 }
@@ -27,7 +27,8 @@ STATUS_TO_ERROR = {
     24: 'AS_ERR_ELEMENT_EXISTS',
     25: 'AS_ERR_ENTERPRISE_ONLY',
     26: 'AS_ERR_OP_NOT_APPLICABLE',
-    27: 'AS_ERR_LOST_CONFLICT',
+    27: 'AS_ERR_FILTERED_OUT',
+    28: 'AS_ERR_LOST_CONFLICT',
 
     # security specific errors
     50: 'AS_SEC_OK_LAST',
@@ -92,3 +93,23 @@ class AerospikeError(Exception):
         self.status_code = status_code
         self.message = message
         super().__init__(self.message)
+
+    def __reduce__(self):
+        # args hold only message, so default pickling can not call __init__ (errors of sharded client)
+        return type(self), (self.status_code, self.message)
+
+
+class SchemaError(TypeError):
+    """Record does not match registered schema"""
+
+
+class CircuitOpenError(ConnectionError):
+    """Circuit breaker of node is open, request was not sent"""
+
+
+class OverloadedError(ConnectionError):
+    """Too many requests in flight to node, request was not sent"""
+
+
+class InfoError(AerospikeError):
+    """Info command returned error"""
@@ -0,0 +1,254 @@
+from enum import IntEnum
+from typing import Any
+
+import msgpack
+
+from asyncaerospike.datatypes import pack_msgpack
+
+_PACKER = msgpack.Packer()
+
+
+class ExpOp(IntEnum):
+    EQ = 1
+    NE = 2
+    GT = 3
+    GE = 4
+    LT = 5
+    LE = 6
+    REGEX = 7
+    AND = 16
+    OR = 17
+    NOT = 18
+    DIGEST_MODULO = 64
+    DEVICE_SIZE = 65
+    LAST_UPDATE = 66
+    SINCE_UPDATE = 67
+    VOID_TIME = 68
+    TTL = 69
+    SET_NAME = 70
+    KEY_EXISTS = 71
+    IS_TOMBSTONE = 72
+    KEY = 80
+    BIN = 81
+    BIN_TYPE = 82
+    QUOTE = 126
+
+
+class ExpType(IntEnum):
+    NIL = 0
+    BOOL = 1
+    INT = 2
+    STRING = 3
+    LIST = 4
+    MAP = 5
+    BLOB = 6
+    FLOAT = 7
+    GEO = 8
+    HLL = 9
+
+
+class Value:
+    """Literal operand of expression."""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def pack(self) -> bytes:
+        if isinstance(self.value, (list, tuple)):
+            # lists would be read as expressions, so they are quoted
+            return _PACKER.pack_array_header(2) + msgpack.packb(ExpOp.QUOTE) + pack_msgpack(self.value)
+        return pack_msgpack(self.value)
+
+
+class Expression:
+    """Filter expression evaluated by server.
+
+    Build expressions with functions of this module, e.g.
+    and_(int_bin('age') >= 18, eq(str_bin('country'), 'NL')).
+    Comparison operators <, <=, >, >= and &, |, ~ are also supported.
+
+    :param op: expression operation.
+    :param args: operands: expressions, Value literals, plain ints and strings
+        (bin names, types, flags).
+    """
+
+    __slots__ = ('op', 'args')
+
+    def __init__(self, op: ExpOp, *args):
+        self.op = op
+        self.args = args
+
+    def pack(self) -> bytes:
+        """Packs expression to msgpack for filter expression field."""
+        parts = [_PACKER.pack_array_header(len(self.args) + 1), msgpack.packb(int(self.op))]
+        for arg in self.args:
+            if isinstance(arg, (Expression, Value)):
+                parts.append(arg.pack())
+            else:
+                parts.append(msgpack.packb(arg))
+        return b''.join(parts)
+
+    def __gt__(self, other):
+        return gt(self, other)
+
+    def __ge__(self, other):
+        return ge(self, other)
+
+    def __lt__(self, other):
+        return lt(self, other)
+
+    def __le__(self, other):
+        return le(self, other)
+
+    def __and__(self, other):
+        return and_(self, other)
+
+    def __or__(self, other):
+        return or_(self, other)
+
+    def __invert__(self):
+        return not_(self)
+
+    def __repr__(self):
+        return f'<Expression {self.op.name}>'
+
+
+def _operand(value: Any):
+    return value if isinstance(value, (Expression, Value)) else Value(value)
+
+
+def _bin(name: str, exp_type: ExpType) -> Expression:
+    return Expression(ExpOp.BIN, int(exp_type), name)
+
+
+def int_bin(name: str) -> Expression:
+    return _bin(name, ExpType.INT)
+
+
+def float_bin(name: str) -> Expression:
+    return _bin(name, ExpType.FLOAT)
+
+
+def str_bin(name: str) -> Expression:
+    return _bin(name, ExpType.STRING)
+
+
+def bool_bin(name: str) -> Expression:
+    return _bin(name, ExpType.BOOL)
+
+
+def blob_bin(name: str) -> Expression:
+    return _bin(name, ExpType.BLOB)
+
+
+def list_bin(name: str) -> Expression:
+    return _bin(name, ExpType.LIST)
+
+
+def map_bin(name: str) -> Expression:
+    return _bin(name, ExpType.MAP)
+
+
+def bin_type(name: str) -> Expression:
+    """Particle type of bin, 0 if record has no such bin."""
+    return Expression(ExpOp.BIN_TYPE, name)
+
+
+def bin_exists(name: str) -> Expression:
+    return ne(bin_type(name), 0)
+
+
+def key_int() -> Expression:
+    """Integer user key, record must be stored with key."""
+    return Expression(ExpOp.KEY, int(ExpType.INT))
+
+
+def key_str() -> Expression:
+    """String user key, record must be stored with key."""
+    return Expression(ExpOp.KEY, int(ExpType.STRING))
+
+
+def key_exists() -> Expression:
+    return Expression(ExpOp.KEY_EXISTS)
+
+
+def set_name() -> Expression:
+    return Expression(ExpOp.SET_NAME)
+
+
+def ttl() -> Expression:
+    """Seconds record has to live."""
+    return Expression(ExpOp.TTL)
+
+
+def void_time() -> Expression:
+    """Expiration time in nanoseconds since epoch."""
+    return Expression(ExpOp.VOID_TIME)
+
+
+def last_update() -> Expression:
+    """Last update time in nanoseconds since epoch."""
+    return Expression(ExpOp.LAST_UPDATE)
+
+
+def since_update() -> Expression:
+    """Milliseconds since last update."""
+    return Expression(ExpOp.SINCE_UPDATE)
+
+
+def device_size() -> Expression:
+    return Expression(ExpOp.DEVICE_SIZE)
+
+
+def is_tombstone() -> Expression:
+    return Expression(ExpOp.IS_TOMBSTONE)
+
+
+def digest_modulo(mod: int) -> Expression:
+    return Expression(ExpOp.DIGEST_MODULO, mod)
+
+
+def eq(left: Any, right: Any) -> Expression:
+    return Expression(ExpOp.EQ, _operand(left), _operand(right))
+
+
+def ne(left: Any, right: Any) -> Expression:
+    return Expression(ExpOp.NE, _operand(left), _operand(right))
+
+
+def gt(left: Any, right: Any) -> Expression:
+    return Expression(ExpOp.GT, _operand(left), _operand(right))
+
+
+def ge(left: Any, right: Any) -> Expression:
+    return Expression(ExpOp.GE, _operand(left), _operand(right))
+
+
+def lt(left: Any, right: Any) -> Expression:
+    return Expression(ExpOp.LT, _operand(left), _operand(right))
+
+
+def le(left: Any, right: Any) -> Expression:
+    return Expression(ExpOp.LE, _operand(left), _operand(right))
+
+
+def regex(exp: Expression, pattern: str, flags: int = 0) -> Expression:
+    """String expression matches POSIX regular expression.
+
+    :param flags: REG_* flags, e.g. 2 for REG_ICASE.
+    """
+    return Expression(ExpOp.REGEX, flags, pattern, exp)
+
+
+def and_(*expressions: Expression) -> Expression:
+    return Expression(ExpOp.AND, *expressions)
+
+
+def or_(*expressions: Expression) -> Expression:
+    return Expression(ExpOp.OR, *expressions)
+
+
+def not_(expression: Expression) -> Expression:
+    return Expression(ExpOp.NOT, expression)
@@ -0,0 +1,833 @@
+import asyncio
+import base64
+from collections import deque
+from functools import partial
+import hashlib
+import operator
+import os
+import re
+from struct import Struct
+import threading
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+import msgpack
+
+from asyncaerospike.admin import AdminCommand, AdminField, admin_request, parse_admin_response
+from asyncaerospike.base import Base
+from asyncaerospike.bin import OperationTypes
+from asyncaerospike.codec import OPERATION_HEADER
+from asyncaerospike.datatypes import (
+    AEROSPIKE_TYPE_CODE_TO_AEROSPIKE_TYPE, PYTHON_TYPE_TO_AEROSPIKE_TYPE, AerospikeType, unpack_msgpack
+)
+from asyncaerospike.expressions import ExpOp
+from asyncaerospike.fields import FieldTypes, UdfOpTypes
+from asyncaerospike.header import Headers, RequestType
+from asyncaerospike.info_flags import Info1Flags, Info2Flags, Info3Flags
+from asyncaerospike.operations import ListOp, MapOp
+from asyncaerospike.query import partition_id
+
+
+FIELD_HEADER = Struct('!IB')
+VALUE_LENGTH = Struct('!I')
+
+NUMERIC_CODECS = {
+    AerospikeType.INTEGER: Struct('!q'),
+    AerospikeType.DOUBLE: Struct('!d'),
+}
+
+AS_OK = 0
+AS_ERR_NOT_FOUND = 2
+AS_ERR_GENERATION = 3
+AS_ERR_PARAMETER = 4
+AS_ERR_RECORD_EXISTS = 5
+AS_ERR_UNAVAILABLE = 11
+AS_ERR_INCOMPATIBLE_TYPE = 12
+AS_ERR_UNSUPPORTED_FEATURE = 16
+AS_ERR_OP_NOT_APPLICABLE = 26
+AS_ERR_FILTERED_OUT = 27
+AS_ERR_UDF_EXECUTION = 100
+AS_ERR_SINDEX_FOUND = 200
+AS_ERR_SINDEX_NOT_FOUND = 201
+AS_SEC_ERR_NOT_ENABLED = 52
+AS_SEC_ERR_COMMAND = 54
+AS_SEC_ERR_USER = 60
+AS_SEC_ERR_CREDENTIAL = 65
+AS_SEC_ERR_EXPIRED_SESSION = 66
+AS_SEC_ERR_NOT_AUTHENTICATED = 80
+
+# bin name -> (particle type, particle bytes)
+Bins = Dict[str, Tuple[int, bytes]]
+
+
+INDEX_TYPES = {'numeric': AerospikeType.INTEGER, 'string': AerospikeType.STRING}
+
+
+# UDF stand-in: function(bins as {name: value}, *args) -> result, may change bins in place
+UdfFunction = Callable[..., Any]
+
+
+class FakeRecord:
+    __slots__ = ('bins', 'generation', 'set_name')
+
+    def __init__(self, set_name: str = ''):
+        self.bins: Bins = {}
+        self.generation = 0
+        self.set_name = set_name
+
+
+class FakeRequest:
+    """Parsed message request"""
+
+    def __init__(self, data: bytes):
+        self.base = Base.unpack(data)
+        offset = Base.ENCODER.size
+
+        self.fields: Dict[int, bytes] = {}
+        for _ in range(self.base.fields_num):
+            size, field_type = FIELD_HEADER.unpack_from(data, offset)
+            start = offset + FIELD_HEADER.size
+            offset = start + size - 1
+            self.fields[field_type] = data[start:offset]
+
+        # (operation type, bin name, particle type, particle bytes)
+        self.operations: List[Tuple[int, str, int, bytes]] = []
+        for _ in range(self.base.bins_num):
+            size, operation_type, particle_type, _, name_length = OPERATION_HEADER.unpack_from(data, offset)
+            name_start = offset + OPERATION_HEADER.size
+            value_start = name_start + name_length
+            offset += 4 + size
+            name = data[name_start:value_start].decode('utf-8')
+            self.operations.append((operation_type, name, particle_type, data[value_start:offset]))
+
+    @property
+    def record_key(self) -> Tuple[bytes, bytes]:
+        return self.fields.get(FieldTypes.NAMESPACE, b''), self.fields.get(FieldTypes.DIGEST, b'')
+
+    @property
+    def set_name(self) -> str:
+        return self.fields.get(FieldTypes.SET, b'').decode('utf-8')
+
+
+def _pack_operation(operation_type: int, name: str, particle_type: int, value: bytes) -> bytes:
+    name = name.encode('utf-8')
+    return OPERATION_HEADER.pack(
+        4 + len(name) + len(value), operation_type, particle_type, 0, len(name)
+    ) + name + value
+
+
+def _pack_message(status_code: int, generation: int = 0, operations: List[bytes] = ()) -> bytes:
+    base = Base(
+        info1=0, info2=0, info3=Info3Flags.LAST, fields_num=0, bins_num=len(operations),
+        status_code=status_code, generation=generation, transaction_ttl=0,
+    )
+    message = base.pack() + b''.join(operations)
+    return Headers(request_type=RequestType.MESSAGE, request_length=len(message)).pack() + message
+
+
+def _pack_record(digest: bytes, generation: int, operations: List[bytes], info3: int = 0) -> bytes:
+    """Record message of query response, without proto header."""
+    base = Base(
+        info1=0, info2=0, info3=info3, fields_num=1, bins_num=len(operations),
+        generation=generation, transaction_ttl=0,
+    )
+    digest_field = FIELD_HEADER.pack(len(digest) + 1, FieldTypes.DIGEST) + digest
+    return base.pack() + digest_field + b''.join(operations)
+
+
+def _pack_messages(*messages: bytes) -> bytes:
+    message = b''.join(messages)
+    return Headers(request_type=RequestType.MESSAGE, request_length=len(message)).pack() + message
+
+
+def _unpack_predicate(data: bytes) -> Tuple[str, int, bytes, bytes]:
+    """Parses index range field: (bin name, particle type, begin, end)."""
+    offset = 2 + data[1]
+    name = data[2:offset].decode('utf-8')
+    particle_type = data[offset]
+    offset += 1
+    values = []
+    for _ in range(2):
+        size, = VALUE_LENGTH.unpack_from(data, offset)
+        offset += VALUE_LENGTH.size
+        values.append(data[offset:offset + size])
+        offset += size
+    return name, particle_type, values[0], values[1]
+
+
+def _pack_admin(status_code: int, fields: Dict[int, bytes] = None) -> bytes:
+    # admin responses carry result code at the second byte of admin header
+    response = bytearray(admin_request(0, fields or {}))
+    response[Headers.SIZE + 1] = status_code
+    return bytes(response)
+
+
+def _compare(compare, args, record, set_name):
+    left, right = (_eval_expression(a, record, set_name) for a in args)
+    try:
+        return compare(left, right)
+    except TypeError:
+        return False
+
+
+def _regex(args, record, set_name):
+    _, pattern, value_exp = args
+    value = _eval_expression(value_exp, record, set_name)
+    return isinstance(value, str) and re.search(pattern.decode('utf-8'), value) is not None
+
+
+def _bin_value(args, record, set_name):  # noqa: U100
+    particle = record.bins.get(args[1].decode('utf-8'))
+    return None if particle is None else _particle_value(*particle)
+
+
+EXPRESSION_HANDLERS = {
+    ExpOp.EQ: partial(_compare, operator.eq),
+    ExpOp.NE: partial(_compare, operator.ne),
+    ExpOp.GT: partial(_compare, operator.gt),
+    ExpOp.GE: partial(_compare, operator.ge),
+    ExpOp.LT: partial(_compare, operator.lt),
+    ExpOp.LE: partial(_compare, operator.le),
+    ExpOp.AND: lambda args, record, set_name: all(_eval_expression(a, record, set_name) for a in args),
+    ExpOp.OR: lambda args, record, set_name: any(_eval_expression(a, record, set_name) for a in args),
+    ExpOp.NOT: lambda args, record, set_name: not _eval_expression(args[0], record, set_name),
+    ExpOp.REGEX: _regex,
+    ExpOp.BIN: _bin_value,
+    ExpOp.BIN_TYPE: lambda args, record, _: record.bins.get(args[0].decode('utf-8'), (AerospikeType.UNDEF,))[0],
+    ExpOp.SET_NAME: lambda args, record, set_name: set_name,
+    ExpOp.QUOTE: lambda args, record, set_name: args[0],
+}
+
+
+def _particle_value(particle_type: int, value: bytes) -> Any:
+    if particle_type in NUMERIC_CODECS:
+        return NUMERIC_CODECS[particle_type].unpack(value)[0]
+    if particle_type == AerospikeType.STRING:
+        return value.decode('utf-8')
+    return value
+
+
+def _eval_expression(exp: Any, record: FakeRecord, set_name: str) -> Any:
+    """Evaluates filter expression unpacked with raw=True.
+
+    Supports comparisons, boolean logic, regex, bin, bin type and set name.
+    """
+    if isinstance(exp, bytes):
+        # string and blob values are prefixed with particle type
+        return exp[1:].decode('utf-8') if exp[0] == AerospikeType.STRING else exp[1:]
+    if not isinstance(exp, list):
+        return exp
+
+    handler = EXPRESSION_HANDLERS.get(exp[0])
+    if handler is None:
+        raise ValueError(f'Unsupported expression {exp[0]}')
+    return handler(exp[1:], record, set_name)
+
+
+def _matches(filter_data: Optional[bytes], record: FakeRecord) -> bool:
+    if filter_data is None:
+        return True
+    return bool(_eval_expression(msgpack.unpackb(filter_data, raw=True), record, record.set_name))
+
+
+def _decode_bins(bins: Bins) -> Dict[str, Any]:
+    return {
+        name: AEROSPIKE_TYPE_CODE_TO_AEROSPIKE_TYPE[particle_type].unpack(value).data
+        for name, (particle_type, value) in bins.items()
+    }
+
+
+def _encode_value(value: Any) -> Tuple[int, bytes]:
+    data = PYTHON_TYPE_TO_AEROSPIKE_TYPE[type(value)](data=value)
+    return data.TYPE, data.pack_data()
+
+
+def _read_bin(bins: Bins, results: List[bytes], operation_type: int, name: str, *_) -> int:
+    if name in bins:
+        results.append(_pack_operation(operation_type, name, *bins[name]))
+    return AS_OK
+
+
+def _write_bin(bins: Bins, results, operation_type, name: str, particle_type: int, value: bytes) -> int:  # noqa: U100
+    if particle_type == AerospikeType.UNDEF:
+        bins.pop(name, None)
+    else:
+        bins[name] = (particle_type, value)
+    return AS_OK
+
+
+def _incr_bin(bins: Bins, results, operation_type, name: str, particle_type: int, value: bytes) -> int:  # noqa: U100
+    codec = NUMERIC_CODECS.get(particle_type)
+    if codec is None:
+        return AS_ERR_INCOMPATIBLE_TYPE
+    current_type, current = bins.get(name, (particle_type, codec.pack(0)))
+    if current_type != particle_type:
+        return AS_ERR_INCOMPATIBLE_TYPE
+    bins[name] = (particle_type, codec.pack(codec.unpack(current)[0] + codec.unpack(value)[0]))
+    return AS_OK
+
+
+def _concat_bin(
+        bins: Bins, results, operation_type: int, name: str, particle_type: int, value: bytes  # noqa: U100
+) -> int:
+    current_type, current = bins.get(name, (particle_type, b''))
+    if current_type != particle_type:
+        return AS_ERR_INCOMPATIBLE_TYPE
+    bins[name] = (particle_type, current + value if operation_type == OperationTypes.APPEND else value + current)
+    return AS_OK
+
+
+def _delete_record(bins: Bins, *_) -> int:
+    bins.clear()
+    return AS_OK
+
+
+def _touch_record(*_) -> int:
+    return AS_OK
+
+
+def _list_range(value: list, index: int, count: int = None) -> list:
+    value = value[index:] if index >= -len(value) else value
+    return value if count is None else value[:count]
+
+
+def _list_append(value: Optional[list], item: Any) -> Tuple[int, list]:
+    value = (value or []) + [item]
+    return len(value), value
+
+
+# op: function(current value, *args) -> result
+CDT_READ_HANDLERS = {
+    ListOp.SIZE: len,
+    ListOp.GET: operator.getitem,
+    ListOp.GET_RANGE: _list_range,
+    MapOp.SIZE: len,
+    MapOp.GET_BY_KEY: lambda value, return_type, key: value.get(key),  # noqa: U100
+}
+
+# op: function(current value or None, *args) -> (result, new value)
+CDT_MODIFY_HANDLERS = {
+    ListOp.APPEND: _list_append,
+}
+
+
+def _cdt_bin(
+        bins: Bins, results, operation_type: int, name: str, particle_type: int, value: bytes  # noqa: U100
+) -> int:
+    op, *args = unpack_msgpack(value)
+    current = _decode_bins({name: bins[name]})[name] if name in bins else None
+    container_type = list if op < MapOp.SIZE else dict
+    if current is not None and not isinstance(current, container_type):
+        return AS_ERR_INCOMPATIBLE_TYPE
+
+    try:
+        if op in CDT_MODIFY_HANDLERS and operation_type == OperationTypes.CDT_MODIFY:
+            result, current = CDT_MODIFY_HANDLERS[op](current, *args)
+            bins[name] = _encode_value(current)
+        elif op in CDT_READ_HANDLERS:
+            result = None if current is None else CDT_READ_HANDLERS[op](current, *args)
+        elif op in CDT_MODIFY_HANDLERS:
+            return AS_ERR_PARAMETER
+        else:
+            return AS_ERR_UNSUPPORTED_FEATURE
+    except (IndexError, TypeError):
+        return AS_ERR_OP_NOT_APPLICABLE
+    results.append(_pack_operation(operation_type, name, *_encode_value(result)))
+    return AS_OK
+
+
+def _apply_operations(bins: Bins, request: 'FakeRequest', handlers: Dict[int, Callable]) -> Tuple[int, List[bytes]]:
+    """Applies operations of request to bins.
+
+    With RESPOND_ALL_OPS operations without result (writes, missing bins) respond with nil.
+
+    :return: status code, results
+    """
+    respond_all = request.base.info2 & Info2Flags.RESPOND_ALL_OPS
+    results = []
+    for operation_type, name, particle_type, value in request.operations:
+        apply = handlers.get(operation_type)
+        if apply is None:
+            return AS_ERR_UNSUPPORTED_FEATURE, []
+        size = len(results)
+        status = apply(bins, results, operation_type, name, particle_type, value)
+        if status != AS_OK:
+            return status, []
+        if respond_all and len(results) == size:
+            results.append(_pack_operation(operation_type, name, AerospikeType.UNDEF, b''))
+    return AS_OK, results
+
+
+READ_HANDLERS = {
+    OperationTypes.READ: _read_bin,
+    OperationTypes.CDT_READ: _cdt_bin,
+}
+
+OPERATION_HANDLERS = {
+    **READ_HANDLERS,
+    OperationTypes.CDT_MODIFY: _cdt_bin,
+    OperationTypes.WRITE: _write_bin,
+    OperationTypes.INCR: _incr_bin,
+    OperationTypes.APPEND: _concat_bin,
+    OperationTypes.PREPEND: _concat_bin,
+    OperationTypes.DELETE: _delete_record,
+    OperationTypes.TOUCH: _touch_record,
+}
+
+
+class FakeServer:
+    """In-memory stand-in for Aerospike server.
+
+    Speaks Aerospike wire protocol over TCP and keeps records in dict.
+    Supports put, get, select, delete, operate (simple bin operations),
+    filter expressions (subset), UDF apply and background UDF with
+    Python functions registered by register_udf, secondary indexes and
+    queries, info requests and login/authenticate of security protocol.
+
+    :param str host: host to listen on.
+    :param int port: port to listen on, 0 to pick free port.
+    :param float latency: seconds to wait before every response.
+    :param int chunk_size: if set, responses are written in chunks of this size,
+        so client gets partial reads.
+    :param dict info: info command responses, {command: value}.
+    :param dict users: {user: credential}, enables security: message requests
+        are rejected until connection logs in. None to disable security.
+    :param int query_batch_size: records per message of query response.
+    """
+
+    def __init__(
+            self,
+            host: str = '127.0.0.1',
+            port: int = 0,
+            latency: float = 0.0,
+            chunk_size: int = None,
+            info: Dict[str, str] = None,
+            users: Dict[str, bytes] = None,
+            query_batch_size: int = 10,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.chunk_size = chunk_size
+        self.info = {'build': 'fake', 'namespaces': 'test', 'statistics': 'client_connections=0'}
+        self.info.update(info or {})
+        self.users = users
+        self.sessions: Dict[bytes, str] = {}
+        self.query_batch_size = query_batch_size
+        # partitions answered as unavailable by queries, like migrating ones
+        self.unavailable_partitions: Set[int] = set()
+
+        self.udfs: Dict[Tuple[str, str], UdfFunction] = {}
+        self.udf_files: Dict[str, bytes] = {}
+        self.jobs: Dict[int, Dict[str, str]] = {}
+        # (namespace, index name) -> sindex-list values
+        self.indexes: Dict[Tuple[str, str], Dict[str, str]] = {}
+        self._info_handlers = {
+            'sindex-create': self._sindex_create,
+            'sindex-delete': self._sindex_delete,
+            'sindex-list': self._sindex_list,
+            'udf-put': self._udf_put,
+            'udf-remove': self._udf_remove,
+            'udf-list': self._udf_list,
+            'query-show': self._query_show,
+        }
+
+        self.records: Dict[Tuple[bytes, bytes], FakeRecord] = {}
+        self.requests = 0
+        self._errors: Deque[int] = deque()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections = set()
+        self._handlers: Set[asyncio.Task] = set()
+
+    def inject_error(self, status_code: int, count: int = 1):
+        """Answers next count message requests with status_code."""
+        self._errors.extend([status_code] * count)
+
+    def register_udf(self, module: str, function: str, udf: UdfFunction):
+        """Registers Python function called instead of UDF module.function."""
+        self.udfs[(module, function)] = udf
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stops listening and cancels handlers of open connections."""
+        self._server.close()
+        handlers = list(self._handlers)
+        for handler in handlers:
+            handler.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        self._connections.add(writer)
+        is_authenticated = self.users is None
+        try:
+            while True:
+                header = Headers.unpack(await reader.readexactly(Headers.SIZE))
+                data = await reader.readexactly(header.request_length)
+                self.requests += 1
+
+                if header.request_type == RequestType.INFO:
+                    response = self._info(data)
+                elif header.request_type == RequestType.ADMIN:
+                    status_code, response = self._admin(data)
+                    is_authenticated = is_authenticated or status_code == AS_OK
+                elif not is_authenticated:
+                    response = _pack_message(AS_SEC_ERR_NOT_AUTHENTICATED)
+                else:
+                    response = self._message(FakeRequest(data))
+
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                await self._write(writer, response)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._handlers.discard(handler)
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _write(self, writer: asyncio.StreamWriter, response: bytes):
+        if not self.chunk_size:
+            writer.write(response)
+            await writer.drain()
+            return
+
+        for start in range(0, len(response), self.chunk_size):
+            writer.write(response[start:start + self.chunk_size])
+            await writer.drain()
+            await asyncio.sleep(0)
+
+    def _info(self, data: bytes) -> bytes:
+        commands = [c for c in data.decode('utf-8').split('\n') if c]
+        payload = ''.join(f'{c}\t{self._info_value(c)}\n' for c in commands).encode('utf-8')
+        return Headers(request_type=RequestType.INFO, request_length=len(payload)).pack() + payload
+
+    def _info_value(self, command: str) -> str:
+        name, _, params = command.partition(':')
+        handler = self._info_handlers.get(name)
+        if handler is None:
+            return self.info.get(command, '')
+        return handler(dict(p.partition('=')[::2] for p in params.split(';') if p))
+
+    def _udf_put(self, params: Dict[str, str]) -> str:
+        self.udf_files[params['filename']] = base64.b64decode(params['content'])
+        return ''
+
+    def _udf_remove(self, params: Dict[str, str]) -> str:
+        if self.udf_files.pop(params['filename'], None) is None:
+            return 'error=invalid_filename'
+        return 'ok'
+
+    def _udf_list(self, params) -> str:  # noqa: U100
+        return ''.join(
+            f'filename={name},hash={hashlib.sha1(content).hexdigest()},type=LUA;'
+            for name, content in self.udf_files.items()
+        )
+
+    def _query_show(self, params: Dict[str, str]) -> str:
+        job = self.jobs.get(int(params.get('trid', 0)))
+        if job is None:
+            return 'ERROR::job not found'
+        return ':'.join(f'{name}={value}' for name, value in job.items())
+
+    def _sindex_create(self, params: Dict[str, str]) -> str:
+        index_key = (params['namespace'], params['indexname'])
+        if index_key in self.indexes:
+            return f'FAIL:{AS_ERR_SINDEX_FOUND}:Index with the same name already exists'
+        if params.get('type', '').lower() not in INDEX_TYPES:
+            return f'FAIL:{AS_ERR_PARAMETER}:Invalid type'
+        self.indexes[index_key] = {
+            'ns': params['namespace'], 'set': params.get('set', 'NULL'), 'indexname': params['indexname'],
+            'bin': params['bin'], 'type': params['type'].upper(), 'state': 'RW',
+        }
+        return 'OK'
+
+    def _sindex_delete(self, params: Dict[str, str]) -> str:
+        if self.indexes.pop((params['namespace'], params['indexname']), None) is None:
+            return f'FAIL:{AS_ERR_SINDEX_NOT_FOUND}:Index does not exist'
+        return 'OK'
+
+    def _sindex_list(self, params: Dict[str, str]) -> str:
+        return ''.join(
+            ':'.join(f'{name}={value}' for name, value in index.items()) + ';'
+            for (namespace, _), index in self.indexes.items()
+            if namespace == params.get('namespace', namespace)
+        )
+
+    def _admin(self, data: bytes) -> Tuple[int, bytes]:
+        if self.users is None:
+            return AS_SEC_ERR_NOT_ENABLED, _pack_admin(AS_SEC_ERR_NOT_ENABLED)
+
+        command = data[2]
+        _, fields = parse_admin_response(data)
+        user = fields.get(AdminField.USER, b'').decode('utf-8')
+        fields_out = {}
+
+        if command == AdminCommand.LOGIN:
+            if user not in self.users:
+                status_code = AS_SEC_ERR_USER
+            elif fields.get(AdminField.CREDENTIAL) != self.users[user]:
+                status_code = AS_SEC_ERR_CREDENTIAL
+            else:
+                status_code = AS_OK
+                token = os.urandom(16)
+                self.sessions[token] = user
+                fields_out[AdminField.SESSION_TOKEN] = token
+        elif command == AdminCommand.AUTHENTICATE:
+            token = fields.get(AdminField.SESSION_TOKEN)
+            status_code = AS_OK if self.sessions.get(token) == user else AS_SEC_ERR_EXPIRED_SESSION
+        else:
+            status_code = AS_SEC_ERR_COMMAND
+        return status_code, _pack_admin(status_code, fields_out)
+
+    def _message(self, request: FakeRequest) -> bytes:
+        if self._errors:
+            return _pack_message(self._errors.popleft())
+
+        udf_op = request.fields.get(FieldTypes.UDF_OP)
+        if udf_op == bytes([UdfOpTypes.BACKGROUND]):
+            return self._background_udf(request)
+
+        if FieldTypes.PID_ARRAY in request.fields:
+            return self._query(request)
+
+        status_code = self._filter(request)
+        if status_code != AS_OK:
+            return _pack_message(status_code)
+
+        if udf_op is not None:
+            return self._apply_udf(request)
+
+        info1, info2 = request.base.info1, request.base.info2
+        if info2 & Info2Flags.DELETE:
+            return self._delete(request)
+        if info2 & Info2Flags.WRITE:
+            return self._operate(request)
+        if info1 & Info1Flags.READ:
+            return self._read(request)
+        return _pack_message(AS_ERR_PARAMETER)
+
+    def _filter(self, request: FakeRequest) -> int:
+        record = self.records.get(request.record_key)
+        if record is None:
+            return AS_OK
+        try:
+            return AS_OK if _matches(request.fields.get(FieldTypes.FILTER_EXP), record) else AS_ERR_FILTERED_OUT
+        except (ValueError, TypeError, IndexError):
+            return AS_ERR_PARAMETER
+
+    def _read(self, request: FakeRequest) -> bytes:
+        record = self.records.get(request.record_key)
+        if record is None:
+            return _pack_message(AS_ERR_NOT_FOUND)
+
+        info1 = request.base.info1
+        if info1 & Info1Flags.DONT_GET_BIN_DATA:
+            operations = []
+        elif info1 & Info1Flags.GET_ALL:
+            operations = [_pack_operation(OperationTypes.READ, n, *record.bins[n]) for n in record.bins]
+        else:
+            status_code, operations = _apply_operations(dict(record.bins), request, READ_HANDLERS)
+            if status_code != AS_OK:
+                return _pack_message(status_code)
+        return _pack_message(AS_OK, record.generation, operations)
+
+    def _delete(self, request: FakeRequest) -> bytes:
+        if self.records.pop(request.record_key, None) is None:
+            return _pack_message(AS_ERR_NOT_FOUND)
+        return _pack_message(AS_OK)
+
+    def _operate(self, request: FakeRequest) -> bytes:
+        existing = self.records.get(request.record_key)
+        base = request.base
+
+        if base.info2 & Info2Flags.CREATE_ONLY and existing is not None:
+            return _pack_message(AS_ERR_RECORD_EXISTS)
+        if base.info3 & Info3Flags.UPDATE_ONLY and existing is None:
+            return _pack_message(AS_ERR_NOT_FOUND)
+        if base.info2 & Info2Flags.GENERATION and (existing.generation if existing else 0) != base.generation:
+            return _pack_message(AS_ERR_GENERATION)
+
+        record = FakeRecord(request.set_name)
+        if existing is not None:
+            record.bins = dict(existing.bins)
+            record.generation = existing.generation
+
+        status_code, results = _apply_operations(record.bins, request, OPERATION_HANDLERS)
+        if status_code != AS_OK:
+            return _pack_message(status_code)
+
+        record.generation += 1
+        if record.bins:
+            self.records[request.record_key] = record
+        else:
+            self.records.pop(request.record_key, None)
+        return _pack_message(AS_OK, record.generation, results)
+
+    def _udf(self, request: FakeRequest) -> Tuple[UdfFunction, List[Any]]:
+        module = request.fields[FieldTypes.UDF_PACKAGE_NAME].decode('utf-8')
+        function = request.fields[FieldTypes.UDF_FUNCTION].decode('utf-8')
+        udf = self.udfs.get((module, function))
+        if udf is None:
+            raise KeyError(f'function not found: {module}.{function}')
+        return udf, unpack_msgpack(request.fields.get(FieldTypes.UDF_ARGLIST, b'\x90'))
+
+    def _run_udf(self, udf: UdfFunction, args: List[Any], record_key, record: FakeRecord) -> Any:
+        bins = _decode_bins(record.bins)
+        result = udf(bins, *args)
+        encoded = {name: _encode_value(value) for name, value in bins.items() if value is not None}
+        if encoded != record.bins:
+            record.bins = encoded
+            record.generation += 1
+            if encoded:
+                self.records[record_key] = record
+            else:
+                self.records.pop(record_key, None)
+        return result
+
+    def _apply_udf(self, request: FakeRequest) -> bytes:
+        record = self.records.get(request.record_key) or FakeRecord(request.set_name)
+        try:
+            udf, args = self._udf(request)
+            result = self._run_udf(udf, args, request.record_key, record)
+        except Exception as e:  # noqa: B902 errors of any kind are returned as UDF failure
+            failure = _pack_operation(OperationTypes.READ, 'FAILURE', AerospikeType.STRING, str(e).encode('utf-8'))
+            return _pack_message(AS_ERR_UDF_EXECUTION, record.generation, [failure])
+        success = _pack_operation(OperationTypes.READ, 'SUCCESS', *_encode_value(result))
+        return _pack_message(AS_OK, record.generation, [success])
+
+    def _background_udf(self, request: FakeRequest) -> bytes:
+        try:
+            udf, args = self._udf(request)
+        except KeyError:
+            return _pack_message(AS_ERR_UDF_EXECUTION)
+
+        task_id = int.from_bytes(request.fields.get(FieldTypes.TRAN_ID, b''), 'big')
+        namespace, set_name = request.fields[FieldTypes.NAMESPACE], request.set_name
+        filter_data = request.fields.get(FieldTypes.FILTER_EXP)
+        succeeded = failed = 0
+        for record_key, record in list(self.records.items()):
+            if record_key[0] != namespace or (set_name and record.set_name != set_name):
+                continue
+            try:
+                if _matches(filter_data, record):
+                    self._run_udf(udf, args, record_key, record)
+                    succeeded += 1
+            except Exception:  # noqa: B902 UDF errors only fail one record
+                failed += 1
+
+        self.jobs[task_id] = {
+            'trid': str(task_id), 'job-type': 'background-udf', 'status': 'done(ok)',
+            'recs-succeeded': str(succeeded), 'recs-failed': str(failed),
+        }
+        return _pack_message(AS_OK)
+
+    def _index_matcher(self, request: FakeRequest) -> Optional[Callable[[FakeRecord], bool]]:
+        """Matcher of index range field, None if there is no index on predicate bin."""
+        data = request.fields.get(FieldTypes.INDEX_RANGE)
+        if data is None:
+            return lambda record: True
+
+        name, particle_type, begin, end = _unpack_predicate(data)
+        namespace = request.fields[FieldTypes.NAMESPACE].decode('utf-8')
+        is_indexed = any(
+            index['ns'] == namespace and index['bin'] == name and INDEX_TYPES[index['type'].lower()] == particle_type
+            for index in self.indexes.values()
+        )
+        if not is_indexed:
+            return None
+
+        begin, end = _particle_value(particle_type, begin), _particle_value(particle_type, end)
+
+        def matches(record: FakeRecord) -> bool:
+            if name not in record.bins or record.bins[name][0] != particle_type:
+                return False
+            return begin <= _particle_value(*record.bins[name]) <= end
+        return matches
+
+    def _query(self, request: FakeRequest) -> bytes:
+        index_matches = self._index_matcher(request)
+        if index_matches is None:
+            return _pack_message(AS_ERR_SINDEX_NOT_FOUND)
+
+        data = request.fields[FieldTypes.PID_ARRAY]
+        partitions = {int.from_bytes(data[i:i + 2], 'little') for i in range(0, len(data), 2)}
+        namespace, set_name = request.fields[FieldTypes.NAMESPACE], request.set_name
+        filter_data = request.fields.get(FieldTypes.FILTER_EXP)
+        get_all = request.base.info1 & Info1Flags.GET_ALL
+        names = [name for _, name, _, _ in request.operations]
+
+        records = []
+        done = set()
+        for (record_namespace, digest), record in list(self.records.items()):
+            partition = partition_id(digest)
+            if record_namespace != namespace or partition not in partitions:
+                continue
+            if set_name and record.set_name != set_name:
+                continue
+            done.add(partition)
+            if partition in self.unavailable_partitions:
+                continue
+            try:
+                if not index_matches(record) or not _matches(filter_data, record):
+                    continue
+            except (ValueError, TypeError, IndexError):
+                return _pack_message(AS_ERR_PARAMETER)
+            bin_names = list(record.bins) if get_all else [n for n in names if n in record.bins]
+            operations = [_pack_operation(OperationTypes.READ, n, *record.bins[n]) for n in bin_names]
+            records.append(_pack_record(digest, record.generation, operations))
+
+        # partition done markers carry partition id in generation
+        records.extend(
+            Base(info1=0, info2=0, info3=Info3Flags.PARTITION_DONE, fields_num=0, bins_num=0,
+                 status_code=AS_ERR_UNAVAILABLE if partition in self.unavailable_partitions else AS_OK,
+                 generation=partition, transaction_ttl=0).pack()
+            for partition in sorted(done | (self.unavailable_partitions & partitions))
+        )
+        batches = [
+            _pack_messages(*records[i:i + self.query_batch_size])
+            for i in range(0, len(records), self.query_batch_size)
+        ]
+        return b''.join(batches) + _pack_message(AS_OK)
+
+
+class FakeServerThread:
+    """Runs FakeServer on its own event loop in background thread.
+
+    Lets synchronous code and other event loops talk to fake server.
+
+    :param server: server to run, new FakeServer by default.
+    """
+
+    def __init__(self, server: FakeServer = None):
+        self.server = server or FakeServer()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='fake-aerospike', daemon=True)
+
+    def start(self) -> FakeServer:
+        self._loop.run_until_complete(self.server.start())
+        self._thread.start()
+        return self.server
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> FakeServer:
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -4,7 +4,7 @@ from typing import Any
 from enum import IntEnum
 
 
-from asyncaerospike.datatypes import PYTHON_TYPE_TO_AEROSPIKE_TYPE
+from asyncaerospike.datatypes import PYTHON_TYPE_TO_AEROSPIKE_TYPE, pack_msgpack
 
 
 class FieldTypes(IntEnum):
@@ -12,6 +12,19 @@ class FieldTypes(IntEnum):
     SET = 1
     KEY = 2
     DIGEST = 4
+    TRAN_ID = 7
+    PID_ARRAY = 11
+    INDEX_RANGE = 22
+    UDF_PACKAGE_NAME = 30
+    UDF_FUNCTION = 31
+    UDF_ARGLIST = 32
+    UDF_OP = 33
+    FILTER_EXP = 43
+
+
+class UdfOpTypes(IntEnum):
+    RECORD = 1
+    BACKGROUND = 2
 
 
 class Field(ABC):
@@ -77,6 +90,93 @@ class Key(Field):
     def __init__(self, data: Any, set_name: str = None):
         super().__init__(data=data)
         self.data = PYTHON_TYPE_TO_AEROSPIKE_TYPE[type(data)](data=data, set_name=set_name)
+        self._digest = None
+
+    @property
+    def digest(self) -> bytes:
+        """RIPEMD-160 digest of set name and key, computed once."""
+        if self._digest is None:
+            self._digest = self.data.encode()
+        return self._digest
+
+    def pack_data(self):
+        return self.digest
+
+
+class FilterExpression(Field):
+    """Implements filter expression field.
+
+    :param data: asyncaerospike.expressions.Expression.
+    """
+    ENCODER = Struct('!IB')
+    FIELD_TYPE = FieldTypes.FILTER_EXP
+
+    def pack_data(self):
+        return self.data.pack()
+
+
+class UdfModule(Namespace):
+    """Implements UDF module (package) name."""
+
+    FIELD_TYPE = FieldTypes.UDF_PACKAGE_NAME
+
+
+class UdfFunction(Namespace):
+    """Implements UDF function name."""
+
+    FIELD_TYPE = FieldTypes.UDF_FUNCTION
+
+
+class UdfArgs(Field):
+    """Implements UDF arguments, packed to msgpack list."""
+    ENCODER = Struct('!IB')
+    FIELD_TYPE = FieldTypes.UDF_ARGLIST
+
+    def pack_data(self):
+        return pack_msgpack(list(self.data))
+
+
+class UdfOp(Field):
+    """Implements UDF execution mode, see UdfOpTypes."""
+    ENCODER = Struct('!IB')
+    FIELD_TYPE = FieldTypes.UDF_OP
+    DATA_ENCODER = Struct('!B')
+
+    def pack_data(self):
+        return self.DATA_ENCODER.pack(self.data)
+
+
+class TaskId(Field):
+    """Implements id of background scan or query."""
+    ENCODER = Struct('!IB')
+    FIELD_TYPE = FieldTypes.TRAN_ID
+    DATA_ENCODER = Struct('!Q')
+
+    def pack_data(self):
+        return self.DATA_ENCODER.pack(self.data)
+
+
+class IndexRange(Field):
+    """Implements secondary index filter of query.
+
+    :param data: asyncaerospike.query.Predicate.
+    """
+    ENCODER = Struct('!IB')
+    FIELD_TYPE = FieldTypes.INDEX_RANGE
+    COUNT_ENCODER = Struct('!B')
+
+    def pack_data(self):
+        return self.COUNT_ENCODER.pack(1) + self.data.pack()
+
+
+class PartitionIds(Field):
+    """Implements partitions to scan or query.
+
+    :param data: partition ids.
+    """
+    ENCODER = Struct('!IB')
+    FIELD_TYPE = FieldTypes.PID_ARRAY
+    ID_ENCODER = Struct('<H')
 
     def pack_data(self):
-        return self.data.encode()
+        return b''.join(self.ID_ENCODER.pack(partition) for partition in self.data)
@@ -1,7 +1,9 @@
 from enum import IntEnum
 from dataclasses import dataclass
 
-from construct import BytesInteger, Const, Int8ub, Struct, Container
+from construct import BytesInteger, Const, Int8ub, Struct
+
+from asyncaerospike.codec import HEADER_SIZE, pack_header, unpack_header
 
 
 class RequestType(IntEnum):
@@ -20,19 +22,17 @@ class Headers:
         'request_type' / Int8ub,
         'request_length' / BytesInteger(6),
     )
+    SIZE = HEADER_SIZE
+
     request_type: RequestType
     request_length: int
 
     def pack(self):
         """Packs Headers to bytes for request."""
-        return self.ENCODER.build(
-            Container(request_type=self.request_type, request_length=self.request_length)
-        )
+        return pack_header(self.request_type, self.request_length)
 
     @classmethod
     def unpack(cls, data: bytes):
         """Unpacks Headers from bytes from response"""
-        parsed_data = cls.ENCODER.parse(data)
-        return cls(
-            request_type=parsed_data.request_type, request_length=parsed_data.request_length
-        )
+        request_type, request_length = unpack_header(data)
+        return cls(request_type=request_type, request_length=request_length)
@@ -0,0 +1,134 @@
+import asyncio
+import base64
+import binascii
+from typing import Dict, Iterable, List, Tuple
+
+from asyncaerospike.errors import InfoError
+from asyncaerospike.header import Headers, RequestType
+
+AS_ERR_UNKNOWN = 1
+
+
+def info_request(commands: Iterable[str]) -> bytes:
+    """Packs info commands to bytes for request.
+
+    :param commands: info commands, e.g. 'statistics', 'namespace/test'.
+    :return: encoded info request
+    """
+    payload = ''.join(f'{c}\n' for c in commands).encode('utf-8')
+    return Headers(request_type=RequestType.INFO, request_length=len(payload)).pack() + payload
+
+
+def parse_info(data: bytes) -> Dict[str, str]:
+    """Parses info response body.
+
+    :return: {command: value}
+    """
+    result = {}
+    for line in data.decode('utf-8').split('\n'):
+        if not line:
+            continue
+        command, _, value = line.partition('\t')
+        result[command] = value
+    return result
+
+
+def parse_info_values(value: str) -> Dict[str, str]:
+    """Parses 'name1=value1;name2=value2' info value.
+
+    :return: {name: value}
+    """
+    result = {}
+    for item in value.split(';'):
+        name, sep, item_value = item.partition('=')
+        if sep:
+            result[name] = item_value
+    return result
+
+
+def parse_info_list(value: str, separator: str = ',') -> List[Dict[str, str]]:
+    """Parses 'name1=value1,name2=value2;name1=value3,...' info value.
+
+    :param str separator: separator of values within entry, ':' for sindex-list.
+    :return: [{name: value}]
+    """
+    return [
+        dict(item.partition('=')[::2] for item in entry.split(separator))
+        for entry in value.split(';') if entry
+    ]
+
+
+def check_info_value(value: str) -> str:
+    """Raises InfoError if info value is an error: 'FAIL:code:message',
+    'ERROR:code:message' or 'error=...;message=<base64>' of udf-put.
+
+    :return: value
+    """
+    if value.startswith(('FAIL', 'ERROR')):
+        _, _, rest = value.partition(':')
+        code, _, message = rest.partition(':')
+        status_code = int(code) if code.isdigit() else AS_ERR_UNKNOWN
+        raise InfoError(status_code=status_code, message=message or value)
+
+    if value.startswith('error='):
+        values = parse_info_values(value)
+        message = values['error']
+        if values.get('message'):
+            try:
+                message += ': ' + base64.b64decode(values['message']).decode('utf-8')
+            except (binascii.Error, UnicodeDecodeError):
+                message += ': ' + values['message']
+        raise InfoError(status_code=AS_ERR_UNKNOWN, message=message)
+    return value
+
+
+class InfoPoller:
+    """Periodically requests info commands and stores parsed values.
+
+    Values are stored to client.server_stats as {command: {name: value}}.
+
+    :param client: connected Client.
+    :param commands: info commands returning 'name=value;...' values.
+    :param float interval: seconds between requests.
+    """
+
+    def __init__(self, client, commands: Tuple[str, ...] = ('statistics',), interval: float = 1.0):
+        self.client = client
+        self.commands = tuple(commands)
+        self.interval = interval
+        self.last_error = None
+
+        self._task = None
+
+    @property
+    def is_running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if not self.is_running:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def poll(self):
+        """Requests info commands once and updates client.server_stats."""
+        result = await self.client.info(*self.commands)
+        for command, value in result.items():
+            self.client.server_stats[command] = parse_info_values(value)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.poll()
+                self.last_error = None
+            except Exception as e:  # noqa: B902 poller must survive any failed poll
+                self.last_error = e
+            await asyncio.sleep(self.interval)
@@ -28,6 +28,7 @@ class Info3Flags(IntFlag):
     LAST = 1
     COMMIT_MASTER = 2
     PARTITION_DON = 4
+    PARTITION_DONE = 4
     UPDATE_ONLY = 8
     CREATE_OR_REPLACE = 16
     REPLACE_ONLY = 32
@@ -0,0 +1,68 @@
+from enum import IntEnum
+from typing import Any
+
+import msgpack
+
+from asyncaerospike.bin import Bin, OperationTypes
+from asyncaerospike.datatypes import AerospikeBlob, pack_msgpack
+
+_PACKER = msgpack.Packer()
+
+
+class ListOp(IntEnum):
+    APPEND = 1
+    SIZE = 16
+    GET = 17
+    GET_RANGE = 18
+
+
+class MapOp(IntEnum):
+    SIZE = 96
+    GET_BY_KEY = 97
+
+
+class MapReturnType(IntEnum):
+    VALUE = 7
+
+
+def _cdt(operation_type: OperationTypes, bin_name: str, op: int, *args: Any) -> Bin:
+    """Collection operation: msgpack [op, *args] sent as blob particle."""
+    payload = _PACKER.pack_array_header(len(args) + 1) + msgpack.packb(int(op))
+    payload += b''.join(pack_msgpack(arg) for arg in args)
+    return Bin(key=bin_name, operation_type=operation_type, data=AerospikeBlob(data=payload))
+
+
+def read(bin_name: str) -> Bin:
+    return Bin(key=bin_name, operation_type=OperationTypes.READ)
+
+
+def list_size(bin_name: str) -> Bin:
+    return _cdt(OperationTypes.CDT_READ, bin_name, ListOp.SIZE)
+
+
+def list_get(bin_name: str, index: int) -> Bin:
+    """Element at index, negative index counts from the end."""
+    return _cdt(OperationTypes.CDT_READ, bin_name, ListOp.GET, index)
+
+
+def list_get_range(bin_name: str, index: int, count: int = None) -> Bin:
+    """count elements from index, all elements to the end if count is None.
+
+    list_get_range('events', -10) reads last 10 elements.
+    """
+    if count is None:
+        return _cdt(OperationTypes.CDT_READ, bin_name, ListOp.GET_RANGE, index)
+    return _cdt(OperationTypes.CDT_READ, bin_name, ListOp.GET_RANGE, index, count)
+
+
+def list_append(bin_name: str, value: Any) -> Bin:
+    """Appends value to list bin, result is new list size."""
+    return _cdt(OperationTypes.CDT_MODIFY, bin_name, ListOp.APPEND, value)
+
+
+def map_size(bin_name: str) -> Bin:
+    return _cdt(OperationTypes.CDT_READ, bin_name, MapOp.SIZE)
+
+
+def map_get_by_key(bin_name: str, key: Any) -> Bin:
+    return _cdt(OperationTypes.CDT_READ, bin_name, MapOp.GET_BY_KEY, MapReturnType.VALUE, key)
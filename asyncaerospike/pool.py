@@ -0,0 +1,387 @@
+import asyncio
+from dataclasses import dataclass
+from functools import partial
+import logging
+import socket
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar, Union
+
+from asyncaerospike.admin import Authenticator
+from asyncaerospike.errors import AerospikeError
+from asyncaerospike.header import Headers
+from asyncaerospike.info import info_request
+from asyncaerospike.protocol import AerospikeProtocol
+
+logger = logging.getLogger(__name__)
+
+# cheap info command sent to idle connections
+PROBE_COMMAND = 'build'
+
+T = TypeVar('T')
+# reads response message of given length from stream
+MessageReader = Callable[[asyncio.StreamReader, int], Awaitable[T]]
+
+KEEPALIVE_OPTIONS = (
+    ('TCP_KEEPIDLE', 'keepalive_idle'),
+    ('TCP_KEEPINTVL', 'keepalive_interval'),
+    ('TCP_KEEPCNT', 'keepalive_count'),
+)
+
+
+@dataclass
+class ConnectionPolicy:
+    """Socket options and pool settings of Client connections.
+
+    pool_size: number of connections opened and authenticated on connect,
+        requests go to connection with fewest requests in flight.
+    tcp_nodelay: disables Nagle algorithm, so small requests are sent at once.
+    keepalive: enables TCP keep-alive; keepalive_idle, keepalive_interval (seconds)
+        and keepalive_count tune it where platform supports them, None keeps system default.
+    send_buffer_size, recv_buffer_size: SO_SNDBUF and SO_RCVBUF, None keeps system default.
+    idle_probe_interval: seconds without requests after which connection is probed
+        with info request, broken connections are reopened. None disables probes.
+    authenticator: handshake run on every new connection, e.g. LoginAuthenticator.
+    large_record_size: requests are written as separate buffers with writelines,
+        without copying bin values into one message, and responses larger than this
+        many bytes are decoded bin by bin as they arrive ('stream' transport only),
+        so large records are not held in memory twice. None disables both.
+    """
+
+    pool_size: int = 1
+    tcp_nodelay: bool = True
+    keepalive: bool = True
+    keepalive_idle: Optional[int] = None
+    keepalive_interval: Optional[int] = None
+    keepalive_count: Optional[int] = None
+    send_buffer_size: Optional[int] = None
+    recv_buffer_size: Optional[int] = None
+    idle_probe_interval: Optional[float] = None
+    authenticator: Optional[Authenticator] = None
+    large_record_size: Optional[int] = None
+
+    def __post_init__(self):
+        if self.pool_size < 1:
+            raise ValueError(f'pool_size must be positive, got {self.pool_size}')
+        if self.large_record_size is not None and self.large_record_size < 0:
+            raise ValueError(f'large_record_size must not be negative, got {self.large_record_size}')
+
+
+def apply_socket_policy(sock, policy: ConnectionPolicy):
+    """Sets socket options of policy to connected socket."""
+    if sock is None:
+        return
+    if policy.tcp_nodelay:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    if policy.keepalive:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for option, attribute in KEEPALIVE_OPTIONS:
+            value = getattr(policy, attribute)
+            if value is not None and hasattr(socket, option):
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+    if policy.send_buffer_size is not None:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, policy.send_buffer_size)
+    if policy.recv_buffer_size is not None:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, policy.recv_buffer_size)
+
+
+class StreamConnection:
+    """Connection over StreamReader/StreamWriter, one request at a time.
+
+    Request and response are paired under lock, so concurrent coroutines
+    do not read each other's responses. Response of cancelled request
+    is skipped by the next request. Connection is closed on other errors,
+    as stream position is unknown after them.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._lock = asyncio.Lock()
+        # responses of cancelled requests not read yet, and unread bytes of cancelled response body
+        self._discard = 0
+        self._skip = 0
+        self.pending = 0
+        self.last_used = time.monotonic()
+
+    @property
+    def is_connected(self) -> bool:
+        return not self._writer.is_closing() and not self._reader.at_eof()
+
+    async def request(self, data: Union[bytes, List[bytes]], read: MessageReader = None):
+        """Writes request and reads response message (without header).
+
+        :param data: packed request or buffers written with writelines.
+        :param read: coroutine function reading message of given length from stream,
+            whole message is read to bytes by default.
+        :return: message bytes or result of read
+        """
+        self.pending += 1
+        try:
+            async with self._lock:
+                if self._writer.is_closing():
+                    raise ConnectionError('Connection is closed')
+                self.last_used = time.monotonic()
+                try:
+                    await self._skip_discarded()
+                    if isinstance(data, list):
+                        self._writer.writelines(data)
+                    else:
+                        self._writer.write(data)
+                    self._discard += 1
+                    await self._writer.drain()
+                    header = Headers.unpack(await self._reader.readexactly(Headers.SIZE))
+                    self._discard -= 1
+                    if read is not None:
+                        return await self._read_custom(read, header.request_length)
+                    # readexactly consumes nothing if cancelled, so cancelled body is skipped whole
+                    self._skip = header.request_length
+                    body = await self._reader.readexactly(self._skip)
+                    self._skip = 0
+                    return body
+                except asyncio.CancelledError:
+                    raise
+                except BaseException:
+                    # stream position is unknown after other errors
+                    self._writer.close()
+                    raise
+        finally:
+            self.pending -= 1
+
+    async def _skip_discarded(self):
+        """Reads and drops responses of cancelled requests."""
+        while self._discard or self._skip:
+            if self._skip:
+                await self._reader.readexactly(self._skip)
+                self._skip = 0
+            else:
+                header = Headers.unpack(await self._reader.readexactly(Headers.SIZE))
+                self._discard -= 1
+                self._skip = header.request_length
+
+    async def _read_custom(self, read: MessageReader, length: int):
+        try:
+            return await read(self._reader, length)
+        except asyncio.CancelledError:
+            # read may have consumed part of message
+            self._writer.close()
+            raise
+
+    async def request_stream(self, data: bytes) -> AsyncIterator[bytes]:
+        """Writes request and yields response messages (without header) until caller stops.
+
+        For scan and query, which answer one request with many messages.
+        Connection should be closed if caller stops before last message.
+        """
+        async with self._lock:
+            if self._writer.is_closing():
+                raise ConnectionError('Connection is closed')
+            self.last_used = time.monotonic()
+            try:
+                await self._skip_discarded()
+                self._writer.write(data)
+                await self._writer.drain()
+                while True:
+                    header = Headers.unpack(await self._reader.readexactly(Headers.SIZE))
+                    yield await self._reader.readexactly(header.request_length)
+            except (OSError, asyncio.IncompleteReadError, asyncio.CancelledError):
+                self._writer.close()
+                raise
+
+    def close(self):
+        self._writer.close()
+
+
+class ProtocolConnection:
+    """Connection over AerospikeProtocol with pipelined requests."""
+
+    def __init__(self, protocol: AerospikeProtocol):
+        self._protocol = protocol
+        self.last_used = time.monotonic()
+
+    @property
+    def is_connected(self) -> bool:
+        return self._protocol.is_connected
+
+    @property
+    def pending(self) -> int:
+        return self._protocol.in_flight
+
+    async def request(self, data: Union[bytes, List[bytes]]) -> bytes:
+        """Writes request and waits for response message (without header)."""
+        self.last_used = time.monotonic()
+        return await self._protocol.request(data)
+
+    def close(self):
+        self._protocol.close()
+
+
+async def open_connection(host: str, port: int, transport: str, policy: ConnectionPolicy):
+    """Opens connection, applies socket options and runs authentication handshake.
+
+    :param str transport: 'stream' or 'protocol', see Client.
+    :return: StreamConnection or ProtocolConnection
+    """
+    if transport == 'protocol':
+        sock_transport, protocol = await asyncio.get_event_loop().create_connection(
+            AerospikeProtocol, host, port
+        )
+        conn = ProtocolConnection(protocol)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+        sock_transport = writer.transport
+        conn = StreamConnection(reader, writer)
+
+    try:
+        apply_socket_policy(sock_transport.get_extra_info('socket'), policy)
+        if policy.authenticator is not None:
+            await policy.authenticator.login(conn)
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+
+class ConnectionPool:
+    """Fixed number of connections to one node.
+
+    All connections are opened on start, so first requests do not pay
+    for connect and handshake. Closed connections are skipped and reopened
+    in background, requests wait for reopen only if no connection is open.
+    Idle connections are probed in background, if policy has idle_probe_interval.
+
+    :param str host: Aerospike host.
+    :param int port: Aerospike port.
+    :param str transport: 'stream' or 'protocol', see Client.
+    :param ConnectionPolicy policy: socket options and pool size.
+    """
+
+    def __init__(self, host: str, port: int, transport: str, policy: ConnectionPolicy):
+        self.host = host
+        self.port = port
+        self.transport = transport
+        self.policy = policy
+        self.reconnects = 0
+
+        self._connections: List = []
+        self._reopening: Dict[int, asyncio.Task] = {}
+        self._probe_task = None
+
+    @property
+    def connections(self) -> list:
+        return list(self._connections)
+
+    async def _open(self):
+        return await open_connection(self.host, self.port, self.transport, self.policy)
+
+    async def start(self):
+        """Opens pool_size connections concurrently."""
+        results = await asyncio.gather(
+            *[self._open() for _ in range(self.policy.pool_size)], return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            for result in results:
+                if not isinstance(result, BaseException):
+                    result.close()
+            raise errors[0]
+
+        self._connections = results
+        if self.policy.idle_probe_interval:
+            self._probe_task = asyncio.ensure_future(self._probe_idle())
+
+    async def close(self):
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+            self._probe_task = None
+        for task in list(self._reopening.values()):
+            task.cancel()
+        self._reopening.clear()
+        for conn in self._connections:
+            conn.close()
+        self._connections = []
+
+    async def acquire(self):
+        """Open connection with fewest requests in flight.
+
+        Closed connections are reopened in background; if all are closed,
+        waits for first one to reopen.
+        """
+        connections = self._connections
+        if len(connections) == 1 and connections[0].is_connected:
+            return connections[0]
+        if not connections:
+            raise ConnectionError('Connection pool is closed')
+
+        best = None
+        for index, conn in enumerate(connections):
+            if not conn.is_connected:
+                self._reopen(index)
+            elif best is None or conn.pending < best.pending:
+                best = conn
+        if best is not None:
+            return best
+        return await asyncio.shield(self._reopen(0))
+
+    async def request(self, data: Union[bytes, List[bytes]]) -> bytes:
+        return await (await self.acquire()).request(data)
+
+    def _reopen(self, index: int) -> asyncio.Task:
+        """Replaces connection at index with new one, one reopen per index at a time."""
+        task = self._reopening.get(index)
+        if task is None:
+            task = asyncio.ensure_future(self._replace(index))
+            self._reopening[index] = task
+            task.add_done_callback(partial(self._reopened, index))
+        return task
+
+    def _reopened(self, index: int, task: asyncio.Task):
+        if self._reopening.get(index) is task:
+            del self._reopening[index]
+        if not task.cancelled():
+            # retrieved here, so failed background reopen is not reported as never retrieved
+            task.exception()
+
+    async def _replace(self, index: int):
+        conn = self._connections[index]
+        conn.close()
+        new_conn = await self._open()
+        if index < len(self._connections) and self._connections[index] is conn:
+            self._connections[index] = new_conn
+            self.reconnects += 1
+            return new_conn
+        new_conn.close()
+        raise ConnectionError('Connection pool is closed')
+
+    async def probe(self):
+        """Sends info request to connections idle for idle_probe_interval,
+        reopens closed connections and connections failed to answer.
+        """
+        probe_request = info_request([PROBE_COMMAND])
+        deadline = time.monotonic() - (self.policy.idle_probe_interval or 0)
+
+        for index, conn in enumerate(list(self._connections)):
+            if conn.is_connected:
+                if conn.pending or conn.last_used > deadline:
+                    continue
+                try:
+                    await conn.request(probe_request)
+                    continue
+                except (OSError, asyncio.IncompleteReadError):
+                    pass
+
+            try:
+                await asyncio.shield(self._reopen(index))
+            except (OSError, AerospikeError):
+                continue
+
+    async def _probe_idle(self):
+        while True:
+            await asyncio.sleep(self.policy.idle_probe_interval / 2)
+            try:
+                await self.probe()
+            except Exception:  # noqa: B902 probes must go on after any failed probe
+                logger.exception('Probe of idle connections failed')
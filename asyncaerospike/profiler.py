@@ -0,0 +1,245 @@
+from collections import deque
+from dataclasses import asdict, dataclass
+import heapq
+import itertools
+import json
+import signal
+import sys
+import time
+from typing import Any, Deque, Dict, Hashable, List, Optional, TextIO, Tuple
+
+from asyncaerospike.fields import FieldTypes
+from asyncaerospike.info_flags import Info1Flags, Info2Flags
+
+
+class SpaceSaving:
+    """Approximate top-k counter in fixed space (Metwally et al. space-saving).
+
+    Keeps at most capacity keys. New key replaces key with the smallest count
+    and inherits its count as error, so count - error <= true count <= count.
+
+    Smallest key is found with heap of (count, seq, key). Increments do not
+    touch the heap, stale entries are refreshed only when they reach its top
+    on eviction, so add is O(1) for known keys and amortized O(log capacity)
+    for new ones.
+
+    :param int capacity: number of keys kept.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError(f'capacity must be positive, got {capacity}')
+        self.capacity = capacity
+        self._counts: Dict[Hashable, int] = {}
+        self._errors: Dict[Hashable, int] = {}
+        self._heap: List[Tuple[int, int, Hashable]] = []
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self._counts)
+
+    def add(self, key: Hashable, count: int = 1):
+        counts = self._counts
+        if key in counts:
+            counts[key] += count
+            return
+        heap = self._heap
+        if len(counts) < self.capacity:
+            counts[key] = count
+            self._errors[key] = 0
+            heapq.heappush(heap, (count, next(self._seq), key))
+            return
+
+        while True:
+            smallest, _, evicted = heap[0]
+            current = counts[evicted]
+            if current == smallest:
+                break
+            heapq.heapreplace(heap, (current, next(self._seq), evicted))
+        del counts[evicted]
+        del self._errors[evicted]
+        counts[key] = smallest + count
+        self._errors[key] = smallest
+        heapq.heapreplace(heap, (smallest + count, next(self._seq), key))
+
+    def top(self, n: int = None) -> List[Tuple[Hashable, int, int]]:
+        """Keys with largest counts.
+
+        :return: [(key, count, error)] sorted by count
+        """
+        items = sorted(self._counts.items(), key=lambda item: item[1], reverse=True)
+        return [(key, count, self._errors[key]) for key, count in items[:n]]
+
+    def clear(self):
+        self._counts.clear()
+        self._errors.clear()
+        self._heap.clear()
+
+
+@dataclass
+class SlowOp:
+    """Request slower than RequestProfiler.slow_threshold.
+
+    size: request bins and response bins in bytes, approximate.
+    status_code: response status, None if request raised.
+    """
+
+    namespace: str
+    set_name: Optional[str]
+    digest: Optional[str]
+    op_type: str
+    size: int
+    latency: float
+    status_code: Optional[int]
+    timestamp: float
+
+
+def op_type(request) -> str:
+    """Short name of request kind: read, write, delete, udf or scan."""
+    info1, info2 = request.base.info1, request.base.info2
+    if request.key is None:
+        return 'scan'
+    if any(f.FIELD_TYPE == FieldTypes.UDF_OP for f in request.fields):
+        return 'udf'
+    if info2 & Info2Flags.DELETE:
+        return 'delete'
+    if info2 & Info2Flags.WRITE:
+        return 'write'
+    if info1 & Info1Flags.READ:
+        return 'read'
+    return 'other'
+
+
+class RequestProfiler:
+    """Samples client requests to find hot keys, hot sets and slow operations.
+
+    Every sample_every-th request is counted in space-saving top-k of record
+    digests and of sets. Every request slower than slow_threshold is kept in
+    ring buffer of the last slow_ops slow requests. Memory is bounded by
+    top_k and slow_ops, whatever the key space.
+
+    Read with hot_keys, hot_sets, slow_ops or snapshot at runtime,
+    or dump it on signal with install_signal_handler.
+
+    :param int top_k: number of digests and sets tracked.
+    :param int sample_every: count one of every sample_every requests, counts are not scaled.
+    :param float slow_threshold: seconds, requests taking longer are slow.
+    :param int slow_ops: number of recent slow requests kept.
+    """
+
+    def __init__(
+            self,
+            top_k: int = 64,
+            sample_every: int = 1,
+            slow_threshold: float = 0.01,
+            slow_ops: int = 128,
+    ):
+        if sample_every < 1:
+            raise ValueError(f'sample_every must be positive, got {sample_every}')
+        self.sample_every = sample_every
+        self.slow_threshold = slow_threshold
+
+        self._keys = SpaceSaving(top_k)
+        self._sets = SpaceSaving(top_k)
+        self._slow: Deque[SlowOp] = deque(maxlen=slow_ops)
+        self._countdown = sample_every
+
+        self.requests = 0
+        self.sampled = 0
+        self.slow = 0
+
+    def record(self, request, response, latency: float):
+        """Records finished request.
+
+        :param request: asyncaerospike.request.Request.
+        :param response: Response or None if request raised.
+        :param float latency: seconds request took.
+        """
+        self.requests += 1
+        self._countdown -= 1
+        if self._countdown == 0:
+            self._countdown = self.sample_every
+            self.sampled += 1
+            namespace, set_name = request.namespace.data, request.set.data if request.set else None
+            self._sets.add((namespace, set_name))
+            if request.key is not None:
+                self._keys.add((namespace, set_name, request.key.digest))
+
+        if latency >= self.slow_threshold:
+            self.slow += 1
+            self._slow.append(self._slow_op(request, response, latency))
+
+    @staticmethod
+    def _slow_op(request, response, latency: float) -> SlowOp:
+        size = sum(len(b.data) for b in request.bins)
+        if response is not None:
+            size += response.size
+        return SlowOp(
+            namespace=request.namespace.data,
+            set_name=request.set.data if request.set else None,
+            digest=request.key.digest.hex() if request.key is not None else None,
+            op_type=op_type(request),
+            size=size,
+            latency=latency,
+            status_code=response.status_code if response is not None else None,
+            timestamp=time.time(),
+        )
+
+    def hot_keys(self, n: int = None) -> List[Dict[str, Any]]:
+        """Most requested records among sampled requests.
+
+        :return: [{'namespace', 'set_name', 'digest', 'count', 'error'}], hottest first
+        """
+        return [
+            {'namespace': namespace, 'set_name': set_name, 'digest': digest.hex(), 'count': count, 'error': error}
+            for (namespace, set_name, digest), count, error in self._keys.top(n)
+        ]
+
+    def hot_sets(self, n: int = None) -> List[Dict[str, Any]]:
+        """Most requested sets among sampled requests.
+
+        :return: [{'namespace', 'set_name', 'count', 'error'}], hottest first
+        """
+        return [
+            {'namespace': namespace, 'set_name': set_name, 'count': count, 'error': error}
+            for (namespace, set_name), count, error in self._sets.top(n)
+        ]
+
+    def slow_ops(self) -> List[SlowOp]:
+        """Recent slow requests, slowest first."""
+        return sorted(self._slow, key=lambda op: op.latency, reverse=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All profiler data as JSON serializable dict."""
+        return {
+            'requests': self.requests,
+            'sampled': self.sampled,
+            'slow': self.slow,
+            'hot_keys': self.hot_keys(),
+            'hot_sets': self.hot_sets(),
+            'slow_ops': [asdict(op) for op in self.slow_ops()],
+        }
+
+    def dump(self, file: TextIO = None):
+        """Writes snapshot as one JSON line, to stderr by default."""
+        file = file or sys.stderr
+        file.write(json.dumps(self.snapshot()) + '\n')
+        file.flush()
+
+    def install_signal_handler(self, signum: int = None, file: TextIO = None):
+        """Dumps snapshot when process receives signal, e.g. kill -USR1 <pid>.
+
+        Must be called from main thread.
+
+        :param int signum: signal number, SIGUSR1 by default.
+        """
+        signal.signal(signum or signal.SIGUSR1, lambda *_: self.dump(file))
+
+    def reset(self):
+        self._keys.clear()
+        self._sets.clear()
+        self._slow.clear()
+        self._countdown = self.sample_every
+        self.requests = 0
+        self.sampled = 0
+        self.slow = 0
@@ -0,0 +1,120 @@
+import asyncio
+from collections import deque
+from typing import Deque, List, Optional, Union
+
+from asyncaerospike.codec import HEADER_SIZE, unpack_header
+
+
+class AerospikeProtocol(asyncio.Protocol):
+    """Low-level asyncio protocol for Aerospike connection.
+
+    Frames are parsed straight from receive buffer in data_received and
+    resolve waiting futures in request order, so many requests can be in
+    flight on one connection without lock and without StreamReader.
+    Works with any event loop, including uvloop.
+    """
+
+    def __init__(self):
+        self._transport: Optional[asyncio.Transport] = None
+        self._buffer = bytearray()
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._exception: Optional[Exception] = None
+        self._drain_waiter: Optional[asyncio.Future] = None
+        self._paused = False
+
+    @property
+    def is_connected(self) -> bool:
+        return self._transport is not None and self._exception is None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._waiters)
+
+    def connection_made(self, transport: asyncio.Transport):
+        self._transport = transport
+
+    def data_received(self, data: bytes):
+        buffer = self._buffer
+        buffer += data
+        offset = 0
+        size = len(buffer)
+
+        while size - offset >= HEADER_SIZE:
+            try:
+                _, length = unpack_header(buffer[offset:offset + HEADER_SIZE])
+            except ValueError as e:
+                self._fail(e)
+                self._transport.close()
+                return
+            end = offset + HEADER_SIZE + length
+            if size < end:
+                break
+            message = bytes(buffer[offset + HEADER_SIZE:end])
+            offset = end
+
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(message)
+
+        if offset:
+            del buffer[:offset]
+
+    def connection_lost(self, exc: Optional[Exception]):
+        self._fail(exc or ConnectionResetError('Connection lost'))
+        if self._drain_waiter is not None and not self._drain_waiter.done():
+            self._drain_waiter.set_result(None)
+
+    def pause_writing(self):
+        self._paused = True
+
+    def resume_writing(self):
+        self._paused = False
+        if self._drain_waiter is not None and not self._drain_waiter.done():
+            self._drain_waiter.set_result(None)
+
+    def _fail(self, exc: Exception):
+        if self._exception is None:
+            self._exception = exc
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(exc)
+
+    def send(self, data: Union[bytes, List[bytes]]) -> asyncio.Future:
+        """Writes request (bytes or buffers) and returns future of response message (without header)."""
+        if self._exception is not None:
+            raise ConnectionError('Connection is closed') from self._exception
+        waiter = asyncio.get_event_loop().create_future()
+        self._waiters.append(waiter)
+        if isinstance(data, list):
+            self._transport.writelines(data)
+        else:
+            self._transport.write(data)
+        return waiter
+
+    async def request(self, data: Union[bytes, List[bytes]]) -> bytes:
+        """Writes request, waits for write buffer to drain and for response message."""
+        waiter = self.send(data)
+        if self._paused:
+            if self._drain_waiter is None or self._drain_waiter.done():
+                self._drain_waiter = asyncio.get_event_loop().create_future()
+            await asyncio.shield(self._drain_waiter)
+        return await waiter
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+
+
+def use_uvloop() -> bool:
+    """Sets uvloop event loop policy if uvloop is installed.
+
+    :return: True if uvloop is used
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
@@ -0,0 +1,121 @@
+from struct import Struct
+from typing import List, Tuple, Union
+
+from asyncaerospike.base import Base
+from asyncaerospike.datatypes import AerospikeInteger, AerospikeType
+from asyncaerospike.fields import FieldTypes
+from asyncaerospike.info_flags import Info3Flags
+from asyncaerospike.response import Response
+
+PARTITIONS = 4096
+
+FIELD_HEADER = Struct('!IB')
+_NAME_LENGTH = Struct('!B')
+_PREDICATE_TYPE = Struct('!B')
+_VALUE_LENGTH = Struct('!I')
+_OPERATION_SIZE = Struct('!I')
+
+AS_OK = 0
+AS_ERR_NOT_FOUND = 2
+
+
+def partition_id(digest: bytes) -> int:
+    """Aerospike partition of record digest."""
+    return int.from_bytes(digest[:2], 'little') % PARTITIONS
+
+
+def split_partitions(parts: int) -> List[List[int]]:
+    """Splits all partitions to parts of almost equal size."""
+    parts = max(1, min(parts, PARTITIONS))
+    return [list(range(PARTITIONS))[i::parts] for i in range(parts)]
+
+
+class Predicate:
+    """Secondary index filter of query: bin value in [begin, end].
+
+    :param str bin_name: indexed bin.
+    :param int particle_type: AerospikeType.INTEGER or AerospikeType.STRING.
+    :param begin: first value.
+    :param end: last value.
+    """
+
+    def __init__(self, bin_name: str, particle_type: int, begin: Union[int, str], end: Union[int, str]):
+        self.bin_name = bin_name
+        self.particle_type = particle_type
+        self.begin = begin
+        self.end = end
+
+    def _pack_value(self, value: Union[int, str]) -> bytes:
+        if self.particle_type == AerospikeType.INTEGER:
+            data = AerospikeInteger.ENCODER.pack(value & 0xFFFFFFFFFFFFFFFF)
+        else:
+            data = value.encode('utf-8')
+        return _VALUE_LENGTH.pack(len(data)) + data
+
+    def pack(self) -> bytes:
+        name = self.bin_name.encode('utf-8')
+        return (
+            _NAME_LENGTH.pack(len(name)) + name + _PREDICATE_TYPE.pack(self.particle_type)
+            + self._pack_value(self.begin) + self._pack_value(self.end)
+        )
+
+    def __repr__(self):
+        return f'<Predicate {self.bin_name} in [{self.begin!r}, {self.end!r}]>'
+
+
+def equals(bin_name: str, value: Union[int, str]) -> Predicate:
+    """Bin equals integer or string value."""
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise TypeError(f'Only int and str values are indexed, got {type(value)}')
+    particle_type = AerospikeType.INTEGER if isinstance(value, int) else AerospikeType.STRING
+    return Predicate(bin_name, particle_type, value, value)
+
+
+def between(bin_name: str, begin: int, end: int) -> Predicate:
+    """Integer bin value in [begin, end]."""
+    return Predicate(bin_name, AerospikeType.INTEGER, begin, end)
+
+
+def parse_records(data: bytes) -> Tuple[List[Response], List[Tuple[int, int]], Base]:
+    """Parses query or scan response message with many records.
+
+    Partition done markers with OK status are skipped, others mean partition
+    was not queried to the end, e.g. it is migrating.
+
+    :return: records with digest, [(partition id, status code)] of unfinished partitions,
+        Base of last record message if message is the last one, else None
+    """
+    records = []
+    unfinished = []
+    offset = 0
+    size = len(data)
+    while offset < size:
+        base = Base.unpack(data[offset:offset + Base.ENCODER.size])
+        offset += Base.ENCODER.size
+        if base.info3 & Info3Flags.LAST:
+            return records, unfinished, base
+
+        digest = None
+        for _ in range(base.fields_num):
+            field_size, field_type = FIELD_HEADER.unpack_from(data, offset)
+            if field_type == FieldTypes.DIGEST:
+                digest = data[offset + FIELD_HEADER.size:offset + 4 + field_size]
+            offset += 4 + field_size
+
+        bins_start = offset
+        for _ in range(base.bins_num):
+            offset += 4 + _OPERATION_SIZE.unpack_from(data, offset)[0]
+
+        if base.info3 & Info3Flags.PARTITION_DONE:
+            # partition id is sent in generation
+            if base.status_code != AS_OK:
+                unfinished.append((base.generation, base.status_code))
+            continue
+        records.append(Response(
+            status_code=base.status_code,
+            generation=base.generation,
+            bins_num=base.bins_num,
+            resp_data=data[bins_start:offset],
+            digest=digest,
+        ))
+    return records, unfinished, None
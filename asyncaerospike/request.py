@@ -1,16 +1,20 @@
 from enum import IntEnum
-from typing import List, Union
+from typing import Any, List, Union
 from dataclasses import dataclass
 
 from asyncaerospike.header import Headers
 from asyncaerospike.base import Base
+from asyncaerospike.expressions import Expression
 from asyncaerospike.fields import (
-    Namespace, Set, Key
+    Field, Namespace, Set, Key, FilterExpression,
+    UdfModule, UdfFunction, UdfArgs, UdfOp, UdfOpTypes, TaskId,
+    IndexRange, PartitionIds
 )
 from asyncaerospike.bin import (
     Bin, OperationTypes, READ_OPERATIONS, WRITE_OPERATIONS
 )
 from asyncaerospike.info_flags import Info1Flags, Info2Flags, Info3Flags
+from asyncaerospike.query import Predicate
 
 
 class RequestType(IntEnum):
@@ -28,7 +32,9 @@ def _create_request(
         info3: int,
         set_name: str = None,
         bins: [dict, list] = None,
-        operation_bins: List[Bin] = None
+        operation_bins: List[Bin] = None,
+        filter_expression: Expression = None,
+        extra_fields: List[Field] = None,
 ):
     namespace = Namespace(data=namespace)
     key = Key(data=key, set_name=set_name)
@@ -37,12 +43,18 @@ def _create_request(
     if set_name:
         set = Set(data=set_name)
 
-    fields = [f for f in [namespace, set, key] if f]
+    filter_field = None
+    if filter_expression is not None:
+        filter_field = FilterExpression(data=filter_expression)
+
+    fields = [f for f in [namespace, set, key, filter_field] if f]
+    if extra_fields:
+        fields.extend(extra_fields)
 
     if isinstance(bins, dict):
         bins = [Bin(data=v, operation_type=OperationTypes.WRITE, key=k) for k, v in bins.items()]
     elif isinstance(bins, list):
-        bins = [Bin(operation_type=OperationTypes.READ, key=b) for b in bins]
+        bins = [b if isinstance(b, Bin) else Bin(operation_type=OperationTypes.READ, key=b) for b in bins]
     else:
         bins = []
 
@@ -83,6 +95,20 @@ class Request:
         headers = Headers(request_type=RequestType.MESSAGE, request_length=len(message_packed)).pack()
         return headers + message_packed
 
+    def pack_parts(self) -> List[bytes]:
+        """Packs request to buffers for writelines.
+
+        Bin values are separate buffers, so large values are not copied
+        into one message as with pack.
+        """
+        parts = [self.base.pack() + b''.join([f.pack() for f in self.fields])]
+        for b in self.bins:
+            parts.extend(b.pack_parts())
+        message_length = sum(len(p) for p in parts)
+        headers = Headers(request_type=RequestType.MESSAGE, request_length=message_length).pack()
+        parts[0] = headers + parts[0]
+        return parts
+
     def __repr__(self):
         return '<Aerospike Request>'
 
@@ -92,6 +118,7 @@ def put_request(
         key: str,
         bins: dict,
         set_name: str = None,
+        filter_expression: Expression = None,
 ):
     return _create_request(
         namespace=namespace,
@@ -101,6 +128,7 @@ def put_request(
         info1=Info1Flags.EMPTY,
         info2=Info2Flags.WRITE,
         info3=Info3Flags.EMPTY,
+        filter_expression=filter_expression,
     )
 
 
@@ -108,6 +136,7 @@ def get_request(
         namespace: str,
         key: str,
         set_name: str = None,
+        filter_expression: Expression = None,
 ):
     return _create_request(
         namespace=namespace,
@@ -116,23 +145,56 @@ def get_request(
         info1=Info1Flags.READ | Info1Flags.GET_ALL,
         info2=Info2Flags.EMPTY,
         info3=Info3Flags.EMPTY,
+        filter_expression=filter_expression,
+    )
+
+
+def header_request(
+        namespace: str,
+        key: str,
+        set_name: str = None,
+        filter_expression: Expression = None,
+):
+    return _create_request(
+        namespace=namespace,
+        key=key,
+        set_name=set_name,
+        info1=Info1Flags.READ | Info1Flags.DONT_GET_BIN_DATA,
+        info2=Info2Flags.EMPTY,
+        info3=Info3Flags.EMPTY,
+        filter_expression=filter_expression,
     )
 
 
 def select_request(
         namespace: str,
         key: str,
-        bin_names: list,
+        bin_names: List[Union[str, Bin]],
         set_name: str = None,
+        filter_expression: Expression = None,
 ):
+    """Request reading bins and read operations, e.g. list size, in one round trip.
+
+    With operations server responds to every one, so Response.results
+    lines up with bin_names.
+    """
+    info2 = Info2Flags.EMPTY
+    for bin_name in bin_names:
+        if not isinstance(bin_name, Bin):
+            continue
+        if bin_name.operation_type not in READ_OPERATIONS:
+            raise ValueError(f'select takes only read operations, got {bin_name.operation_type!r}')
+        info2 = Info2Flags.RESPOND_ALL_OPS
+
     return _create_request(
         namespace=namespace,
         key=key,
         set_name=set_name,
-        bins=bin_names,
+        bins=list(bin_names),
         info1=Info1Flags.READ,
-        info2=Info2Flags.EMPTY,
+        info2=info2,
         info3=Info3Flags.EMPTY,
+        filter_expression=filter_expression,
     )
 
 
@@ -140,6 +202,7 @@ def delete_request(
         namespace: str,
         key: str,
         set_name: str = None,
+        filter_expression: Expression = None,
 ):
     return _create_request(
         namespace=namespace,
@@ -148,6 +211,7 @@ def delete_request(
         info1=Info1Flags.EMPTY,
         info2=Info2Flags.DELETE | Info2Flags.WRITE,
         info3=Info3Flags.EMPTY,
+        filter_expression=filter_expression,
     )
 
 
@@ -171,8 +235,12 @@ def operate_request(
         key: str,
         operation_bins: List[Bin],
         set_name: str = None,
+        filter_expression: Expression = None,
+        respond_all_ops: bool = False,
 ):
     info1, info2 = _get_info_flag_for_operations(operation_bins)
+    if respond_all_ops:
+        info2 |= Info2Flags.RESPOND_ALL_OPS
 
     return _create_request(
         namespace=namespace,
@@ -181,5 +249,120 @@ def operate_request(
         info1=info1,
         info2=info2,
         info3=Info3Flags.EMPTY,
-        operation_bins=operation_bins
+        operation_bins=operation_bins,
+        filter_expression=filter_expression,
+    )
+
+
+def _udf_fields(module: str, function: str, args: List[Any], udf_op: UdfOpTypes) -> List[Field]:
+    return [
+        UdfModule(data=module),
+        UdfFunction(data=function),
+        UdfArgs(data=args or []),
+        UdfOp(data=udf_op),
+    ]
+
+
+def apply_request(
+        namespace: str,
+        key: str,
+        module: str,
+        function: str,
+        args: List[Any] = None,
+        set_name: str = None,
+        filter_expression: Expression = None,
+):
+    return _create_request(
+        namespace=namespace,
+        key=key,
+        set_name=set_name,
+        info1=Info1Flags.EMPTY,
+        info2=Info2Flags.WRITE,
+        info3=Info3Flags.EMPTY,
+        filter_expression=filter_expression,
+        extra_fields=_udf_fields(module, function, args, UdfOpTypes.RECORD),
+    )
+
+
+def background_udf_request(
+        namespace: str,
+        module: str,
+        function: str,
+        task_id: int,
+        args: List[Any] = None,
+        set_name: str = None,
+        filter_expression: Expression = None,
+):
+    """Request applying UDF to every record of namespace or set in background."""
+    namespace = Namespace(data=namespace)
+    fields = [namespace]
+    if set_name:
+        fields.append(Set(data=set_name))
+    fields.append(TaskId(data=task_id))
+    if filter_expression is not None:
+        fields.append(FilterExpression(data=filter_expression))
+    fields.extend(_udf_fields(module, function, args, UdfOpTypes.BACKGROUND))
+
+    base = Base(
+        info1=Info1Flags.EMPTY,
+        info2=Info2Flags.WRITE,
+        info3=Info3Flags.EMPTY,
+        fields_num=len(fields),
+        bins_num=0,
+    )
+    return Request(
+        namespace=namespace,
+        key=None,
+        fields=fields,
+        bins=[],
+        base=base,
+        set=fields[1] if set_name else None,
+    )
+
+
+def query_request(
+        namespace: str,
+        task_id: int,
+        partitions: List[int],
+        set_name: str = None,
+        predicate: Predicate = None,
+        bin_names: List[str] = None,
+        filter_expression: Expression = None,
+):
+    """Request reading records of partitions matching predicate and filter expression.
+
+    Without predicate all records of partitions are read.
+    """
+    namespace = Namespace(data=namespace)
+    fields = [namespace]
+    if set_name:
+        fields.append(Set(data=set_name))
+    fields.append(TaskId(data=task_id))
+    if predicate is not None:
+        fields.append(IndexRange(data=predicate))
+    if filter_expression is not None:
+        fields.append(FilterExpression(data=filter_expression))
+    fields.append(PartitionIds(data=partitions))
+
+    info1 = Info1Flags.READ
+    if bin_names:
+        bins = [Bin(operation_type=OperationTypes.READ, key=b) for b in bin_names]
+    else:
+        bins = []
+        info1 |= Info1Flags.GET_ALL
+
+    base = Base(
+        info1=info1,
+        info2=Info2Flags.EMPTY,
+        info3=Info3Flags.PARTITION_DONE,
+        fields_num=len(fields),
+        bins_num=len(bins),
+    )
+    return Request(
+        namespace=namespace,
+        key=None,
+        fields=fields,
+        bins=bins,
+        base=base,
+        set=fields[1] if set_name else None,
     )
@@ -1,6 +1,22 @@
-from asyncaerospike.bin import Bin
+import asyncio
+from struct import Struct
+from typing import Any, List, Tuple, Union
+
 from asyncaerospike.base import Base
+from asyncaerospike.bin import Bin, OperationTypes
+from asyncaerospike.codec import OPERATION_HEADER, decode_bins, decode_operations
+from asyncaerospike.datatypes import AEROSPIKE_TYPE_CODE_TO_AEROSPIKE_TYPE
 from asyncaerospike.errors import AerospikeError, STATUS_TO_ERROR
+from asyncaerospike.schema import register_schema
+
+
+FIELD_SIZE = Struct('!I')
+# values larger than this are read in chunks of this size
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def _decode_particle(particle_type: int, data: bytes):
+    return AEROSPIKE_TYPE_CODE_TO_AEROSPIKE_TYPE[particle_type].unpack(data).data
 
 
 class Response:
@@ -9,12 +25,14 @@ class Response:
             status_code: int,
             generation: int,
             bins_num: int,
-            resp_data: bytes
+            resp_data: bytes,
+            digest: bytes = None
     ):
         self.status_code = status_code
         self.generation = generation
         self.bins_num = bins_num
         self.resp_data = resp_data
+        self.digest = digest
 
     @classmethod
     def from_bytes(cls, message_data: bytes):
@@ -28,18 +46,51 @@ class Response:
             resp_data=resp_data
         )
 
+    @property
+    def size(self) -> int:
+        """Size of bins data in response, in bytes."""
+        return len(self.resp_data)
+
     @property
     def bins(self) -> [dict, None]:
         """Get bins from response"""
         if self.bins_num == 0:
             return None
-        resp_data = self.resp_data
-        bins = {}
-        for _ in range(self.bins_num):
-            b = Bin.unpack(resp_data)
-            bins[b.key] = b.data.data
-            resp_data = resp_data[len(b):]
-        return bins
+        return decode_bins(self.resp_data, self.bins_num, _decode_particle)
+
+    @property
+    def results(self) -> List[Tuple[str, Any]]:
+        """Get result of every operation as [(bin name, value)] in request order.
+
+        Unlike bins, keeps results of several operations on the same bin,
+        e.g. list size and last elements of list read in one select.
+        Results of write operations are there only with operate(respond_all_ops=True).
+        """
+        return decode_operations(self.resp_data, self.bins_num, _decode_particle)
+
+    def as_record(self, record_class: type):
+        """Get bins from response decoded to record class.
+
+        :param record_class: dataclass, NamedTuple or class with __slots__.
+        :return: record_class instance or None if there are no bins
+        """
+        if self.bins_num == 0:
+            return None
+        return register_schema(record_class).decode(self.resp_data, self.bins_num)
+
+    def udf_result(self):
+        """Get result of UDF applied with Client.apply.
+
+        :return: value returned by UDF function
+        :raises AerospikeError: if request or UDF failed, with UDF error message
+        """
+        bins = self.bins or {}
+        if self.status_code != 0:
+            raise AerospikeError(
+                status_code=self.status_code,
+                message=bins.get('FAILURE') or STATUS_TO_ERROR[self.status_code]
+            )
+        return bins.get('SUCCESS')
 
     def raise_for_status(self):
         """Raises 'AerospikeError', if one occurred."""
@@ -61,3 +112,105 @@ class Response:
 
     def __repr__(self):
         return f'<Aerospike Response [{STATUS_TO_ERROR[self.status_code]}]>'
+
+
+class DecodedResponse(Response):
+    """Response with bins decoded while reading from socket, see read_response.
+
+    resp_data is packed again from results on first access,
+    for code that decodes raw bins (e.g. columnar.to_columns).
+
+    :param results: [(bin name, value)] in response order.
+    :param int size: size of bins data as received, in bytes.
+    """
+
+    def __init__(self, status_code: int, generation: int, results: List[Tuple[str, Any]], size: int):
+        super().__init__(status_code=status_code, generation=generation, bins_num=len(results), resp_data=None)
+        self._results = results
+        self._size = size
+
+    @property
+    def resp_data(self) -> bytes:
+        if self._resp_data is None:
+            self._resp_data = b''.join(
+                Bin(key=name, data=value, operation_type=OperationTypes.READ).pack() for name, value in self._results
+            )
+        return self._resp_data
+
+    @resp_data.setter
+    def resp_data(self, resp_data: bytes):
+        self._resp_data = resp_data
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def bins(self) -> [dict, None]:
+        if not self._results:
+            return None
+        return dict(self._results)
+
+    @property
+    def results(self) -> List[Tuple[str, Any]]:
+        return list(self._results)
+
+    def as_record(self, record_class: type):
+        if not self._results:
+            return None
+        return register_schema(record_class).from_bins(dict(self._results))
+
+
+async def _read_value(reader: asyncio.StreamReader, size: int) -> Union[bytes, bytearray]:
+    """Reads value into one buffer, large values chunk by chunk,
+    so stream buffer does not grow to value size.
+    """
+    if size <= READ_CHUNK_SIZE:
+        return await reader.readexactly(size)
+
+    value = bytearray(size)
+    view = memoryview(value)
+    offset = 0
+    while offset < size:
+        chunk = await reader.read(min(size - offset, READ_CHUNK_SIZE))
+        if not chunk:
+            raise asyncio.IncompleteReadError(b'', size)
+        view[offset:offset + len(chunk)] = chunk
+        offset += len(chunk)
+    view.release()
+    return value
+
+
+async def read_response(reader: asyncio.StreamReader, length: int, large_record_size: int) -> Response:
+    """Reads response message of length bytes from stream.
+
+    Messages up to large_record_size are read whole, larger ones are decoded
+    bin by bin as they arrive, so message is never held in memory at once.
+
+    :return: Response or DecodedResponse
+    """
+    if length <= large_record_size:
+        return Response.from_bytes(await reader.readexactly(length))
+
+    base = Base.unpack(await reader.readexactly(Base.ENCODER.size))
+    remaining = length - Base.ENCODER.size
+    for _ in range(base.fields_num):
+        field_size, = FIELD_SIZE.unpack(await reader.readexactly(FIELD_SIZE.size))
+        await reader.readexactly(field_size)
+        remaining -= FIELD_SIZE.size + field_size
+
+    results = []
+    bins_size = remaining
+    for _ in range(base.bins_num):
+        size, _, particle_type, _, name_length = OPERATION_HEADER.unpack(
+            await reader.readexactly(OPERATION_HEADER.size)
+        )
+        name = (await reader.readexactly(name_length)).decode('utf-8')
+        value = await _read_value(reader, size - 4 - name_length)
+        results.append((name, None if particle_type == 0 else _decode_particle(particle_type, value)))
+        remaining -= 4 + size
+
+    bins_size -= remaining
+    if remaining:
+        await reader.readexactly(remaining)
+    return DecodedResponse(status_code=base.status_code, generation=base.generation, results=results, size=bins_size)
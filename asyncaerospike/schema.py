@@ -0,0 +1,200 @@
+import dataclasses
+import typing
+from typing import Any, Callable, Dict, List, Tuple
+
+from asyncaerospike.codec import decode_record
+from asyncaerospike.datatypes import AEROSPIKE_TYPE_CODE_TO_AEROSPIKE_TYPE, AerospikeType
+from asyncaerospike.errors import SchemaError
+
+
+PYTHON_TYPE_TO_AEROSPIKE_TYPE_CODE = {
+    int: AerospikeType.INTEGER,
+    float: AerospikeType.DOUBLE,
+    str: AerospikeType.STRING,
+    bytes: AerospikeType.BLOB,
+    list: AerospikeType.LIST,
+    dict: AerospikeType.MAP,
+}
+
+# expected type code of bins of any type
+_ANY_TYPE = -1
+
+_MISSING = object()
+
+
+def _decode_particle(particle_type: int, data: bytes) -> Any:
+    return AEROSPIKE_TYPE_CODE_TO_AEROSPIKE_TYPE[particle_type].unpack(data).data
+
+
+def _expected_type(annotation: Any) -> Tuple[Any, bool]:
+    """Splits annotation to Aerospike type code and nullability.
+
+    :return: type code (None for any type) and flag if None is allowed
+    """
+    if annotation is Any:
+        return None, True
+
+    if typing.get_origin(annotation) is typing.Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        nullable = len(args) != len(typing.get_args(annotation))
+        if len(args) == 1:
+            type_code, _ = _expected_type(args[0])
+            return type_code, nullable
+        return None, True
+
+    origin = typing.get_origin(annotation) or annotation
+    if origin not in PYTHON_TYPE_TO_AEROSPIKE_TYPE_CODE:
+        raise SchemaError(f'Unsupported bin type: {annotation!r}')
+    return PYTHON_TYPE_TO_AEROSPIKE_TYPE_CODE[origin], False
+
+
+def _is_namedtuple(record_class: type) -> bool:
+    return issubclass(record_class, tuple) and hasattr(record_class, '_fields')
+
+
+class RecordSchema:
+    """Decoder specialized for user-defined record class.
+
+    Bins are matched to record fields by name and decoded straight into the
+    record without building intermediate dict, by C codec if it is built.
+    Bins that are not in schema are skipped, fields without bin get their
+    default value (or None).
+
+    Supported record classes: dataclasses, NamedTuples and classes with __slots__.
+
+    :param record_class: class to decode records to.
+    """
+
+    def __init__(self, record_class: type):
+        self.record_class = record_class
+
+        names, defaults, factories = self._fields(record_class)
+        hints = typing.get_type_hints(record_class)
+
+        # name -> (index, expected type code, nullable), keys are bytes as names in response data
+        self._slots: Dict[bytes, Tuple[int, int, bool]] = {}
+        for index, name in enumerate(names):
+            type_code, nullable = _expected_type(hints.get(name, Any))
+            self._slots[name.encode('utf-8')] = (index, _ANY_TYPE if type_code is None else type_code, nullable)
+
+        self._defaults = defaults
+        self._factories = factories
+        self._build = self._builder(record_class, names)
+
+    @staticmethod
+    def _fields(record_class: type) -> Tuple[List[str], List[Any], List[Tuple[int, Callable]]]:
+        names, defaults, factories = [], [], []
+
+        if dataclasses.is_dataclass(record_class):
+            for index, field in enumerate(f for f in dataclasses.fields(record_class) if f.init):
+                names.append(field.name)
+                if field.default_factory is not dataclasses.MISSING:
+                    defaults.append(_MISSING)
+                    factories.append((index, field.default_factory))
+                elif field.default is not dataclasses.MISSING:
+                    defaults.append(field.default)
+                else:
+                    defaults.append(None)
+        elif _is_namedtuple(record_class):
+            names = list(record_class._fields)
+            defaults = [record_class._field_defaults.get(name) for name in names]
+        elif '__slots__' in vars(record_class):
+            slots = record_class.__slots__
+            names = [slots] if isinstance(slots, str) else list(slots)
+            defaults = [None] * len(names)
+        else:
+            raise SchemaError(
+                f'{record_class.__name__} must be a dataclass, NamedTuple or class with __slots__'
+            )
+
+        return names, defaults, factories
+
+    @staticmethod
+    def _builder(record_class: type, names: List[str]) -> Callable[[list], Any]:
+        if dataclasses.is_dataclass(record_class):
+            return lambda values: record_class(*values)
+
+        if _is_namedtuple(record_class):
+            return lambda values: tuple.__new__(record_class, values)
+
+        setters = [getattr(record_class, name).__set__ for name in names]
+
+        def build(values: list):
+            record = record_class.__new__(record_class)
+            for setter, value in zip(setters, values):
+                setter(record, value)
+            return record
+
+        return build
+
+    def decode(self, data: bytes, bins_num: int) -> Any:
+        """Decodes bins from response data to record.
+
+        :param data: response data after Base.
+        :param bins_num: number of bins in data.
+        :return: instance of record class
+        """
+        values = self._defaults.copy()
+        mismatch = decode_record(data, bins_num, self._slots, values, _decode_particle)
+        if mismatch is not None:
+            name, type_code = mismatch
+            self._raise_mismatch(name.decode('utf-8'), type_code)
+
+        for index, factory in self._factories:
+            if values[index] is _MISSING:
+                values[index] = factory()
+
+        return self._build(values)
+
+    def _raise_mismatch(self, name: str, type_code: int):
+        if type_code == AerospikeType.UNDEF:
+            raise SchemaError(f'Bin {name!r} is None, but it is not Optional')
+        expected = self._slots[name.encode('utf-8')][1]
+        raise SchemaError(f'Bin {name!r} has type {type_code}, expected {expected}')
+
+    def from_bins(self, bins: Dict[str, Any]) -> Any:
+        """Builds record from already decoded bins, with the same type checks as decode.
+
+        :param bins: {name: value}
+        :return: instance of record class
+        """
+        values = self._defaults.copy()
+        for bin_name, value in bins.items():
+            slot = self._slots.get(bin_name.encode('utf-8'))
+            if slot is None:
+                continue
+            index, expected, nullable = slot
+            if value is None:
+                if not nullable:
+                    self._raise_mismatch(bin_name, AerospikeType.UNDEF)
+            elif expected != _ANY_TYPE:
+                type_code = PYTHON_TYPE_TO_AEROSPIKE_TYPE_CODE.get(type(value))
+                if type_code != expected:
+                    self._raise_mismatch(bin_name, type_code)
+            values[index] = value
+
+        for index, factory in self._factories:
+            if values[index] is _MISSING:
+                values[index] = factory()
+
+        return self._build(values)
+
+    def __repr__(self):
+        return f'<RecordSchema [{self.record_class.__name__}]>'
+
+
+_SCHEMAS: Dict[type, RecordSchema] = {}
+
+
+def register_schema(record_class: type) -> RecordSchema:
+    """Registers record class and builds decoder for it.
+
+    Returns cached schema for already registered class.
+
+    :param record_class: dataclass, NamedTuple or class with __slots__.
+    :return: schema for record class
+    """
+    schema = _SCHEMAS.get(record_class)
+    if schema is None:
+        schema = _SCHEMAS[record_class] = RecordSchema(record_class)
+    return schema
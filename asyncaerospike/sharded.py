@@ -0,0 +1,376 @@
+import asyncio
+import itertools
+import multiprocessing
+from multiprocessing.connection import Connection
+import os
+import pickle
+from struct import Struct
+from typing import Any, Dict, List, Optional, Tuple
+
+from asyncaerospike.bin import Bin
+from asyncaerospike.client import connection
+from asyncaerospike.codec import HAS_SPEEDUPS
+from asyncaerospike.errors import AerospikeError
+from asyncaerospike.expressions import Expression
+from asyncaerospike.fields import Key
+from asyncaerospike.pool import ConnectionPolicy
+from asyncaerospike.query import partition_id
+from asyncaerospike.response import DecodedResponse, Response
+from asyncaerospike.sync import SyncClient
+
+
+FRAME_HEADER = Struct('!I')
+
+# request: (request_id, method name, kwargs); response: (request_id, is_ok, result or exception)
+Message = Tuple[int, Any, Any]
+
+# id of connect result and shutdown messages: request with method None stops shard,
+# shard answers it after all requests are done.
+SHUTDOWN_ID = 0
+
+# shards are started from fresh interpreter, not forked from process with running loop and threads
+START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# Bins are decoded in shard only without C codec: unpickling decoded values costs front-end
+# more than C decode of raw response, and less than pure-Python decode
+# (see sharded.frontend.* benchmarks).
+DECODE_IN_SHARD = not HAS_SPEEDUPS
+
+
+async def _open_pipes(read_conn: Connection, write_conn: Connection):
+    """Wraps pipe ends with asyncio streams, so both sides never block on full pipe.
+
+    :return: reader, writer and transport of reader, closing it closes read end
+    """
+    loop = asyncio.get_event_loop()
+    reader = asyncio.StreamReader()
+    read_transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), read_conn)
+    transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, write_conn)
+    writer = asyncio.StreamWriter(transport, protocol, None, loop)
+    return reader, writer, read_transport
+
+
+def _write_message(writer: asyncio.StreamWriter, message: Message):
+    try:
+        payload = pickle.dumps(message, pickle.HIGHEST_PROTOCOL)
+    except Exception as e:  # noqa: B902 result or error of any kind may be unpicklable
+        payload = pickle.dumps((message[0], False, RuntimeError(repr(e))), pickle.HIGHEST_PROTOCOL)
+    writer.write(FRAME_HEADER.pack(len(payload)) + payload)
+
+
+async def _read_message(reader: asyncio.StreamReader) -> Message:
+    size, = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    return pickle.loads(await reader.readexactly(size))
+
+
+def _decoded(result: Any) -> Any:
+    """Decodes bins of response, so front-end only unpickles ready values."""
+    if not isinstance(result, Response) or isinstance(result, DecodedResponse):
+        return result
+    response = DecodedResponse(
+        status_code=result.status_code, generation=result.generation, results=result.results, size=result.size
+    )
+    response.digest = result.digest
+    return response
+
+
+async def _serve_shard(
+        host: str, port: int, transport: str, policy: ConnectionPolicy, requests: Connection, responses: Connection
+):
+    reader, writer, _ = await _open_pipes(requests, responses)
+    try:
+        client = await connection(host=host, port=port, transport=transport, policy=policy)
+    except (OSError, AerospikeError) as e:
+        _write_message(writer, (SHUTDOWN_ID, False, e))
+        await writer.drain()
+        return
+    _write_message(writer, (SHUTDOWN_ID, True, None))
+
+    async def handle(request_id: int, method: str, kwargs: dict):
+        try:
+            result = await getattr(client, method)(**kwargs)
+            message = (request_id, True, _decoded(result) if DECODE_IN_SHARD else result)
+        except Exception as e:  # noqa: B902 errors are returned to caller
+            message = (request_id, False, e)
+        _write_message(writer, message)
+        await writer.drain()
+
+    tasks = set()
+    try:
+        while True:
+            request_id, method, kwargs = await _read_message(reader)
+            if method is None:
+                break
+            task = asyncio.ensure_future(handle(request_id, method, kwargs))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except asyncio.IncompleteReadError:
+        pass
+    finally:
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await client.close()
+        _write_message(writer, (SHUTDOWN_ID, True, None))
+        await writer.drain()
+        writer.close()
+
+
+def _run_shard(
+        host: str, port: int, transport: str, policy: ConnectionPolicy, requests: Connection, responses: Connection
+):
+    asyncio.run(_serve_shard(host, port, transport, policy, requests, responses))
+
+
+class _ProcessShard:
+    """Shard with its own process, event loop and Client, talking over pipes."""
+
+    def __init__(self, host: str, port: int, transport: str, policy: ConnectionPolicy, context):
+        worker_requests, self._requests = context.Pipe(duplex=False)
+        self._responses, worker_responses = context.Pipe(duplex=False)
+        self._process = context.Process(
+            target=_run_shard,
+            args=(host, port, transport, policy, worker_requests, worker_responses),
+            daemon=True,
+        )
+        self._worker_ends = (worker_requests, worker_responses)
+        self._ids = itertools.count(SHUTDOWN_ID + 1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader = None
+        self._writer = None
+        self._read_transport = None
+        self._read_task = None
+        self._is_alive = False
+
+    async def connect(self):
+        self._process.start()
+        for conn in self._worker_ends:
+            conn.close()
+        self._reader, self._writer, self._read_transport = await _open_pipes(self._responses, self._requests)
+
+        try:
+            _, is_ok, error = await _read_message(self._reader)
+        except asyncio.IncompleteReadError as e:
+            await self.close()
+            raise ConnectionError('Shard exited before connecting') from e
+        if not is_ok:
+            await self.close()
+            raise error
+        self._is_alive = True
+        self._read_task = asyncio.ensure_future(self._read_responses())
+
+    async def _read_responses(self):
+        try:
+            while True:
+                request_id, is_ok, result = await _read_message(self._reader)
+                if request_id == SHUTDOWN_ID:
+                    break
+                future = self._pending.pop(request_id, None)
+                if future is None or future.done():
+                    continue
+                if is_ok:
+                    future.set_result(result)
+                else:
+                    future.set_exception(result)
+        except Exception:  # noqa: B902 shard died or sent broken message, either way it is gone
+            pass
+        finally:
+            self._is_alive = False
+            self._fail_pending()
+
+    def _fail_pending(self):
+        error = ConnectionError('Shard is closed')
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    async def call(self, method: str, kwargs: dict) -> Response:
+        if not self._is_alive:
+            raise ConnectionError('Shard is closed')
+        request_id = next(self._ids)
+        future = asyncio.get_event_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            _write_message(self._writer, (request_id, method, kwargs))
+            await self._writer.drain()
+        except OSError as e:
+            self._pending.pop(request_id, None)
+            raise ConnectionError('Shard is closed') from e
+        return await future
+
+    async def close(self):
+        if self._read_task is not None:
+            if self._is_alive:
+                try:
+                    _write_message(self._writer, (SHUTDOWN_ID, None, None))
+                    await self._writer.drain()
+                except OSError:
+                    pass
+            await self._read_task
+            self._read_task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._read_transport.close()
+        if self._process.pid is not None:
+            await asyncio.get_event_loop().run_in_executor(None, self._process.join)
+
+
+class _ThreadShard:
+    """Shard with its own thread, event loop and Client."""
+
+    def __init__(self, host: str, port: int, transport: str, policy: ConnectionPolicy):
+        self._client = SyncClient(host=host, port=port, transport=transport, policy=policy)
+
+    async def connect(self):
+        await asyncio.get_event_loop().run_in_executor(None, self._client.connect)
+
+    async def call(self, method: str, kwargs: dict) -> Response:
+        coro = getattr(self._client.client, method)(**kwargs)
+        return await asyncio.wrap_future(self._client.submit(coro))
+
+    async def close(self):
+        await asyncio.get_event_loop().run_in_executor(None, self._client.close)
+
+
+class ShardedClient:
+    """Aerospike client spreading requests over several event loops.
+
+    Every shard runs its own event loop with its own Client connection in
+    separate process (mode='process') or thread (mode='thread'). Requests are
+    routed by partition of key digest, so one key is always served by one shard.
+    Process shards use all cores for encode/decode, without C codec bins are
+    decoded in shard process and sent back as DecodedResponse. They are started with forkserver
+    (spawn where it is not available), so creating client is slower than
+    thread shards, which only help when most of the time is spent in network and C code.
+    Calls to shard process that died fail with ConnectionError.
+
+    :param str host: Aerospike host.
+    :param int port: Aerospike port.
+    :param int shards: number of shards, CPU count by default.
+    :param str mode: 'process' or 'thread'.
+    :param str transport: transport of shard clients, see Client.
+    :param ConnectionPolicy policy: connection policy of every shard client, see Client.
+    """
+
+    MODES = ('process', 'thread')
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            shards: Optional[int] = None,
+            mode: str = 'process',
+            transport: str = 'stream',
+            policy: ConnectionPolicy = None,
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f'mode must be one of {self.MODES}, got {mode!r}')
+
+        self._host = host
+        self._port = port
+        self._mode = mode
+        shards = shards or os.cpu_count() or 1
+
+        if mode == 'process':
+            context = multiprocessing.get_context(START_METHOD)
+            self._shards = [_ProcessShard(host, port, transport, policy, context) for _ in range(shards)]
+        else:
+            self._shards = [_ThreadShard(host, port, transport, policy) for _ in range(shards)]
+        self._is_connected = False
+
+    @property
+    def host(self):
+        return self._host
+
+    @property
+    def port(self):
+        return self._port
+
+    @property
+    def shards(self) -> int:
+        return len(self._shards)
+
+    @property
+    def is_connected(self):
+        return self._is_connected
+
+    async def connect(self):
+        """Starts shards and connects them to Aerospike, closes all of them if any fails"""
+        results = await asyncio.gather(*[shard.connect() for shard in self._shards], return_exceptions=True)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            await self.close()
+            raise errors[0]
+        self._is_connected = True
+
+    async def close(self):
+        await asyncio.gather(*[shard.close() for shard in self._shards])
+        self._is_connected = False
+
+    def shard_for(self, key: Any, set_name: str = None) -> int:
+        """Index of shard serving key."""
+        return partition_id(Key(data=key, set_name=set_name).digest) % len(self._shards)
+
+    async def _call(self, method: str, key: Any, set_name: Optional[str], **kwargs) -> Response:
+        if not self._is_connected:
+            raise ConnectionError()
+        shard = self._shards[self.shard_for(key, set_name)]
+        return await shard.call(method, dict(kwargs, key=key, set_name=set_name))
+
+    async def put(
+            self, namespace: str, key: str, bins: dict, set_name: str = None, filter_expression: Expression = None
+    ) -> Response:
+        return await self._call(
+            'put', key, set_name, namespace=namespace, bins=bins, filter_expression=filter_expression
+        )
+
+    async def get(
+            self, namespace: str, key: str, set_name: str = None, filter_expression: Expression = None
+    ) -> Response:
+        return await self._call('get', key, set_name, namespace=namespace, filter_expression=filter_expression)
+
+    async def select(
+            self, namespace: str, key: str, bin_names: list, set_name: str = None, filter_expression: Expression = None
+    ) -> Response:
+        return await self._call(
+            'select', key, set_name, namespace=namespace, bin_names=bin_names, filter_expression=filter_expression
+        )
+
+    async def delete(
+            self, namespace: str, key: str, set_name: str = None, filter_expression: Expression = None
+    ) -> Response:
+        return await self._call('delete', key, set_name, namespace=namespace, filter_expression=filter_expression)
+
+    async def operate(
+            self,
+            namespace: str,
+            key: str,
+            operation_bins: List[Bin],
+            set_name: str = None,
+            filter_expression: Expression = None,
+            respond_all_ops: bool = False,
+    ) -> Response:
+        return await self._call(
+            'operate', key, set_name, namespace=namespace, operation_bins=operation_bins,
+            filter_expression=filter_expression, respond_all_ops=respond_all_ops,
+        )
+
+
+async def sharded_connection(
+    host: str,
+    port: int,
+    shards: Optional[int] = None,
+    mode: str = 'process',
+    transport: str = 'stream',
+    policy: ConnectionPolicy = None,
+) -> ShardedClient:
+    client = ShardedClient(
+        host=host,
+        port=port,
+        shards=shards,
+        mode=mode,
+        transport=transport,
+        policy=policy,
+    )
+    await client.connect()
+    return client
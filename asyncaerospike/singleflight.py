@@ -0,0 +1,45 @@
+import asyncio
+from functools import partial
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """Shares one in-flight call among concurrent calls with the same key.
+
+    First caller starts the call, others wait for its result.
+    Cancelling one waiter does not cancel the shared call.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+
+        self.calls = 0
+        self.saved = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Runs call or joins the one already running for key.
+
+        :param key: identity of call.
+        :param call: coroutine function to run.
+        :return: result of call
+        """
+        self.calls += 1
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._flights[key] = task
+            task.add_done_callback(partial(self._forget, key))
+        else:
+            self.saved += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
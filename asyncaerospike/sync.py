@@ -0,0 +1,178 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Awaitable, List, TypeVar
+
+from asyncaerospike.bin import Bin
+from asyncaerospike.breaker import CircuitBreaker
+from asyncaerospike.cache import RecordCache
+from asyncaerospike.client import Client
+from asyncaerospike.expressions import Expression
+from asyncaerospike.pool import ConnectionPolicy
+from asyncaerospike.profiler import RequestProfiler
+from asyncaerospike.response import Response
+from asyncaerospike.singleflight import SingleFlight
+
+
+T = TypeVar('T')
+
+
+class SyncClient:
+    """Thread-safe synchronous Aerospike client.
+
+    Owns one event loop running in background thread and one async Client on it.
+    Calls from any thread are dispatched to the loop, so all threads share
+    one connection instead of starting event loop per call.
+
+    :param str host: Aerospike host.
+    :param int port: Aerospike port.
+    :param RecordCache cache: optional read-through cache for get and select.
+    :param SingleFlight singleflight: optional dedup of concurrent identical get and select.
+    :param float timeout: seconds to wait for every call, None to wait forever.
+        Timed out call is cancelled and raises builtin TimeoutError, its response
+        is skipped and connection is kept.
+    :param str transport: 'stream' or 'protocol', see Client.
+    :param ConnectionPolicy policy: socket options and pool settings, see Client.
+    :param CircuitBreaker breaker: optional fail fast and in-flight limit, see Client.
+    :param RequestProfiler profiler: optional sampling of hot keys and slow requests, see Client.
+    """
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            cache: RecordCache = None,
+            singleflight: SingleFlight = None,
+            timeout: float = None,
+            transport: str = 'stream',
+            policy: ConnectionPolicy = None,
+            breaker: CircuitBreaker = None,
+            profiler: RequestProfiler = None,
+    ):
+        self._client = Client(
+            host=host, port=port, cache=cache, singleflight=singleflight,
+            transport=transport, policy=policy, breaker=breaker, profiler=profiler,
+        )
+        self._timeout = timeout
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name=f'asyncaerospike-{host}:{port}', daemon=True
+        )
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def submit(self, coro: Awaitable[T]) -> 'concurrent.futures.Future[T]':
+        """Schedules coroutine on client loop, e.g. coroutine of self.client method.
+
+        :return: future of coroutine result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _call(self, coro: Awaitable[T]) -> T:
+        future = self.submit(coro)
+        try:
+            return future.result(self._timeout)
+        except concurrent.futures.TimeoutError as e:
+            future.cancel()
+            # distinct from builtin TimeoutError before Python 3.11
+            raise TimeoutError(f'Call timed out after {self._timeout}s') from e
+
+    def connect(self):
+        """Starts loop thread and connects to Aerospike"""
+        if not self._thread.is_alive():
+            self._thread.start()
+        self._call(self._client.connect())
+
+    def close(self):
+        """Closes connection and stops loop thread"""
+        if not self._thread.is_alive():
+            return
+        if self._client.is_connected:
+            self._call(self._client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def client(self) -> Client:
+        return self._client
+
+    @property
+    def is_connected(self):
+        return self._client.is_connected
+
+    def put(
+            self, namespace: str, key: str, bins: dict, set_name: str = None, filter_expression: Expression = None
+    ) -> Response:
+        return self._call(self._client.put(
+            namespace=namespace, key=key, bins=bins, set_name=set_name, filter_expression=filter_expression
+        ))
+
+    def get(self, namespace: str, key: str, set_name: str = None, filter_expression: Expression = None) -> Response:
+        return self._call(self._client.get(
+            namespace=namespace, key=key, set_name=set_name, filter_expression=filter_expression
+        ))
+
+    def select(
+            self, namespace: str, key: str, bin_names: list, set_name: str = None, filter_expression: Expression = None
+    ) -> Response:
+        return self._call(self._client.select(
+            namespace=namespace, key=key, bin_names=bin_names, set_name=set_name, filter_expression=filter_expression
+        ))
+
+    def delete(
+            self, namespace: str, key: str, set_name: str = None, filter_expression: Expression = None
+    ) -> Response:
+        return self._call(self._client.delete(
+            namespace=namespace, key=key, set_name=set_name, filter_expression=filter_expression
+        ))
+
+    def operate(
+            self,
+            namespace: str,
+            key: str,
+            operation_bins: List[Bin],
+            set_name: str = None,
+            filter_expression: Expression = None,
+            respond_all_ops: bool = False,
+    ) -> Response:
+        return self._call(self._client.operate(
+            namespace=namespace, key=key, operation_bins=operation_bins,
+            set_name=set_name, filter_expression=filter_expression, respond_all_ops=respond_all_ops,
+        ))
+
+
+def sync_connection(
+    host: str,
+    port: int,
+    cache: RecordCache = None,
+    singleflight: SingleFlight = None,
+    timeout: float = None,
+    transport: str = 'stream',
+    policy: ConnectionPolicy = None,
+    breaker: CircuitBreaker = None,
+    profiler: RequestProfiler = None,
+) -> SyncClient:
+    client = SyncClient(
+        host=host,
+        port=port,
+        cache=cache,
+        singleflight=singleflight,
+        timeout=timeout,
+        transport=transport,
+        policy=policy,
+        breaker=breaker,
+        profiler=profiler,
+    )
+    client.connect()
+    return client
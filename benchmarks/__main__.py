@@ -0,0 +1,45 @@
+import argparse
+import json
+import sys
+
+from benchmarks.harness import compare, run
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='asyncaerospike benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run benchmarks and write results as JSON')
+    run_parser.add_argument('-o', '--output', default='-', help='results file, "-" for stdout')
+    run_parser.add_argument('-k', '--filter', default='', help='run only benchmarks containing this string')
+    run_parser.add_argument('--quick', action='store_true', help='fewer iterations, for smoke runs')
+
+    compare_parser = commands.add_parser('compare', help='compare two results files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('-t', '--threshold', type=float, default=0.1, help='allowed relative regression')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run(name_filter=args.filter, quick=args.quick)
+        data = json.dumps(results, indent=2, sort_keys=True)
+        if args.output == '-':
+            sys.stdout.write(data + '\n')
+        else:
+            with open(args.output, 'w') as f:
+                f.write(data + '\n')
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    lines, regressions = compare(baseline, current, threshold=args.threshold)
+    sys.stdout.write('\n'.join(lines) + '\n')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,224 @@
+import asyncio
+from dataclasses import dataclass
+import pickle
+import time
+
+import asyncaerospike
+from asyncaerospike import codec
+from asyncaerospike.base import Base
+from asyncaerospike.fake_server import FakeServerThread
+from asyncaerospike.fields import Key
+from asyncaerospike.header import Headers, RequestType
+from asyncaerospike.request import get_request, put_request
+from asyncaerospike.response import Response
+from asyncaerospike.schema import register_schema
+from asyncaerospike.sharded import _decoded
+from benchmarks.harness import benchmark, measure, percentile
+
+
+NAMESPACE = 'test'
+SET = 'bench'
+BINS = {f'bin_{i}': v for i, v in enumerate([1, 2.5, 'value', 42, 'x' * 64, 0.125, 7, 'name', 99, 3.0])}
+
+
+@dataclass
+class BenchRecord:
+    bin_0: int
+    bin_1: float
+    bin_2: str
+    bin_3: int
+    bin_4: str
+    bin_5: float
+    bin_6: int
+    bin_7: str
+    bin_8: int
+    bin_9: float
+
+
+def _response_bytes() -> bytes:
+    request = put_request(namespace=NAMESPACE, key='key', bins=BINS, set_name=SET)
+    return request.base.pack() + b''.join(b.pack() for b in request.bins)
+
+
+@benchmark('request_pack.put')
+def request_pack_put(quick: bool):
+    return measure(lambda: put_request(namespace=NAMESPACE, key='key', bins=BINS, set_name=SET).pack(), quick)
+
+
+@benchmark('request_pack.get')
+def request_pack_get(quick: bool):
+    return measure(lambda: get_request(namespace=NAMESPACE, key='key', set_name=SET).pack(), quick)
+
+
+@benchmark('header.parse')
+def header_parse(quick: bool):
+    data = Headers(request_type=RequestType.MESSAGE, request_length=1024).pack()
+    return measure(lambda: Headers.unpack(data), quick)
+
+
+@benchmark('response.bins')
+def response_bins(quick: bool):
+    data = _response_bytes()
+    return measure(lambda: Response.from_bytes(data).bins, quick)
+
+
+@benchmark('response.as_record')
+def response_as_record(quick: bool):
+    data = _response_bytes()
+    return measure(lambda: Response.from_bytes(data).as_record(BenchRecord), quick)
+
+
+@benchmark('response.bins_to_record')
+def response_bins_to_record(quick: bool):
+    """Baseline of response.as_record: decode to dict, then build record."""
+    data = _response_bytes()
+    return measure(lambda: BenchRecord(**Response.from_bytes(data).bins), quick)
+
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    from asyncaerospike.columnar import to_columns
+
+    def _records(count: int):
+        data = _response_bytes()
+        return [Response.from_bytes(data) for _ in range(count)]
+
+    @benchmark('columnar.to_columns')
+    def columnar_to_columns(quick: bool):
+        """20k records, four numeric bins to numpy arrays."""
+        responses = _records(20000)
+        return measure(lambda: to_columns(responses, ['bin_0', 'bin_1', 'bin_3', 'bin_5']), quick)
+
+    @benchmark('columnar.bins_array')
+    def columnar_bins_array(quick: bool):
+        """Baseline of columnar.to_columns: decode bins of every record, then np.array per bin."""
+        responses = _records(20000)
+
+        def decode():
+            bins = [r.bins for r in responses]
+            return {name: np.array([b[name] for b in bins]) for name in ('bin_0', 'bin_1', 'bin_3', 'bin_5')}
+        return measure(decode, quick)
+
+
+def _sharded_frontend(response: Response):
+    """Front-end cost of process shard response: unpickle it and read bins."""
+    payload = pickle.dumps(response, pickle.HIGHEST_PROTOCOL)
+    return lambda: pickle.loads(payload).bins
+
+
+@benchmark('sharded.frontend.response')
+def sharded_frontend_response(quick: bool):
+    return measure(_sharded_frontend(Response.from_bytes(_response_bytes())), quick)
+
+
+@benchmark('sharded.frontend.decoded')
+def sharded_frontend_decoded(quick: bool):
+    return measure(_sharded_frontend(_decoded(Response.from_bytes(_response_bytes()))), quick)
+
+
+@benchmark('digest.string')
+def digest_string(quick: bool):
+    return measure(lambda: Key(data='user:123456', set_name=SET).digest, quick)
+
+
+@benchmark('digest.integer')
+def digest_integer(quick: bool):
+    return measure(lambda: Key(data=123456, set_name=SET).digest, quick)
+
+
+def _codec_benchmarks(implementation: str, functions: dict):
+    data = _response_bytes()[Base.ENCODER.size:]
+    header = codec.py_pack_header(3, 1024)
+    value = 'user:123456'.encode('utf-8')
+
+    def fallback(particle_type, particle):  # noqa: U100
+        return None
+
+    slots = register_schema(BenchRecord)._slots
+    values = [None] * len(slots)
+
+    cases = {
+        'digest': lambda: functions['digest'](b'bench', 3, value),
+        'pack_bin': lambda: functions['pack_bin'](2, 3, 0, b'bin_name', value),
+        'pack_header': lambda: functions['pack_header'](3, 1024),
+        'unpack_header': lambda: functions['unpack_header'](header),
+        'decode_bins': lambda: functions['decode_bins'](data, len(BINS), fallback),
+        'decode_record': lambda: functions['decode_record'](data, len(BINS), slots, values, fallback),
+    }
+    for name, func in cases.items():
+        benchmark(f'codec.{name}.{implementation}')(lambda quick, func=func: measure(func, quick))
+
+
+_codec_benchmarks('python', {
+    'digest': codec.py_digest,
+    'pack_bin': codec.py_pack_bin,
+    'pack_header': codec.py_pack_header,
+    'unpack_header': codec.py_unpack_header,
+    'decode_bins': codec.py_decode_bins,
+    'decode_record': codec.py_decode_record,
+})
+
+if codec.HAS_SPEEDUPS:
+    from asyncaerospike import _speedups
+
+    _codec_benchmarks('c', vars(_speedups))
+
+
+async def _e2e(host: str, port: int, concurrency: int, operations: int, transport: str, shards: int = None) -> dict:
+    if shards:
+        client = await asyncaerospike.sharded_connection(host=host, port=port, shards=shards, transport=transport)
+    else:
+        client = await asyncaerospike.connection(host=host, port=port, transport=transport)
+    await client.put(namespace=NAMESPACE, key='key', bins=BINS, set_name=SET)
+    latencies = []
+
+    async def worker(count: int):
+        for _ in range(count):
+            started = time.perf_counter()
+            await client.get(namespace=NAMESPACE, key='key', set_name=SET)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker(operations // concurrency) for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    await client.close()
+
+    latencies.sort()
+    return {
+        'ops_per_sec': len(latencies) / elapsed,
+        'p50_us': percentile(latencies, 0.5) * 1e6,
+        'p99_us': percentile(latencies, 0.99) * 1e6,
+    }
+
+
+def _e2e_benchmark(concurrency: int, transport: str, loop_factory=None, shards: int = None):
+    def run(quick: bool):
+        loop = loop_factory() if loop_factory else asyncio.new_event_loop()
+        try:
+            with FakeServerThread() as server:
+                return loop.run_until_complete(
+                    _e2e(server.host, server.port, concurrency, 1000 if quick else 20000, transport, shards)
+                )
+        finally:
+            loop.close()
+    return run
+
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+for _concurrency in (1, 8, 64):
+    benchmark(f'e2e.get.c{_concurrency}')(_e2e_benchmark(_concurrency, 'stream'))
+    benchmark(f'e2e.get.c{_concurrency}.protocol')(_e2e_benchmark(_concurrency, 'protocol'))
+    if uvloop is not None:
+        benchmark(f'e2e.get.c{_concurrency}.protocol.uvloop')(
+            _e2e_benchmark(_concurrency, 'protocol', uvloop.new_event_loop)
+        )
+
+benchmark('e2e.get.c64.sharded2')(_e2e_benchmark(64, 'stream', shards=2))
@@ -0,0 +1,116 @@
+import gc
+import platform
+import time
+from typing import Callable, Dict, List, Tuple
+
+
+# name -> benchmark function, it gets quick flag and returns {metric: value}
+BENCHMARKS: Dict[str, Callable[[bool], Dict[str, float]]] = {}
+
+# metrics where bigger value is better, others are better when smaller
+HIGHER_IS_BETTER = {'ops_per_sec'}
+
+
+def benchmark(name: str):
+    """Registers benchmark function under name."""
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+def measure(func: Callable[[], object], quick: bool = False, repeat: int = 5) -> Dict[str, float]:
+    """Measures best time of one func call.
+
+    Calls are looped until loop takes at least 0.1 s (0.01 s in quick mode),
+    the best of repeat loops is taken to cut scheduler noise.
+
+    :return: {'ns_per_op': ...}
+    """
+    min_time = 0.01 if quick else 0.1
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    best = elapsed
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(1 if quick else repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                func()
+            best = min(best, time.perf_counter() - started)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {'ns_per_op': best / number * 1e9}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run(name_filter: str = '', quick: bool = False) -> dict:
+    """Runs registered benchmarks.
+
+    :param name_filter: run only benchmarks with this substring in name.
+    :param quick: fewer iterations, for smoke runs.
+    :return: results with environment metadata
+    """
+    import benchmarks.cases  # noqa: F401 registers benchmarks
+
+    results = {}
+    for name, func in BENCHMARKS.items():
+        if name_filter in name:
+            results[name] = func(quick)
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'system': platform.system(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'quick': quick,
+        },
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1) -> Tuple[List[str], List[str]]:
+    """Compares two results of run().
+
+    :param threshold: allowed relative change to worse side.
+    :return: report lines and names of regressed metrics
+    """
+    lines = []
+    regressions = []
+    for name, metrics in sorted(current['results'].items()):
+        base_metrics = baseline['results'].get(name)
+        if base_metrics is None:
+            lines.append(f'{name}: new')
+            continue
+
+        for metric, value in sorted(metrics.items()):
+            base_value = base_metrics.get(metric)
+            if not base_value:
+                continue
+            change = (value - base_value) / base_value
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            mark = ''
+            if worse > threshold:
+                mark = '  REGRESSION'
+                regressions.append(f'{name}.{metric}')
+            elif worse < -threshold:
+                mark = '  improvement'
+            lines.append(f'{name}.{metric}: {base_value:.1f} -> {value:.1f} ({change:+.1%}){mark}')
+
+    return lines, regressions
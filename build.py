@@ -0,0 +1,46 @@
+"""Builds optional C speedups, package works without them.
+
+Used by poetry on install, run `python build.py` to build in place for development.
+"""
+from setuptools import Extension
+from setuptools.command.build_ext import build_ext
+from setuptools.errors import CCompilerError, ExecError, PlatformError
+
+
+extensions = [
+    Extension('asyncaerospike._speedups', sources=['asyncaerospike/_speedups.c']),
+]
+
+
+class OptionalBuildExt(build_ext):
+    """Skips extension if it can not be compiled."""
+
+    def run(self):
+        try:
+            super().run()
+        except PlatformError as e:
+            self.warn(f'C speedups are not built: {e}')
+
+    def build_extension(self, ext):
+        try:
+            super().build_extension(ext)
+        except (CCompilerError, ExecError, PlatformError, ValueError) as e:
+            self.warn(f'C speedups are not built: {e}')
+
+
+def build(setup_kwargs):
+    setup_kwargs.update(
+        ext_modules=extensions,
+        cmdclass={'build_ext': OptionalBuildExt},
+    )
+
+
+if __name__ == '__main__':
+    from setuptools import setup
+
+    setup(
+        name='asyncaerospike',
+        ext_modules=extensions,
+        cmdclass={'build_ext': OptionalBuildExt},
+        script_args=['build_ext', '--inplace'],
+    )
@@ -1,23 +1,71 @@
 import asyncio
+import os
 
 import pytest
 
 import asyncaerospike
+from asyncaerospike import Bin, OperationTypes
+from asyncaerospike.fake_server import FakeServer, FakeServerThread
+from asyncaerospike.response import Response
 
 
 NAMESPACE = 'test'
 SET = 'test'
 
 
+@pytest.fixture(scope='session')
+def server_address():
+    """Address of Aerospike from AEROSPIKE_HOST/AEROSPIKE_PORT or of local fake server"""
+    if 'AEROSPIKE_HOST' in os.environ:
+        yield os.environ['AEROSPIKE_HOST'], int(os.environ.get('AEROSPIKE_PORT', 3000))
+        return
+
+    with FakeServerThread() as server:
+        yield server.host, server.port
+
+
 @pytest.fixture(scope='module')
-async def client():
-    client = await asyncaerospike.connection(host='127.0.0.1', port=3000)
+async def client(server_address):
+    host, port = server_address
+    client = await asyncaerospike.connection(host=host, port=port)
     yield client
     await client.close()
 
 
+@pytest.fixture
+async def fake_connection():
+    """Starts FakeServer and connects client to it, both are closed after test.
+
+    server, client = await fake_connection(FakeServer(latency=0.01), policy=policy)
+    """
+    servers, clients = [], []
+
+    async def connect(server: FakeServer = None, connect=asyncaerospike.connection, **kwargs):
+        server = server or FakeServer()
+        await server.start()
+        servers.append(server)
+        client = await connect(host=server.host, port=server.port, **kwargs)
+        clients.append(client)
+        return server, client
+
+    try:
+        yield connect
+    finally:
+        for client in clients:
+            await client.close()
+        for server in servers:
+            await server.stop()
+
+
 @pytest.fixture(scope='module')
 def event_loop():
     loop = asyncio.get_event_loop()
     yield loop
     loop.close()
+
+
+def make_response(bins: dict) -> Response:
+    resp_data = b''.join(
+        Bin(key=k, data=v, operation_type=OperationTypes.READ).pack() for k, v in bins.items()
+    )
+    return Response(status_code=0, generation=1, bins_num=len(bins), resp_data=resp_data)
@@ -0,0 +1,11 @@
+from benchmarks.harness import compare
+
+
+def test_compare():
+    baseline = {'results': {'a': {'ns_per_op': 100.0}, 'b': {'ops_per_sec': 1000.0, 'p99_us': 10.0}}}
+    current = {'results': {'a': {'ns_per_op': 120.0}, 'b': {'ops_per_sec': 1050.0, 'p99_us': 5.0}, 'c': {}}}
+
+    lines, regressions = compare(baseline, current, threshold=0.1)
+    assert regressions == ['a.ns_per_op']
+    assert 'c: new' in lines
+    assert any('improvement' in line and line.startswith('b.p99_us') for line in lines)
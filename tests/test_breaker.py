@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from asyncaerospike import CircuitBreaker
+from asyncaerospike.breaker import BreakerState
+from asyncaerospike.errors import CircuitOpenError, OverloadedError
+from tests.conftest import NAMESPACE
+
+
+async def fail():
+    raise ConnectionResetError()
+
+
+async def ok():
+    return 'ok'
+
+
+async def slow_ok():
+    await asyncio.sleep(0.01)
+    return 'ok'
+
+
+@pytest.mark.asyncio
+async def test_opens_on_errors_and_recovers():
+    breaker = CircuitBreaker(window=10, min_requests=4, error_rate=0.5, open_timeout=0.05)
+    assert await breaker.call(ok) == 'ok'
+    for _ in range(3):
+        with pytest.raises(ConnectionResetError):
+            await breaker.call(fail)
+    assert breaker.state == BreakerState.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(ok)
+    assert breaker.rejected_open == 1
+
+    await asyncio.sleep(0.06)
+    assert breaker.state == BreakerState.HALF_OPEN
+    with pytest.raises(ConnectionResetError):
+        await breaker.call(fail)
+    assert breaker.state == BreakerState.OPEN
+
+    await asyncio.sleep(0.06)
+    assert await breaker.call(ok) == 'ok'
+    assert breaker.state == BreakerState.CLOSED
+    assert breaker.opened == 2
+
+
+@pytest.mark.asyncio
+async def test_opens_on_latency():
+    breaker = CircuitBreaker(window=10, min_requests=10, latency_threshold=0.01, latency_percentile=0.9)
+
+    async def slow():
+        await asyncio.sleep(0.02)
+
+    for _ in range(9):
+        await breaker.call(ok)
+    await breaker.call(slow)
+    assert breaker.state == BreakerState.CLOSED
+    await breaker.call(slow)
+    assert breaker.state == BreakerState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_half_open_lets_only_probes():
+    breaker = CircuitBreaker(min_requests=1, open_timeout=0)
+    with pytest.raises(ConnectionResetError):
+        await breaker.call(fail)
+
+    probe = asyncio.ensure_future(breaker.call(slow_ok))
+    await asyncio.sleep(0)
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(ok)
+    await probe
+    assert breaker.state == BreakerState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_in_flight_limit():
+    breaker = CircuitBreaker(max_in_flight=2)
+    calls = [asyncio.ensure_future(breaker.call(slow_ok)) for _ in range(2)]
+    await asyncio.sleep(0)
+    with pytest.raises(OverloadedError):
+        await breaker.call(ok)
+    await asyncio.gather(*calls)
+    assert breaker.in_flight == 0
+    assert breaker.rejected_overload == 1
+    assert await breaker.call(ok) == 'ok'
+
+
+@pytest.mark.asyncio
+async def test_client_fails_fast(fake_connection):
+    breaker = CircuitBreaker(min_requests=3, open_timeout=60)
+    server, client = await fake_connection(breaker=breaker)
+    server.inject_error(18, count=3)
+    for _ in range(3):
+        r = await client.put(namespace=NAMESPACE, key='key', bins={'a': 1})
+        assert r.status_code == 18
+
+    requests = server.requests
+    with pytest.raises(CircuitOpenError):
+        await client.get(namespace=NAMESPACE, key='key')
+    assert server.requests == requests
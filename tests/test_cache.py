@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from asyncaerospike import RecordCache
+from asyncaerospike.response import Response
+from tests.conftest import make_response
+
+RECORD = ('test', None, 'key')
+
+
+class Server:
+    def __init__(self, generation=1, delay=0):
+        self.generation = generation
+        self.delay = delay
+        self.loads = 0
+        self.header_loads = 0
+
+    async def load(self):
+        self.loads += 1
+        await asyncio.sleep(self.delay)
+        response = make_response({'a': self.loads})
+        response.generation = self.generation
+        return response
+
+    async def load_header(self):
+        self.header_loads += 1
+        return Response(status_code=0, generation=self.generation, bins_num=0, resp_data=b'')
+
+    def fetch(self, cache, record=RECORD, bin_names=None):
+        return cache.fetch(record, bin_names, self.load, self.load_header)
+
+
+@pytest.mark.asyncio
+async def test_hit():
+    cache, server = RecordCache(ttl=60), Server()
+    r1 = await server.fetch(cache)
+    r2 = await server.fetch(cache)
+    assert r1 is r2
+    assert server.loads == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_coalescing():
+    cache, server = RecordCache(ttl=60), Server(delay=0.01)
+    responses = await asyncio.gather(*[server.fetch(cache) for _ in range(10)])
+    assert server.loads == 1
+    assert cache.coalesced == 9
+    assert all(r is responses[0] for r in responses)
+
+
+@pytest.mark.asyncio
+async def test_revalidate_by_generation():
+    cache, server = RecordCache(ttl=0), Server()
+    r1 = await server.fetch(cache)
+    r2 = await server.fetch(cache)
+    assert r1 is r2
+    assert (server.loads, server.header_loads, cache.revalidations) == (1, 1, 1)
+
+    server.generation = 2
+    r3 = await server.fetch(cache)
+    assert r3.bins == {'a': 2}
+    assert (server.loads, server.header_loads) == (2, 2)
+
+
+@pytest.mark.asyncio
+async def test_invalidate():
+    cache, server = RecordCache(ttl=60), Server()
+    await server.fetch(cache)
+    await server.fetch(cache, bin_names=('a',))
+    assert len(cache) == 2
+
+    cache.invalidate(RECORD)
+    assert len(cache) == 0
+    await server.fetch(cache)
+    assert server.loads == 3
+
+
+@pytest.mark.asyncio
+async def test_invalidate_in_flight():
+    cache, server = RecordCache(ttl=60), Server(delay=0.01)
+    task = asyncio.ensure_future(server.fetch(cache))
+    await asyncio.sleep(0)
+    cache.invalidate(RECORD)
+    await task
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    cache, server = RecordCache(max_size=2, ttl=60), Server()
+    for key in ('a', 'b', 'a', 'c'):
+        await server.fetch(cache, record=('test', None, key))
+    assert len(cache) == 2
+
+    await server.fetch(cache, record=('test', None, 'a'))
+    assert server.loads == 3
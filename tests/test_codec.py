@@ -0,0 +1,76 @@
+import hashlib
+import random
+
+import msgpack
+import pytest
+
+from asyncaerospike import Bin, OperationTypes, codec
+from asyncaerospike.response import _decode_particle
+
+speedups = pytest.importorskip('asyncaerospike._speedups')
+
+RANDOM = random.Random(0)
+BIN_VALUES = [None, 0, 1, 2 ** 64 - 1, 1.5, -0.0, float('inf'), '', 'hey', 'юникод' * 50]
+
+
+def test_digest():
+    for size in list(range(130)) + [1000, 10000]:
+        value = bytes(RANDOM.getrandbits(8) for _ in range(size))
+        for set_name in (b'', b'test'):
+            expected = codec.py_digest(set_name, 3, value)
+            assert speedups.digest(set_name, 3, value) == expected
+            assert expected == hashlib.new('ripemd160', set_name + b'\x03' + value).digest()
+
+
+def test_pack_bin():
+    for value in BIN_VALUES:
+        for name in ('', 'bin', 'б' * 5):
+            data = Bin(key=name, operation_type=OperationTypes.WRITE, data=value).data
+            args = (OperationTypes.WRITE, data.TYPE, 0, name.encode('utf-8'), data.pack_data())
+            assert speedups.pack_bin(*args) == codec.py_pack_bin(*args)
+
+
+def test_header():
+    for request_type, length in ((1, 0), (3, 22), (3, 2 ** 48 - 1)):
+        packed = codec.py_pack_header(request_type, length)
+        assert speedups.pack_header(request_type, length) == packed
+        assert speedups.unpack_header(packed) == codec.py_unpack_header(packed) == (request_type, length)
+
+    with pytest.raises(ValueError):
+        speedups.pack_header(3, 2 ** 48)
+    with pytest.raises(ValueError):
+        speedups.unpack_header(b'\x01' * 8)
+
+
+def test_decode_bins():
+    def fallback(particle_type, data):
+        return msgpack.unpackb(data) if particle_type == 20 else _decode_particle(particle_type, data)
+
+    for _ in range(50):
+        values = RANDOM.sample(BIN_VALUES, 5)
+        data = b''.join(
+            Bin(key=f'bin_{i}', operation_type=OperationTypes.READ, data=v).pack() for i, v in enumerate(values)
+        )
+        data += codec.py_pack_bin(1, 20, 0, b'list', msgpack.packb([1, 2]))
+        assert speedups.decode_bins(data, 6, fallback) == codec.py_decode_bins(data, 6, fallback)
+
+    with pytest.raises(ValueError):
+        speedups.decode_bins(data[:-1], 6, fallback)
+
+
+def test_decode_record():
+    data = b''.join(
+        Bin(key=f'bin_{i}', operation_type=OperationTypes.READ, data=v).pack() for i, v in enumerate(BIN_VALUES)
+    )
+    slots = {f'bin_{i}'.encode(): (i, -1, True) for i in range(len(BIN_VALUES))}
+    slots[b'unknown'] = (len(BIN_VALUES), 1, False)
+    for decode in (speedups.decode_record, codec.py_decode_record):
+        values = [0] * (len(BIN_VALUES) + 1)
+        assert decode(data, len(BIN_VALUES), slots, values, _decode_particle) is None
+        assert values == BIN_VALUES + [0]
+
+        typed = {b'bin_1': (0, 1, False), b'bin_4': (1, 3, False)}
+        assert decode(data, len(BIN_VALUES), typed, [None, None], _decode_particle) == (b'bin_4', 2)
+        assert decode(data, len(BIN_VALUES), {b'bin_0': (0, 1, False)}, [None], _decode_particle) == (b'bin_0', 0)
+        with pytest.raises(ValueError):
+            decode(data[:-1], len(BIN_VALUES), slots, values, _decode_particle)
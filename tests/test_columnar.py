@@ -0,0 +1,53 @@
+import pytest
+
+from asyncaerospike.errors import SchemaError
+from tests.conftest import make_response
+
+np = pytest.importorskip('numpy')
+from asyncaerospike.columnar import to_columns  # noqa: E402
+
+
+def test_to_columns():
+    responses = [
+        make_response({'a': 1, 'b': 0.5, 's': 'x'}),
+        make_response({'b': 1.5}),
+        make_response({}),
+        make_response({'a': 3, 'b': None}),
+    ]
+    columns = to_columns(responses, ['a', 'b', 'c'])
+
+    assert columns['a'].values.tolist() == [1, 0, 0, 3]
+    assert columns['a'].mask.tolist() == [False, True, True, False]
+    assert columns['b'].values.tolist() == [0.5, 1.5, 0.0, 0.0]
+    assert columns['b'].mask.tolist() == [False, False, True, True]
+    assert columns['c'].mask.all()
+
+
+def test_to_columns_matches_bins():
+    responses = [make_response({'a': i, 'b': i / 2}) for i in range(100)]
+    columns = to_columns(responses, ['a', 'b'])
+    assert columns['a'].values.tolist() == [r.bins['a'] for r in responses]
+    assert columns['b'].values.tolist() == [r.bins['b'] for r in responses]
+
+
+def test_to_columns_non_numeric():
+    with pytest.raises(SchemaError):
+        to_columns([make_response({'a': 'x'})], ['a'])
+
+
+def test_to_columns_mixed_types():
+    with pytest.raises(SchemaError):
+        to_columns([make_response({'a': 1}), make_response({'a': 1.0})], ['a'])
+
+
+def test_to_columns_layouts():
+    # same length, different layouts, and rows of unique length
+    responses = [make_response({'a': i, 'b': 0.5}) for i in range(5)]
+    responses += [make_response({'b': 1.5, 'a': 7}), make_response({'a': 8, 'c': 2})]
+    responses += [make_response({'a': 9, 's': 'x' * i}) for i in range(3)]
+    responses += [make_response({'a': None, 'b': 2.5}) for _ in range(2)]
+    columns = to_columns(responses, ['a', 'b'])
+    assert columns['a'].values.tolist() == [r.bins['a'] or 0 for r in responses]
+    assert columns['a'].mask.tolist() == [r.bins['a'] is None for r in responses]
+    assert columns['b'].values.tolist() == [r.bins.get('b', 0.0) for r in responses]
+    assert columns['b'].mask.tolist() == ['b' not in r.bins for r in responses]
@@ -0,0 +1,60 @@
+import msgpack
+import pytest
+
+from asyncaerospike import expressions as exp
+from asyncaerospike.fields import FieldTypes
+from asyncaerospike.request import get_request
+from tests.conftest import NAMESPACE, SET
+
+
+def test_pack():
+    assert exp.gt(exp.int_bin('a'), 10).pack() == b'\x93\x03\x93\x51\x02\xa1a\x0a'
+    assert (exp.int_bin('a') > 10).pack() == exp.gt(exp.int_bin('a'), 10).pack()
+
+
+def test_pack_values():
+    packed = exp.and_(
+        exp.eq(exp.str_bin('s'), 'ab'),
+        ~exp.eq(exp.blob_bin('b'), b'\x00'),
+        exp.eq(exp.list_bin('l'), [1, 'x']),
+        exp.eq(exp.set_name(), 'test'),
+    ).pack()
+    assert msgpack.unpackb(packed, raw=True) == [
+        16,
+        [1, [81, 3, b's'], b'\x03ab'],
+        [18, [1, [81, 6, b'b'], b'\x04\x00']],
+        [1, [81, 4, b'l'], [126, [1, b'\x03x']]],
+        [1, [70], b'\x03test'],
+    ]
+
+
+def test_request_field():
+    request = get_request(namespace=NAMESPACE, key='key', filter_expression=exp.int_bin('a') >= 1)
+    field = request.fields[-1]
+    assert field.FIELD_TYPE == FieldTypes.FILTER_EXP
+    assert request.base.fields_num == len(request.fields)
+    assert request.pack().endswith(field.pack())
+
+
+@pytest.mark.asyncio
+async def test_filtered_requests(fake_connection):
+    server, client = await fake_connection()
+    await client.put(namespace=NAMESPACE, set_name=SET, key='key', bins={'a': 5, 's': 'hello'})
+
+    r = await client.get(namespace=NAMESPACE, set_name=SET, key='key', filter_expression=exp.int_bin('a') > 3)
+    assert r.bins == {'a': 5, 's': 'hello'}
+
+    r = await client.get(namespace=NAMESPACE, set_name=SET, key='key', filter_expression=exp.int_bin('a') > 5)
+    assert r.status_code == 27
+
+    filter_expression = exp.regex(exp.str_bin('s'), '^he') & exp.eq(exp.set_name(), SET)
+    r = await client.select(
+        namespace=NAMESPACE, set_name=SET, key='key', bin_names=['s'], filter_expression=filter_expression
+    )
+    assert r.bins == {'s': 'hello'}
+
+    r = await client.delete(
+        namespace=NAMESPACE, set_name=SET, key='key', filter_expression=~exp.bin_exists('a')
+    )
+    assert r.status_code == 27
+    assert server.records
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+import asyncaerospike
+from asyncaerospike import OperationTypes
+from asyncaerospike import operations as ops
+from asyncaerospike.fake_server import FakeServer
+from tests.conftest import NAMESPACE
+
+
+@pytest.mark.asyncio
+async def test_injected_error(fake_connection):
+    server, client = await fake_connection()
+    server.inject_error(14)
+
+    r = await client.put(namespace=NAMESPACE, key='key', bins={'a': 1})
+    assert r.status_code == 14
+    r = await client.put(namespace=NAMESPACE, key='key', bins={'a': 1})
+    assert r.is_ok
+
+
+@pytest.mark.asyncio
+async def test_partial_reads_and_latency(fake_connection):
+    server, client = await fake_connection(FakeServer(latency=0.01, chunk_size=3))
+    await client.put(namespace=NAMESPACE, key='key', bins={'a': 'x' * 100, 'b': 1.5})
+
+    loop = asyncio.get_event_loop()
+    started = loop.time()
+    r = await client.get(namespace=NAMESPACE, key='key')
+    assert loop.time() - started >= 0.01
+    assert r.bins == {'a': 'x' * 100, 'b': 1.5}
+    assert server.requests == 2
+
+
+@pytest.mark.asyncio
+async def test_info(fake_connection):
+    server, client = await fake_connection(FakeServer(info={'statistics': 'objects=3'}))
+    assert await client.info('statistics', 'build') == {'statistics': 'objects=3', 'build': 'fake'}
+
+
+@pytest.mark.asyncio
+async def test_cached_client(fake_connection):
+    cache = asyncaerospike.RecordCache(ttl=60)
+    server, client = await fake_connection(cache=cache)
+    await client.put(namespace=NAMESPACE, key='key', bins={'a': 1})
+
+    responses = await asyncio.gather(*[client.get(namespace=NAMESPACE, key='key') for _ in range(10)])
+    assert all(r.bins == {'a': 1} for r in responses)
+    assert server.requests == 2
+
+    await client.put(namespace=NAMESPACE, key='key', bins={'a': 2})
+    r = await client.get(namespace=NAMESPACE, key='key')
+    assert r.bins == {'a': 2}
+    assert server.requests == 4
+
+
+@pytest.mark.asyncio
+async def test_cdt_operation_types(fake_connection):
+    server, client = await fake_connection()
+    await client.put(namespace=NAMESPACE, key='key', bins={'l': [1], 'm': {'a': 1}})
+
+    map_size = ops.map_size('m')
+    map_size.operation_type = OperationTypes.MAP_READ
+    r = await client.operate(namespace=NAMESPACE, key='key', operation_bins=[map_size])
+    assert r.status_code == 16
+
+    append = ops.list_append('l', 2)
+    append.operation_type = OperationTypes.CDT_READ
+    r = await client.operate(namespace=NAMESPACE, key='key', operation_bins=[append])
+    assert r.status_code == 4
+
+    r = await client.operate(namespace=NAMESPACE, key='key', operation_bins=[ops.map_size('m'), ops.list_size('l')])
+    assert r.results == [('m', 1), ('l', 1)]
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from asyncaerospike.header import Headers, RequestType
+from asyncaerospike.info import info_request, InfoPoller, parse_info, parse_info_values
+
+
+def test_info_request():
+    data = info_request(['statistics', 'namespace/test'])
+    header = Headers.unpack(data[:8])
+    assert header.request_type == RequestType.INFO
+    assert data[8:] == b'statistics\nnamespace/test\n'
+    assert header.request_length == len(data[8:])
+
+
+def test_parse_info():
+    data = b'statistics\tclient_connections=3;objects=10\nbuild\t5.5.0.2\n'
+    result = parse_info(data)
+    assert result == {'statistics': 'client_connections=3;objects=10', 'build': '5.5.0.2'}
+    assert parse_info_values(result['statistics']) == {'client_connections': '3', 'objects': '10'}
+
+
+class FlakyInfoClient:
+    def __init__(self):
+        self.server_stats = {}
+        self.calls = 0
+
+    async def info(self, *commands):
+        self.calls += 1
+        if self.calls == 1:
+            raise ValueError('broken response')
+        return {command: 'objects=1' for command in commands}
+
+
+@pytest.mark.asyncio
+async def test_poller_survives_errors():
+    client = FlakyInfoClient()
+    poller = InfoPoller(client, interval=0.01)
+    poller.start()
+    await asyncio.sleep(0.005)
+    assert isinstance(poller.last_error, ValueError)
+
+    await asyncio.sleep(0.05)
+    assert poller.is_running
+    assert poller.last_error is None
+    assert client.server_stats == {'statistics': {'objects': '1'}}
+    await poller.stop()
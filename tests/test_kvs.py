@@ -92,3 +92,14 @@ async def test_put_get_delete_with_set(client):
         set_name=SET,
     )
     assert r.bins is None
+
+
+@pytest.mark.asyncio
+async def test_put_get_list_and_map(client):
+    bins = {'list': [1, 'a', b'\x00', 1.5, None], 'map': {'a': [1, 2], 1: {'b': 'c'}}}
+    r = await client.put(namespace=NAMESPACE, key='test_cdt', bins=bins)
+    assert r.is_ok is True
+
+    r = await client.get(namespace=NAMESPACE, key='test_cdt')
+    assert r.bins == bins
+    await client.delete(namespace=NAMESPACE, key='test_cdt')
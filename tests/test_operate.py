@@ -0,0 +1,90 @@
+import pytest
+
+from asyncaerospike import Bin, OperationTypes
+from asyncaerospike import operations as ops
+from asyncaerospike.info_flags import Info2Flags
+from asyncaerospike.request import select_request
+from tests.conftest import NAMESPACE, SET
+
+
+@pytest.mark.asyncio
+async def test_operate(client):
+    r = await client.put(
+        namespace=NAMESPACE,
+        key='test_operate',
+        set_name=SET,
+        bins={'counter': 1, 'name': 'a'}
+    )
+    assert r.is_ok is True
+
+    r = await client.operate(
+        namespace=NAMESPACE,
+        key='test_operate',
+        set_name=SET,
+        operation_bins=[
+            Bin(key='counter', operation_type=OperationTypes.INCR, data=2),
+            Bin(key='name', operation_type=OperationTypes.APPEND, data='b'),
+            Bin(key='counter', operation_type=OperationTypes.READ),
+            Bin(key='name', operation_type=OperationTypes.READ),
+        ]
+    )
+    assert r.is_ok is True
+    assert r.bins == {'counter': 3, 'name': 'ab'}
+
+    r = await client.delete(
+        namespace=NAMESPACE,
+        key='test_operate',
+        set_name=SET
+    )
+    assert r.is_ok is True
+
+
+def test_select_request_with_operations():
+    request = select_request(namespace=NAMESPACE, key='key', bin_names=['a'])
+    assert request.base.info2 == Info2Flags.EMPTY
+
+    request = select_request(namespace=NAMESPACE, key='key', bin_names=['a', ops.list_size('l')])
+    assert request.base.info2 == Info2Flags.RESPOND_ALL_OPS
+    assert [b.operation_type for b in request.bins] == [OperationTypes.READ, OperationTypes.CDT_READ]
+    assert request.bins[1].pack().endswith(b'\x91\x10')
+    # map operations are CDT operations too, map op code is in payload
+    assert ops.map_size('m').operation_type == OperationTypes.CDT_READ
+    assert ops.map_size('m').pack().endswith(b'\x91\x60')
+
+    with pytest.raises(ValueError):
+        select_request(namespace=NAMESPACE, key='key', bin_names=[ops.list_append('l', 1)])
+
+
+@pytest.mark.asyncio
+async def test_select_projections(client):
+    await client.put(
+        namespace=NAMESPACE, key='test_projections', set_name=SET,
+        bins={'events': [1, 2, 3, 4, 5], 'tags': {'a': 'x'}, 'name': 'n'},
+    )
+    r = await client.select(
+        namespace=NAMESPACE, key='test_projections', set_name=SET,
+        bin_names=[
+            'name', ops.list_size('events'), ops.list_get_range('events', -2),
+            ops.list_get('events', 0), ops.map_get_by_key('tags', 'a'), ops.map_size('tags'),
+        ],
+    )
+    assert r.results == [
+        ('name', 'n'), ('events', 5), ('events', [4, 5]), ('events', 1), ('tags', 'x'), ('tags', 1)
+    ]
+    assert r.bins == {'name': 'n', 'events': 1, 'tags': 1}
+
+
+@pytest.mark.asyncio
+async def test_operate_respond_all_ops(client):
+    await client.put(namespace=NAMESPACE, key='test_respond_all', set_name=SET, bins={'events': [1]})
+    operation_bins = [
+        ops.list_append('events', 2),
+        Bin(key='counter', operation_type=OperationTypes.INCR, data=1),
+        ops.list_get_range('events', 0, 1),
+        ops.read('counter'),
+    ]
+    r = await client.operate(
+        namespace=NAMESPACE, key='test_respond_all', set_name=SET,
+        operation_bins=operation_bins, respond_all_ops=True,
+    )
+    assert r.results == [('events', 2), ('counter', None), ('events', [1]), ('counter', 1)]
@@ -0,0 +1,196 @@
+import asyncio
+from dataclasses import dataclass
+import socket
+from typing import Any
+
+import pytest
+
+import asyncaerospike
+from asyncaerospike import ConnectionPolicy, LoginAuthenticator
+from asyncaerospike.admin import AdminCommand, AdminField, Authenticator, admin_request, parse_admin_response
+from asyncaerospike.errors import AerospikeError, SchemaError
+from asyncaerospike.fake_server import FakeServer
+from asyncaerospike.header import Headers, RequestType
+from asyncaerospike.pool import apply_socket_policy
+from asyncaerospike.request import put_request
+from asyncaerospike.response import DecodedResponse, Response
+from tests.conftest import NAMESPACE
+
+
+def test_admin_request():
+    data = admin_request(AdminCommand.LOGIN, {AdminField.USER: b'user', AdminField.CREDENTIAL: b'secret'})
+    header = Headers.unpack(data[:Headers.SIZE])
+    assert header.request_type == RequestType.ADMIN
+    assert header.request_length == len(data) - Headers.SIZE
+
+    status_code, fields = parse_admin_response(data[Headers.SIZE:])
+    assert status_code == 0
+    assert fields == {AdminField.USER: b'user', AdminField.CREDENTIAL: b'secret'}
+
+
+def test_socket_policy():
+    policy = ConnectionPolicy(keepalive_idle=30, keepalive_interval=5, keepalive_count=3, recv_buffer_size=65536)
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        apply_socket_policy(sock, policy)
+        assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE) == 30
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) >= 65536
+
+
+def test_invalid_pool_size():
+    with pytest.raises(ValueError):
+        ConnectionPolicy(pool_size=0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('transport', ['stream', 'protocol'])
+async def test_warm_pool(transport, fake_connection):
+    policy = ConnectionPolicy(pool_size=4)
+    server, client = await fake_connection(FakeServer(latency=0.01), transport=transport, policy=policy)
+    assert len(server._connections) == 4
+
+    responses = await asyncio.gather(*[client.get(namespace=NAMESPACE, key=str(i)) for i in range(8)])
+    assert all(r.status_code == 2 for r in responses)
+
+
+@pytest.mark.asyncio
+async def test_login(fake_connection):
+    authenticator = LoginAuthenticator('user', credential=b'secret')
+    policy = ConnectionPolicy(pool_size=2, authenticator=authenticator)
+    server, client = await fake_connection(FakeServer(users={'user': b'secret'}), policy=policy)
+    assert authenticator.session_token in server.sessions
+
+    r = await client.put(namespace=NAMESPACE, key='key', bins={'a': 1})
+    assert r.is_ok
+    assert (await client.info('build')) == {'build': 'fake'}
+
+
+@pytest.mark.asyncio
+async def test_login_rejected(fake_connection):
+    server, client = await fake_connection(FakeServer(users={'user': b'secret'}))
+    policy = ConnectionPolicy(authenticator=LoginAuthenticator('user', credential=b'wrong'))
+    with pytest.raises(AerospikeError) as e:
+        await asyncaerospike.connection(host=server.host, port=server.port, policy=policy)
+    assert e.value.message == 'AS_SEC_ERR_CREDENTIAL'
+
+    r = await client.get(namespace=NAMESPACE, key='key')
+    assert r.status_code == 80
+
+
+@pytest.mark.asyncio
+async def test_login_without_security(fake_connection):
+    policy = ConnectionPolicy(authenticator=LoginAuthenticator('user', credential=b'secret'))
+    server, client = await fake_connection(policy=policy)
+    assert (await client.put(namespace=NAMESPACE, key='key', bins={'a': 1})).is_ok
+
+
+@pytest.mark.asyncio
+async def test_idle_probe_reconnects(fake_connection):
+    policy = ConnectionPolicy(idle_probe_interval=0.05)
+    server, client = await fake_connection(policy=policy)
+    requests = server.requests
+    await asyncio.sleep(0.1)
+    assert server.requests > requests
+
+    for writer in list(server._connections):
+        writer.close()
+    await asyncio.sleep(0.2)
+    assert client.pool.reconnects >= 1
+
+    r = await client.put(namespace=NAMESPACE, key='key', bins={'a': 1})
+    assert r.is_ok
+
+
+class FlakyAuthenticator(Authenticator):
+    """Fails logins with non-network error while failures > 0."""
+
+    def __init__(self):
+        self.failures = 0
+
+    async def login(self, connection):  # noqa: U100
+        if self.failures > 0:
+            self.failures -= 1
+            raise ValueError('broken handshake')
+
+
+@pytest.mark.asyncio
+async def test_idle_probe_survives_errors(fake_connection, caplog):
+    authenticator = FlakyAuthenticator()
+    policy = ConnectionPolicy(idle_probe_interval=0.05, authenticator=authenticator)
+    server, client = await fake_connection(policy=policy)
+
+    authenticator.failures = 2
+    for writer in list(server._connections):
+        writer.close()
+    await asyncio.sleep(0.3)
+    assert authenticator.failures == 0
+    assert 'Probe of idle connections failed' in caplog.text
+    assert client.pool.reconnects == 1
+    assert (await client.put(namespace=NAMESPACE, key='key', bins={'a': 1})).is_ok
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('pool_size', [1, 2])
+async def test_reconnect_without_probes(pool_size, fake_connection):
+    policy = ConnectionPolicy(pool_size=pool_size)
+    server, client = await fake_connection(policy=policy)
+    assert (await client.put(namespace=NAMESPACE, key='key', bins={'a': 1})).is_ok
+
+    for writer in list(server._connections):
+        writer.close()
+    await asyncio.sleep(0.05)
+    for _ in range(3):
+        assert (await client.get(namespace=NAMESPACE, key='key')).bins == {'a': 1}
+    assert client.pool.reconnects >= 1
+
+
+@dataclass
+class LargeRecord:
+    blob: Any
+    text: str
+    n: int = 0
+
+
+def test_pack_parts():
+    value = b'x' * 1000
+    request = put_request(namespace=NAMESPACE, key='key', bins={'blob': value, 'n': 1, 'l': [1, 'a']})
+    parts = request.pack_parts()
+    assert b''.join(parts) == request.pack()
+    assert any(part is value for part in parts)
+
+
+@dataclass
+class WrongLargeRecord:
+    text: int
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('transport', ['stream', 'protocol'])
+async def test_large_records(transport, fake_connection):
+    policy = ConnectionPolicy(large_record_size=1024)
+    bins = {'blob': bytes(range(256)) * 1000, 'text': 'abc' * 50000, 'n': 7, 'l': [1, 'a'], 'empty': b''}
+    server, client = await fake_connection(FakeServer(chunk_size=4096), transport=transport, policy=policy)
+    assert (await client.put(NAMESPACE, 'large', bins=bins)).is_ok
+    await client.put(NAMESPACE, 'small', bins={'n': 1})
+
+    r = await client.get(NAMESPACE, 'large')
+    assert r.bins == bins
+    assert r.generation == 1
+    if transport == 'stream':
+        assert isinstance(r, DecodedResponse)
+        assert r.as_record(LargeRecord) == LargeRecord(bins['blob'], bins['text'], 7)
+        with pytest.raises(SchemaError):
+            r.as_record(WrongLargeRecord)
+        # raw bins are packed again for consumers of resp_data
+        assert r.size == len(r.resp_data) > 400000
+        assert Response(0, 1, r.bins_num, r.resp_data).bins == bins
+
+    r = await client.select(NAMESPACE, 'large', ['n', 'text'])
+    assert r.results == [('n', 7), ('text', bins['text'])]
+
+    r = await client.get(NAMESPACE, 'small')
+    assert r.bins == {'n': 1}
+    assert not isinstance(r, DecodedResponse)
+    assert (await client.get(NAMESPACE, 'missing')).status_code == 2
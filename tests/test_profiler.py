@@ -0,0 +1,84 @@
+import io
+import json
+import os
+import signal
+
+import pytest
+
+from asyncaerospike import RequestProfiler
+from asyncaerospike.fake_server import FakeServer
+from asyncaerospike.profiler import SpaceSaving
+from asyncaerospike.request import get_request
+from asyncaerospike.response import DecodedResponse
+from tests.conftest import NAMESPACE, SET, make_response
+
+
+def test_space_saving():
+    counter = SpaceSaving(capacity=3)
+    for key in 'aaaaabbbcd':
+        counter.add(key)
+    assert [(key, count) for key, count, _ in counter.top(2)] == [('a', 5), ('b', 3)]
+
+    counter.add('e')
+    assert len(counter) == 3
+    assert counter.top()[-1] == ('e', 3, 2)
+    with pytest.raises(ValueError):
+        SpaceSaving(capacity=0)
+
+
+@pytest.mark.asyncio
+async def test_hot_keys_and_sets(fake_connection):
+    profiler = RequestProfiler(top_k=4, slow_threshold=60)
+    server, client = await fake_connection(profiler=profiler)
+    for i in range(10):
+        await client.put(NAMESPACE, 'hot', bins={'a': i}, set_name=SET)
+        await client.get(NAMESPACE, str(i), set_name='other')
+    await client.get(NAMESPACE, 'hot', set_name=SET)
+
+    assert profiler.requests == profiler.sampled == 21
+    hot = profiler.hot_keys(1)[0]
+    assert (hot['set_name'], hot['count'], hot['error']) == (SET, 11, 0)
+    assert [(s['set_name'], s['count']) for s in profiler.hot_sets()] == [(SET, 11), ('other', 10)]
+    assert profiler.slow_ops() == []
+
+
+@pytest.mark.asyncio
+async def test_slow_ops_and_sampling(fake_connection):
+    profiler = RequestProfiler(sample_every=2, slow_threshold=0.01, slow_ops=2)
+    server, client = await fake_connection(FakeServer(latency=0.02), profiler=profiler)
+    await client.put(NAMESPACE, 'key', bins={'a': 'value'}, set_name=SET)
+    await client.get(NAMESPACE, 'key', set_name=SET)
+    await client.delete(NAMESPACE, 'key', set_name=SET)
+
+    assert (profiler.requests, profiler.sampled, profiler.slow) == (3, 1, 3)
+    ops = profiler.slow_ops()
+    assert sorted(op.op_type for op in ops) == ['delete', 'read']
+    assert all(op.latency >= 0.01 and op.set_name == SET and op.status_code == 0 for op in ops)
+
+    out = io.StringIO()
+    profiler.dump(out)
+    assert json.loads(out.getvalue())['slow'] == 3
+
+    profiler.reset()
+    assert profiler.snapshot()['slow_ops'] == []
+
+
+def test_slow_op_size_of_decoded_response():
+    profiler = RequestProfiler(slow_threshold=0)
+    request = get_request(namespace=NAMESPACE, key='key', set_name=SET)
+    profiler.record(request, DecodedResponse(status_code=0, generation=1, results=[('a', 'x')], size=100000), 1.0)
+    profiler.record(request, make_response({'a': 'x' * 100}), 1.0)
+    assert [op.size for op in profiler.slow_ops()] == [100000, 109]
+
+
+def test_dump_on_signal(tmp_path):
+    profiler = RequestProfiler()
+    path = tmp_path / 'profile.json'
+    previous = signal.getsignal(signal.SIGUSR1)
+    with open(path, 'w') as file:
+        profiler.install_signal_handler(file=file)
+        try:
+            os.kill(os.getpid(), signal.SIGUSR1)
+        finally:
+            signal.signal(signal.SIGUSR1, previous)
+    assert json.loads(path.read_text())['requests'] == 0
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+import asyncaerospike
+from asyncaerospike.fake_server import FakeServer
+from tests.conftest import NAMESPACE, SET
+
+
+@pytest.mark.asyncio
+async def test_pipelined_requests(server_address):
+    host, port = server_address
+    client = await asyncaerospike.connection(host=host, port=port, transport='protocol')
+
+    keys = [f'test_protocol_{i}' for i in range(50)]
+    responses = await asyncio.gather(
+        *[client.put(namespace=NAMESPACE, key=k, set_name=SET, bins={'key': k}) for k in keys]
+    )
+    assert all(r.is_ok for r in responses)
+
+    responses = await asyncio.gather(*[client.get(namespace=NAMESPACE, key=k, set_name=SET) for k in keys])
+    assert [r.bins for r in responses] == [{'key': k} for k in keys]
+
+    await asyncio.gather(*[client.delete(namespace=NAMESPACE, key=k, set_name=SET) for k in keys])
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_partial_reads(fake_connection):
+    server, client = await fake_connection(FakeServer(chunk_size=5), transport='protocol')
+    await client.put(namespace=NAMESPACE, key='key', bins={'a': 'x' * 1000})
+    responses = await asyncio.gather(*[client.get(namespace=NAMESPACE, key='key') for _ in range(5)])
+    assert all(r.bins == {'a': 'x' * 1000} for r in responses)
+
+
+@pytest.mark.asyncio
+async def test_connection_lost(fake_connection):
+    server, client = await fake_connection(FakeServer(latency=1), transport='protocol')
+    request = asyncio.ensure_future(client.get(namespace=NAMESPACE, key='key'))
+    await asyncio.sleep(0.01)
+    for writer in list(server._connections):
+        writer.close()
+
+    with pytest.raises(ConnectionError):
+        await request
+    # next request reopens connection
+    server.latency = 0
+    assert (await client.get(namespace=NAMESPACE, key='key')).status_code == 2
+    assert client.pool.reconnects == 1
+
+
+def test_unknown_transport():
+    with pytest.raises(ValueError):
+        asyncaerospike.Client(host='127.0.0.1', port=3000, transport='udp')
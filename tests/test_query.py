@@ -0,0 +1,123 @@
+import pytest
+
+from asyncaerospike import expressions as exp
+from asyncaerospike.errors import AerospikeError, InfoError
+from asyncaerospike.fake_server import FakeServer
+from asyncaerospike.fields import FieldTypes, Key
+from asyncaerospike.query import PARTITIONS, between, equals, partition_id, split_partitions
+from asyncaerospike.request import query_request
+from tests.conftest import NAMESPACE, SET
+
+
+def test_predicate_pack():
+    assert between('a', 1, 2).pack() == (
+        b'\x01a\x01' + b'\x00\x00\x00\x08' + (1).to_bytes(8, 'big') + b'\x00\x00\x00\x08' + (2).to_bytes(8, 'big')
+    )
+    assert equals('s', 'ab').pack() == b'\x01s\x03\x00\x00\x00\x02ab\x00\x00\x00\x02ab'
+    with pytest.raises(TypeError):
+        equals('a', 1.5)
+
+
+def test_query_request():
+    request = query_request(
+        namespace=NAMESPACE, task_id=1, partitions=[0, 258], set_name=SET, predicate=equals('a', 1)
+    )
+    assert [f.FIELD_TYPE for f in request.fields] == [
+        FieldTypes.NAMESPACE, FieldTypes.SET, FieldTypes.TRAN_ID, FieldTypes.INDEX_RANGE, FieldTypes.PID_ARRAY
+    ]
+    assert request.fields[-1].pack_data() == b'\x00\x00\x02\x01'
+
+
+def test_split_partitions():
+    groups = split_partitions(3)
+    assert len(groups) == 3
+    assert sorted(p for group in groups for p in group) == list(range(PARTITIONS))
+    assert len(split_partitions(0)) == 1
+
+
+@pytest.mark.asyncio
+async def test_index_management(fake_connection):
+    server, client = await fake_connection()
+    await client.index_create(NAMESPACE, 'age', 'age_idx', set_name=SET)
+    with pytest.raises(InfoError) as e:
+        await client.index_create(NAMESPACE, 'age', 'age_idx', set_name=SET)
+    assert e.value.status_code == 200
+
+    indexes = await client.index_list(NAMESPACE)
+    assert [(i['indexname'], i['bin'], i['type']) for i in indexes] == [('age_idx', 'age', 'NUMERIC')]
+
+    await client.index_drop(NAMESPACE, 'age_idx')
+    assert await client.index_list(NAMESPACE) == []
+    with pytest.raises(InfoError):
+        await client.index_drop(NAMESPACE, 'age_idx')
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('parallelism', [1, 4])
+async def test_query(parallelism, fake_connection):
+    server, client = await fake_connection(FakeServer(query_batch_size=3))
+    await client.index_create(NAMESPACE, 'age', 'age_idx', set_name=SET)
+    await client.index_create(NAMESPACE, 'name', 'name_idx', index_type='string', set_name=SET)
+    for i in range(20):
+        await client.put(NAMESPACE, str(i), bins={'age': i, 'name': f'n{i % 2}'}, set_name=SET)
+    await client.put(NAMESPACE, 'other', bins={'age': 5}, set_name='other')
+
+    records = [r async for r in client.query(NAMESPACE, SET, between('age', 5, 14), parallelism=parallelism)]
+    assert sorted(r.bins['age'] for r in records) == list(range(5, 15))
+    assert all(len(r.digest) == 20 for r in records)
+
+    records = [
+        r async for r in client.query(
+            NAMESPACE, SET, equals('name', 'n1'), bin_names=['age'],
+            filter_expression=exp.int_bin('age') < 10, parallelism=parallelism,
+        )
+    ]
+    assert sorted(r.bins['age'] for r in records) == [1, 3, 5, 7, 9]
+    assert all(list(r.bins) == ['age'] for r in records)
+
+    records = [r async for r in client.query(NAMESPACE, parallelism=parallelism)]
+    assert len(records) == 21
+
+
+@pytest.mark.asyncio
+async def test_query_errors_and_early_stop(fake_connection):
+    server, client = await fake_connection(FakeServer(query_batch_size=1))
+    for i in range(10):
+        await client.put(NAMESPACE, str(i), bins={'age': i}, set_name=SET)
+
+    with pytest.raises(AerospikeError) as e:
+        async for _ in client.query(NAMESPACE, SET, between('age', 0, 5), parallelism=2):
+            pass
+    assert e.value.status_code == 201
+
+    query = client.query(NAMESPACE, SET, parallelism=2)
+    async for _ in query:
+        break
+    await query.aclose()
+    assert (await client.get(NAMESPACE, '1', set_name=SET)).bins == {'age': 1}
+
+    await client.close()
+    with pytest.raises(ConnectionError):
+        async for _ in client.query(NAMESPACE):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_query_unknown_error_and_unfinished_partitions(fake_connection):
+    server, client = await fake_connection()
+    for i in range(10):
+        await client.put(NAMESPACE, str(i), bins={'age': i}, set_name=SET)
+
+    server.inject_error(29)
+    with pytest.raises(AerospikeError) as e:
+        async for _ in client.query(NAMESPACE, SET, parallelism=2):
+            pass
+    assert e.value.status_code == 29
+
+    server.unavailable_partitions.add(partition_id(Key('3', set_name=SET).digest))
+    records = []
+    with pytest.raises(AerospikeError) as e:
+        async for record in client.query(NAMESPACE, SET):
+            records.append(record)
+    assert e.value.status_code == 11
+    assert sorted(r.bins['age'] for r in records) == [0, 1, 2, 4, 5, 6, 7, 8, 9]
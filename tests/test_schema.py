@@ -0,0 +1,93 @@
+from dataclasses import dataclass, field
+from typing import NamedTuple, Optional
+
+import pytest
+
+from asyncaerospike.errors import SchemaError
+from asyncaerospike.schema import register_schema
+from tests.conftest import make_response
+
+
+@dataclass
+class User:
+    name: str
+    age: int
+    score: float = 0.0
+    tags: list = field(default_factory=list)
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+    label: Optional[str] = None
+
+
+class Slotted:
+    __slots__ = ('name', 'age')
+
+    name: str
+    age: int
+
+
+def test_dataclass():
+    r = make_response({'name': 'bob', 'age': 42, 'score': 1.5, 'extra': 'skipped'})
+    assert r.as_record(User) == User(name='bob', age=42, score=1.5)
+
+
+def test_namedtuple():
+    r = make_response({'y': 2, 'x': 1})
+    assert r.as_record(Point) == Point(x=1, y=2)
+
+
+def test_slotted():
+    record = make_response({'name': 'bob', 'age': 42}).as_record(Slotted)
+    assert (record.name, record.age) == ('bob', 42)
+
+
+def test_matches_bins():
+    r = make_response({'name': 'bob', 'age': 42})
+    record = r.as_record(User)
+    assert {'name': record.name, 'age': record.age} == r.bins
+
+
+def test_no_bins():
+    assert make_response({}).as_record(User) is None
+
+
+def test_type_mismatch():
+    with pytest.raises(SchemaError):
+        make_response({'name': 'bob', 'age': 'old'}).as_record(User)
+
+
+def test_blob_and_map():
+    @dataclass
+    class Document:
+        body: bytes
+        meta: dict
+
+    r = make_response({'body': b'\x00\x01', 'meta': {'a': 1}})
+    assert r.as_record(Document) == Document(body=b'\x00\x01', meta={'a': 1})
+    with pytest.raises(SchemaError):
+        make_response({'body': 'text', 'meta': {}}).as_record(Document)
+
+
+def test_not_optional_none():
+    with pytest.raises(SchemaError):
+        make_response({'x': None, 'y': 2}).as_record(Point)
+
+
+def test_unsupported_class():
+    class Plain:
+        pass
+
+    with pytest.raises(SchemaError):
+        make_response({'x': 1}).as_record(Plain)
+
+
+def test_from_bins_type_checks():
+    schema = register_schema(User)
+    assert schema.from_bins({'name': 'bob', 'age': 1, 'tags': ['a']}) == User(name='bob', age=1, tags=['a'])
+    with pytest.raises(SchemaError):
+        schema.from_bins({'name': 'bob', 'age': 'old'})
+    with pytest.raises(SchemaError):
+        schema.from_bins({'name': None, 'age': 1})
@@ -0,0 +1,106 @@
+import asyncio
+import pickle
+
+import pytest
+
+import asyncaerospike
+from asyncaerospike import Bin, ConnectionPolicy, LoginAuthenticator, OperationTypes
+from asyncaerospike.errors import AerospikeError, InfoError
+from asyncaerospike.fake_server import FakeServer
+from asyncaerospike.response import DecodedResponse
+from asyncaerospike.sharded import _decoded, DECODE_IN_SHARD
+from tests.conftest import make_response, NAMESPACE, SET
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('mode', ['process', 'thread'])
+async def test_sharded(server_address, mode):
+    host, port = server_address
+    client = await asyncaerospike.sharded_connection(host=host, port=port, shards=3, mode=mode)
+
+    keys = [f'test_sharded_{i}' for i in range(30)]
+    assert {client.shard_for(k, SET) for k in keys} == {0, 1, 2}
+
+    responses = await asyncio.gather(
+        *[client.put(namespace=NAMESPACE, key=k, set_name=SET, bins={'key': k, 'n': 1}) for k in keys]
+    )
+    assert all(r.is_ok for r in responses)
+
+    responses = await asyncio.gather(*[client.get(namespace=NAMESPACE, key=k, set_name=SET) for k in keys])
+    assert [r.bins for r in responses] == [{'key': k, 'n': 1} for k in keys]
+    if mode == 'process' and DECODE_IN_SHARD:
+        assert all(isinstance(r, DecodedResponse) for r in responses)
+
+    r = await client.operate(
+        namespace=NAMESPACE,
+        key=keys[0],
+        set_name=SET,
+        operation_bins=[
+            Bin(key='n', operation_type=OperationTypes.INCR, data=2),
+            Bin(key='n', operation_type=OperationTypes.READ),
+        ]
+    )
+    assert r.bins == {'n': 3}
+
+    r = await client.select(namespace=NAMESPACE, key=keys[0], set_name=SET, bin_names=['key'])
+    assert r.bins == {'key': keys[0]}
+
+    responses = await asyncio.gather(*[client.delete(namespace=NAMESPACE, key=k, set_name=SET) for k in keys])
+    assert all(r.is_ok for r in responses)
+    await client.close()
+
+
+def test_decoded():
+    response = make_response({'a': 1, 'b': 'x'})
+    decoded = pickle.loads(pickle.dumps(_decoded(response)))
+    assert isinstance(decoded, DecodedResponse)
+    assert (decoded.bins, decoded.results, decoded.size) == (response.bins, response.results, response.size)
+    assert _decoded(None) is None
+
+
+@pytest.mark.asyncio
+async def test_connect_error():
+    client = asyncaerospike.ShardedClient(host='127.0.0.1', port=1, shards=1)
+    with pytest.raises(OSError):
+        await client.connect()
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_login_error():
+    async with FakeServer(users={'user': b'secret'}) as server:
+        policy = ConnectionPolicy(authenticator=LoginAuthenticator('user', credential=b'wrong'))
+        client = asyncaerospike.ShardedClient(host=server.host, port=server.port, shards=2, policy=policy)
+        try:
+            with pytest.raises(AerospikeError) as e:
+                await client.connect()
+            assert (e.value.status_code, e.value.message) == (65, 'AS_SEC_ERR_CREDENTIAL')
+            assert not any(shard._process.is_alive() for shard in client._shards)
+        finally:
+            await client.close()
+
+
+def test_error_pickle():
+    error = pickle.loads(pickle.dumps(InfoError(200, 'AS_ERR_SINDEX_FOUND')))
+    assert isinstance(error, InfoError)
+    assert (error.status_code, error.message, str(error)) == (200, 'AS_ERR_SINDEX_FOUND', 'AS_ERR_SINDEX_FOUND')
+
+
+@pytest.mark.asyncio
+async def test_dead_shard(fake_connection):
+    server, client = await fake_connection(
+        FakeServer(latency=0.5), connect=asyncaerospike.sharded_connection, shards=2
+    )
+    key = next(k for k in range(100) if client.shard_for(k, SET) == 0)
+    other_key = next(k for k in range(100) if client.shard_for(k, SET) == 1)
+
+    pending = asyncio.ensure_future(client.get(namespace=NAMESPACE, key=key, set_name=SET))
+    await asyncio.sleep(0.1)
+    client._shards[0]._process.kill()
+    with pytest.raises(ConnectionError):
+        await asyncio.wait_for(pending, 5)
+    with pytest.raises(ConnectionError):
+        await asyncio.wait_for(client.get(namespace=NAMESPACE, key=key, set_name=SET), 5)
+
+    server.latency = 0
+    assert (await client.get(namespace=NAMESPACE, key=other_key, set_name=SET)).status_code == 2
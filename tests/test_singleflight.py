@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from asyncaerospike import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_shared_call():
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    flight = SingleFlight()
+    results = await asyncio.gather(*[flight.do('key', call) for _ in range(5)], flight.do('other', call))
+    assert len(calls) == 2
+    assert all(r is results[0] for r in results[:5])
+    assert (flight.calls, flight.saved, flight.in_flight) == (6, 4, 0)
+
+    await flight.do('key', call)
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_shared_error():
+    async def call():
+        await asyncio.sleep(0.01)
+        raise ConnectionError()
+
+    flight = SingleFlight()
+    results = await asyncio.gather(*[flight.do('key', call) for _ in range(3)], return_exceptions=True)
+    assert all(isinstance(r, ConnectionError) for r in results)
+    assert flight.saved == 2
+
+
+@pytest.mark.asyncio
+async def test_waiter_cancel():
+    async def call():
+        await asyncio.sleep(0.01)
+        return 1
+
+    flight = SingleFlight()
+    first = asyncio.ensure_future(flight.do('key', call))
+    second = asyncio.ensure_future(flight.do('key', call))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == 1
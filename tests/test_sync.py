@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+import pytest
+
+import asyncaerospike
+from asyncaerospike.fake_server import FakeServer, FakeServerThread
+from tests.conftest import NAMESPACE, SET
+
+
+@pytest.fixture(scope='module')
+def sync_client(server_address):
+    host, port = server_address
+    client = asyncaerospike.sync_connection(host=host, port=port)
+    yield client
+    client.close()
+
+
+def test_put_get_delete(sync_client):
+    r = sync_client.put(namespace=NAMESPACE, key='test_sync', set_name=SET, bins={'hello': 'hey'})
+    assert r.is_ok is True
+
+    r = sync_client.get(namespace=NAMESPACE, key='test_sync', set_name=SET)
+    assert r.bins == {'hello': 'hey'}
+
+    r = sync_client.select(namespace=NAMESPACE, key='test_sync', set_name=SET, bin_names=['hello'])
+    assert r.bins == {'hello': 'hey'}
+
+    r = sync_client.delete(namespace=NAMESPACE, key='test_sync', set_name=SET)
+    assert r.is_ok is True
+
+    r = sync_client.get(namespace=NAMESPACE, key='test_sync', set_name=SET)
+    assert r.bins is None
+
+
+def test_threads(sync_client):
+    def put_get(i):
+        key = f'test_sync_{i}'
+        sync_client.put(namespace=NAMESPACE, key=key, set_name=SET, bins={'i': i})
+        bins = sync_client.get(namespace=NAMESPACE, key=key, set_name=SET).bins
+        sync_client.delete(namespace=NAMESPACE, key=key, set_name=SET)
+        return bins
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(put_get, range(32)))
+    assert results == [{'i': i} for i in range(32)]
+
+
+def test_timeout_keeps_connection():
+    with FakeServerThread(FakeServer(latency=0.3)) as server:
+        client = asyncaerospike.sync_connection(host=server.host, port=server.port, timeout=0.1)
+        try:
+            with pytest.raises(TimeoutError):
+                client.put(namespace=NAMESPACE, key='timeout', set_name=SET, bins={'a': 1})
+            time.sleep(0.3)
+            server.latency = 0
+
+            # response of timed out put is skipped, not read as response of get
+            assert client.get(namespace=NAMESPACE, key='timeout', set_name=SET).bins == {'a': 1}
+            assert client.put(namespace=NAMESPACE, key='timeout', set_name=SET, bins={'a': 2}).is_ok
+            assert client.get(namespace=NAMESPACE, key='timeout', set_name=SET).bins == {'a': 2}
+            assert client.client.pool.reconnects == 0
+        finally:
+            client.close()
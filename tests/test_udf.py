@@ -0,0 +1,85 @@
+import pytest
+
+from asyncaerospike.errors import AerospikeError, InfoError
+from asyncaerospike.fields import FieldTypes
+from asyncaerospike.info import check_info_value, parse_info_list
+from asyncaerospike.request import apply_request
+from tests.conftest import NAMESPACE, SET
+
+MODULE = '''
+function add(rec, name, value)
+    rec[name] = (rec[name] or 0) + value
+    aerospike:update(rec)
+    return rec[name]
+end
+'''
+
+
+def add(bins, name, value):
+    bins[name] = bins.get(name, 0) + value
+    return bins[name]
+
+
+def test_apply_request():
+    request = apply_request(namespace=NAMESPACE, key='key', module='counters', function='add', args=['a', 1])
+    field_types = [f.FIELD_TYPE for f in request.fields]
+    assert field_types[-4:] == [
+        FieldTypes.UDF_PACKAGE_NAME, FieldTypes.UDF_FUNCTION, FieldTypes.UDF_ARGLIST, FieldTypes.UDF_OP
+    ]
+    assert request.fields[-2].pack_data() == b'\x92\xa2\x03a\x01'
+
+
+def test_info_errors():
+    assert parse_info_list('filename=a.lua,hash=1,type=LUA;filename=b.lua,hash=2,type=LUA;') == [
+        {'filename': 'a.lua', 'hash': '1', 'type': 'LUA'},
+        {'filename': 'b.lua', 'hash': '2', 'type': 'LUA'},
+    ]
+    with pytest.raises(InfoError) as e:
+        check_info_value('FAIL:201:Index does not exist')
+    assert e.value.status_code == 201
+    with pytest.raises(InfoError) as e:
+        check_info_value('error=compile_error;file=a.lua;line=1;message=c3ludGF4IGVycm9y')
+    assert e.value.message == 'compile_error: syntax error'
+
+
+@pytest.mark.asyncio
+async def test_udf_put_and_apply(fake_connection):
+    server, client = await fake_connection()
+    server.register_udf('counters', 'add', add)
+
+    await client.udf_put('counters.lua', MODULE)
+    assert [u['filename'] for u in await client.udf_list()] == ['counters.lua']
+
+    r = await client.apply(NAMESPACE, 'key', 'counters', 'add', ['a', 2], set_name=SET)
+    assert r.udf_result() == 2
+    r = await client.apply(NAMESPACE, 'key', 'counters', 'add', ['a', 3], set_name=SET)
+    assert r.udf_result() == 5
+    assert (await client.get(NAMESPACE, 'key', set_name=SET)).bins == {'a': 5}
+
+    r = await client.apply(NAMESPACE, 'key', 'counters', 'missing', set_name=SET)
+    with pytest.raises(AerospikeError) as e:
+        r.udf_result()
+    assert e.value.status_code == 100
+
+    await client.udf_remove('counters.lua')
+    assert await client.udf_list() == []
+    with pytest.raises(InfoError):
+        await client.udf_remove('counters.lua')
+
+
+@pytest.mark.asyncio
+async def test_scan_apply(fake_connection):
+    server, client = await fake_connection()
+    server.register_udf('counters', 'add', add)
+    for i in range(5):
+        await client.put(NAMESPACE, str(i), bins={'a': i}, set_name=SET)
+    await client.put(NAMESPACE, 'other', bins={'a': 0}, set_name='other')
+
+    task_id = await client.scan_apply(NAMESPACE, 'counters', 'add', ['a', 10], set_name=SET)
+    status = await client.wait_job(task_id)
+    assert status['recs-succeeded'] == '5'
+
+    assert [(await client.get(NAMESPACE, str(i), set_name=SET)).bins['a'] for i in range(5)] == [
+        10, 11, 12, 13, 14
+    ]
+    assert (await client.get(NAMESPACE, 'other', set_name='other')).bins == {'a': 0}